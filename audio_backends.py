@@ -0,0 +1,150 @@
+"""Audio output for tones and pre-rendered speech - WinMM on Windows, pacat or aplay elsewhere, a WAV file or nothing"""
+import ctypes
+import shutil
+import subprocess
+import sys
+import time
+import wave
+from ctypes import wintypes
+
+# Windows DLL imports
+if sys.platform == 'win32':
+    kernel32 = ctypes.windll.kernel32
+    winmm = ctypes.windll.winmm
+
+class NullAudioBackend:
+    """Discards audio, for headless runs - with realtime on, playing still takes as long as the sound"""
+
+    def __init__(self, sample_rate=44100, realtime=False):
+        self.sample_rate = sample_rate
+        self.realtime = realtime
+        self.bytes_played = 0
+
+    def play(self, pcm: bytes):
+        self.bytes_played += len(pcm)
+        if self.realtime:
+            time.sleep(len(pcm) / 2 / self.sample_rate)
+
+    def close(self):
+        pass
+
+class WavFileAudioBackend(NullAudioBackend):
+    """Appends everything played to a WAV file, for headless testing"""
+
+    def __init__(self, path, sample_rate=44100):
+        super().__init__(sample_rate)
+        self.wav = wave.open(path, 'wb')
+        self.wav.setnchannels(1)
+        self.wav.setsampwidth(2)
+        self.wav.setframerate(sample_rate)
+
+    def play(self, pcm: bytes):
+        super().play(pcm)
+        self.wav.writeframes(pcm)
+
+    def close(self):
+        self.wav.close()
+
+class PipeAudioBackend(NullAudioBackend):
+    """Streams raw PCM into a long-lived player process (pacat for PulseAudio, aplay for ALSA)"""
+
+    COMMANDS = {
+        'pulse': ['pacat', '--raw', '--format=s16le', '--channels=1', '--latency-msec=20', '--rate={rate}'],
+        'alsa': ['aplay', '-q', '-t', 'raw', '-f', 'S16_LE', '-c', '1', '-r', '{rate}'],
+    }
+
+    def __init__(self, kind, sample_rate=44100):
+        super().__init__(sample_rate)
+        command = [part.format(rate=sample_rate) for part in self.COMMANDS[kind]]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE,
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def play(self, pcm: bytes):
+        super().play(pcm)
+        self.process.stdin.write(pcm)
+        self.process.stdin.flush()
+
+    def close(self):
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=1.0)
+        except Exception:
+            self.process.kill()
+
+class WAVEFORMATEX(ctypes.Structure):
+    _fields_ = [
+        ('wFormatTag', wintypes.WORD),
+        ('nChannels', wintypes.WORD),
+        ('nSamplesPerSec', wintypes.DWORD),
+        ('nAvgBytesPerSec', wintypes.DWORD),
+        ('nBlockAlign', wintypes.WORD),
+        ('wBitsPerSample', wintypes.WORD),
+        ('cbSize', wintypes.WORD),
+    ]
+
+class WAVEHDR(ctypes.Structure):
+    _fields_ = [
+        ('lpData', ctypes.c_char_p),
+        ('dwBufferLength', wintypes.DWORD),
+        ('dwBytesRecorded', wintypes.DWORD),
+        ('dwUser', ctypes.c_void_p),
+        ('dwFlags', wintypes.DWORD),
+        ('dwLoops', wintypes.DWORD),
+        ('lpNext', ctypes.c_void_p),
+        ('reserved', ctypes.c_void_p),
+    ]
+
+class WinMMAudioBackend(NullAudioBackend):
+    """Plays PCM through the WinMM waveOut API, keeping one device handle open"""
+
+    WAVE_MAPPER = 0xFFFFFFFF
+    CALLBACK_EVENT = 0x00050000
+    WHDR_DONE = 0x00000001
+
+    def __init__(self, sample_rate=44100):
+        super().__init__(sample_rate)
+        self.event = kernel32.CreateEventW(None, False, False, None)
+        fmt = WAVEFORMATEX(1, 1, sample_rate, sample_rate * 2, 2, 16, 0)  # WAVE_FORMAT_PCM, mono, 16-bit
+        self.handle = wintypes.HANDLE()
+        result = winmm.waveOutOpen(ctypes.byref(self.handle), self.WAVE_MAPPER, ctypes.byref(fmt),
+                                   self.event, 0, self.CALLBACK_EVENT)
+        if result != 0:
+            raise OSError(f"waveOutOpen failed with code {result}")
+
+    def play(self, pcm: bytes):
+        """Queue a buffer on the device and wait until it has been played"""
+        super().play(pcm)
+        buffer = ctypes.create_string_buffer(pcm, len(pcm))
+        header = WAVEHDR(ctypes.cast(buffer, ctypes.c_char_p), len(pcm), 0, None, 0, 0, None, None)
+        winmm.waveOutPrepareHeader(self.handle, ctypes.byref(header), ctypes.sizeof(header))
+        try:
+            winmm.waveOutWrite(self.handle, ctypes.byref(header), ctypes.sizeof(header))
+            while not header.dwFlags & self.WHDR_DONE:
+                kernel32.WaitForSingleObject(self.event, 50)
+        finally:
+            winmm.waveOutUnprepareHeader(self.handle, ctypes.byref(header), ctypes.sizeof(header))
+
+    def close(self):
+        winmm.waveOutReset(self.handle)
+        winmm.waveOutClose(self.handle)
+        kernel32.CloseHandle(self.event)
+
+def create_audio_backend(name='auto', sample_rate=44100, wav_path=None):
+    """Create the configured audio backend - 'auto', 'winmm', 'pulse', 'alsa', 'wav', 'null' or 'timed'"""
+    if name == 'auto':
+        if sys.platform == 'win32':
+            name = 'winmm'
+        elif shutil.which('pacat'):
+            name = 'pulse'
+        elif shutil.which('aplay'):
+            name = 'alsa'
+        else:
+            name = 'null'
+
+    if name == 'winmm':
+        return WinMMAudioBackend(sample_rate)
+    if name in PipeAudioBackend.COMMANDS:
+        return PipeAudioBackend(name, sample_rate)
+    if name == 'wav':
+        return WavFileAudioBackend(wav_path or 'tones.wav', sample_rate)
+    return NullAudioBackend(sample_rate, realtime=name == 'timed')
@@ -0,0 +1,195 @@
+"""Detection latency benchmark - drives a headless OBSSourceMonitor against fake_obs.py.
+
+The fake server runs in its own process and toggles random program scene items at a fixed rate.
+For every toggle the benchmark looks for the matching play_source_sound call and reports:
+
+    p50/p99 ms      time from toggle to play_source_sound
+    req/s, msg/s    requests (batched ones counted individually) and WebSocket messages sent to OBS
+    cpu %           monitor process CPU while toggling
+    cpu us/item     monitor CPU microseconds per item per second
+    missed          toggles that were never announced
+
+    python benchmarks/bench_detection.py                 run and compare against baselines.json
+    python benchmarks/bench_detection.py --update        run and rewrite baselines.json
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import monitor  # noqa: E402
+from fake_obs import FakeOBS  # noqa: E402
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+
+def run_server(conn, items, latency, seed):
+    """Fake OBS process - answers commands from the benchmark over a pipe"""
+    async def serve():
+        obs = FakeOBS(1, items, latency=latency, seed=seed)
+        conn.send(await obs.start('localhost', 0))
+        loop = asyncio.get_running_loop()
+        while True:
+            command = await loop.run_in_executor(None, conn.recv)
+            if command[0] == 'toggle':
+                obs.reset_counters()
+                await obs.run_toggles(command[1], command[2])
+                conn.send({'requests': obs.requests, 'messages': obs.messages, 'toggles': obs.toggles})
+            elif command[0] == 'drop':
+                conn.send(obs.drop_clients())
+            elif command[0] == 'freeze':
+                conn.send(obs.freeze_clients())
+            elif command[0] == 'restart':
+                conn.send(await obs.restart(command[1]))
+            else:
+                await obs.stop()
+                return
+    asyncio.run(serve())
+
+class HeadlessMonitor(monitor.OBSSourceMonitor):
+    """OBSSourceMonitor that records when each source announcement happens"""
+
+    def __init__(self, config):
+        self.notifications = []
+        super().__init__(config)
+
+    def play_source_sound(self, sound_type: str, source_names=None, instance_label=None):
+        now = time.perf_counter()
+        for source_name in source_names or ():
+            self.notifications.append((now, source_name, sound_type == "shown"))
+        super().play_source_sound(sound_type, source_names, instance_label)
+
+def match_toggles(toggles, notifications):
+    """Pair every toggle with the first matching announcement before that source's next toggle"""
+    by_source = {}
+    for t, name, state in notifications:
+        by_source.setdefault(name, []).append((t, state))
+
+    toggles_by_source = {}
+    for t, name, state in toggles:
+        toggles_by_source.setdefault(name, []).append((t, state))
+
+    latencies = []
+    missed = 0
+    for name, source_toggles in toggles_by_source.items():
+        announced = by_source.get(name, [])
+        for index, (t, state) in enumerate(source_toggles):
+            until = source_toggles[index + 1][0] if index + 1 < len(source_toggles) else float('inf')
+            hit = next((nt for nt, ns in announced if ns == state and t <= nt < until), None)
+            if hit is None:
+                missed += 1
+            else:
+                latencies.append((hit - t) * 1000)
+    return latencies, missed
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+def run_case(mode, items, duration, rate, latency):
+    """Run one benchmark case and return its result row"""
+    context = multiprocessing.get_context('spawn')
+    parent, child = context.Pipe()
+    server = context.Process(target=run_server, args=(child, items, latency, 1234), daemon=True)
+    server.start()
+    port = parent.recv()
+
+    bench = HeadlessMonitor({
+        'port': port,
+        'monitor_mode': mode,
+        'use_speech': False,
+        'use_tones': True,
+        'audio_backend': 'null',
+        'state_file': '',
+        'journal': {'enabled': False},
+        'debounce_ms': 0,
+        'flap_threshold': 0,
+    })
+    try:
+        if not bench.start_monitoring():
+            raise RuntimeError(f"Could not connect to the fake server on port {port}")
+        time.sleep(0.5)
+
+        cpu_start = time.process_time()
+        parent.send(('toggle', rate, duration))
+        stats = parent.recv()
+        cpu = time.process_time() - cpu_start
+        time.sleep(0.5)  # Let trailing announcements land
+    finally:
+        bench.stop_monitoring()
+        parent.send(('stop',))
+        server.join(timeout=5)
+
+    latencies, missed = match_toggles(stats['toggles'], bench.notifications)
+    return {
+        'toggles': len(stats['toggles']),
+        'missed': missed,
+        'p50_ms': round(percentile(latencies, 0.50), 2),
+        'p99_ms': round(percentile(latencies, 0.99), 2),
+        'mean_ms': round(statistics.fmean(latencies), 2) if latencies else 0.0,
+        'requests_per_s': round(stats['requests'] / duration, 1),
+        'messages_per_s': round(stats['messages'] / duration, 1),
+        'cpu_percent': round(cpu / duration * 100, 2),
+        'cpu_us_per_item': round(cpu / duration / items * 1e6, 2),
+    }
+
+def check(name, result, baseline, tolerance):
+    """Compare a result with its baseline, returns a list of regressions"""
+    problems = []
+    for key, slack in (('p99_ms', 1.0), ('requests_per_s', 1.0), ('cpu_percent', 1.0)):
+        if result[key] > baseline[key] * tolerance + slack:
+            problems.append(f"{name} {key}: {result[key]} vs baseline {baseline[key]}")
+    if result['missed'] > baseline['missed'] * tolerance + 2:
+        problems.append(f"{name} missed: {result['missed']} vs baseline {baseline['missed']}")
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description="Toggle-to-announcement benchmark against a fake OBS server")
+    parser.add_argument('--items', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--modes', nargs='+', default=['events', 'polling'], choices=['events', 'polling'])
+    parser.add_argument('--duration', type=float, default=5.0, help="Seconds of toggling per case")
+    parser.add_argument('--rate', type=float, default=20.0, help="Toggles per second")
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="Simulated OBS response delay")
+    parser.add_argument('--tolerance', type=float, default=2.0, help="Allowed factor over baseline")
+    parser.add_argument('--update', action='store_true', help="Write the results as the new baselines")
+    args = parser.parse_args()
+
+    baselines = {}
+    if os.path.exists(BASELINES):
+        with open(BASELINES) as f:
+            baselines = json.load(f)
+
+    columns = ('toggles', 'missed', 'p50_ms', 'p99_ms', 'requests_per_s', 'messages_per_s', 'cpu_percent', 'cpu_us_per_item')
+    print(f"{'case':<14}" + "".join(f"{column:>16}" for column in columns))
+
+    results = {}
+    problems = []
+    for mode in args.modes:
+        for items in args.items:
+            name = f"{mode}-{items}"
+            result = results[name] = run_case(mode, items, args.duration, args.rate, args.latency_ms / 1000)
+            print(f"{name:<14}" + "".join(f"{result[column]:>16}" for column in columns))
+            if name in baselines and not args.update:
+                problems += check(name, result, baselines[name], args.tolerance)
+
+    if args.update:
+        baselines.update(results)
+        with open(BASELINES, 'w') as f:
+            json.dump(baselines, f, indent=4, sort_keys=True)
+        print(f"Baselines written to {BASELINES}")
+    elif problems:
+        print("\nRegressions:")
+        for problem in problems:
+            print(f"  {problem}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""State server fan-out benchmark - many local tools subscribed to one monitor instead of to OBS.
+
+fake_obs.py runs in one process and toggles program scene items at --rate per second. A headless
+OBSSourceMonitor with the state server on runs in this process, and --clients subscribers run in a
+third process, recording when each diff reaches them. For each client count it reports:
+
+    p50/p99 ms      time from a toggle to a client receiving its diff, over every client
+    missed          toggles some client never received
+    obs conns       WebSocket connections OBS had to serve
+    req/s           requests sent to OBS
+    cpu %           monitor process CPU while toggling
+
+    python benchmarks/bench_fanout.py
+    python benchmarks/bench_fanout.py --clients 1 10 100 500
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from bench_detection import HeadlessMonitor, match_toggles, percentile, run_server  # noqa: E402
+
+def run_clients(conn, port, clients):
+    """Subscriber process - `clients` connections that timestamp every diff until told to stop"""
+    async def client(received):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b'{"op": "subscribe"}\n')
+        await reader.readline()  # Current state
+        ready.append(True)
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            now = time.perf_counter()
+            message = json.loads(line)
+            if message['op'] == 'diff':
+                received.extend((now, name, True) for name in message['shown'])
+                received.extend((now, name, False) for name in message['hidden'])
+
+    async def main():
+        received = [[] for _ in range(clients)]
+        tasks = [asyncio.create_task(client(notifications)) for notifications in received]
+        while len(ready) < clients:
+            await asyncio.sleep(0.01)
+        conn.send('ready')
+        await asyncio.get_running_loop().run_in_executor(None, conn.recv)
+        for task in tasks:
+            task.cancel()
+        conn.send(received)
+
+    ready = []
+    asyncio.run(main())
+
+def run_case(clients, items, duration, rate):
+    """Toggle with `clients` subscribers and return the result row"""
+    context = multiprocessing.get_context('spawn')
+    server_pipe, server_child = context.Pipe()
+    server = context.Process(target=run_server, args=(server_child, items, 0.0, 1234), daemon=True)
+    server.start()
+    obs_port = server_pipe.recv()
+
+    bench = HeadlessMonitor({
+        'port': obs_port,
+        'use_speech': False,
+        'audio_backend': 'null',
+        'state_file': '',
+        'journal': {'enabled': False},
+        'debounce_ms': 0,
+        'flap_threshold': 0,
+        'state_server': {'enabled': True, 'port': 0, 'max_clients': clients},
+    })
+    client_pipe, client_child = context.Pipe()
+    try:
+        if not bench.start_monitoring():
+            raise RuntimeError(f"Could not connect to the fake server on port {obs_port}")
+        deadline = time.perf_counter() + 5
+        while bench.state_server is None and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        port = bench.state_server.server.sockets[0].getsockname()[1]
+        subscribers = context.Process(target=run_clients, args=(client_child, port, clients), daemon=True)
+        subscribers.start()
+        client_pipe.recv()
+
+        cpu_start = time.process_time()
+        server_pipe.send(('toggle', rate, duration))
+        stats = server_pipe.recv()
+        cpu = time.process_time() - cpu_start
+        time.sleep(0.5)  # Let trailing diffs land
+        client_pipe.send('stop')
+        received = client_pipe.recv()
+        subscribers.join(timeout=5)
+    finally:
+        bench.stop_monitoring()
+        server_pipe.send(('stop',))
+        server.join(timeout=5)
+
+    latencies = []
+    missed = 0
+    for notifications in received:
+        client_latencies, client_missed = match_toggles(stats['toggles'], notifications)
+        latencies += client_latencies
+        missed = max(missed, client_missed)
+    return {
+        'toggles': len(stats['toggles']),
+        'missed': missed,
+        'p50_ms': round(percentile(latencies, 0.50), 2),
+        'p99_ms': round(percentile(latencies, 0.99), 2),
+        'obs_conns': len(bench.instances),
+        'requests_per_s': round(stats['requests'] / duration, 1),
+        'cpu_percent': round(cpu / duration * 100, 2),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="State server fan-out benchmark against a fake OBS server")
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--items', type=int, default=100)
+    parser.add_argument('--duration', type=float, default=5.0, help="Seconds of toggling per case")
+    parser.add_argument('--rate', type=float, default=20.0, help="Toggles per second")
+    args = parser.parse_args()
+
+    columns = ('toggles', 'missed', 'p50_ms', 'p99_ms', 'obs_conns', 'requests_per_s', 'cpu_percent')
+    print(f"{'clients':<10}" + "".join(f"{column:>16}" for column in columns))
+    for clients in args.clients:
+        result = run_case(clients, args.items, args.duration, args.rate)
+        print(f"{clients:<10}" + "".join(f"{result[column]:>16}" for column in columns))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Microbenchmark of the audio level watchdog on synthetic InputVolumeMeters frames.
+
+Builds frames the way obs-websocket sends them - every input with [magnitude, peak, input peak]
+per channel - with one input going dead and one clipping part way through, encodes them to JSON
+and feeds them to LevelWatchdog.handle(). For N inputs it reports:
+
+    decode us     json.loads of one frame, which the connection reader does anyway
+    handle us     mean and p99 time of handle(), evaluation frames included
+    budget %      decode plus mean handle time as a share of the 50 ms between frames
+    alerts        whether the dead and the clipping input were reported, and after how many frames
+
+    python benchmarks/bench_levels.py
+    python benchmarks/bench_levels.py --inputs 30 100 300 --frames 2000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from watchers import LevelWatchdog  # noqa: E402
+
+SETTINGS = {'silence_seconds': 10.0, 'clip_seconds': 2.0}
+
+def build_frames(inputs, frames, channels, seed):
+    """JSON meter frames - input 0 goes silent and input 1 starts clipping half way through"""
+    rng = random.Random(seed)
+    encoded = []
+    for frame in range(frames):
+        entries = []
+        for index in range(inputs):
+            levels = []
+            for _ in range(channels):
+                peak = rng.uniform(0.05, 0.6)
+                if index == 0 and frame >= frames // 2:
+                    peak = 0.0
+                elif index == 1 and frame >= frames // 2:
+                    peak = 1.0
+                levels.append([peak * 0.7, peak, peak])
+            entries.append({'inputName': f"Input {index}", 'inputUuid': f"uuid-{index}", 'inputLevelsMul': levels})
+        encoded.append(json.dumps({'inputs': entries}))
+    return encoded
+
+def run(inputs, frames, channels):
+    encoded = build_frames(inputs, frames, channels, 1234)
+    watchdog = LevelWatchdog(SETTINGS)
+    decode_times = []
+    handle_times = []
+    alerts = {}
+    for frame, message in enumerate(encoded):
+        started = time.perf_counter()
+        data = json.loads(message)
+        decoded = time.perf_counter()
+        changes = watchdog.handle('InputVolumeMeters', data)
+        handle_times.append(time.perf_counter() - decoded)
+        decode_times.append(decoded - started)
+        for state, subject, earcon in changes:
+            alerts.setdefault((state, subject), frame - frames // 2)
+    
+    handle_times.sort()
+    decode = statistics.fmean(decode_times) * 1e6
+    handle = statistics.fmean(handle_times) * 1e6
+    p99 = handle_times[int(0.99 * len(handle_times))] * 1e6
+    budget = (decode + handle) / (LevelWatchdog.FRAME_INTERVAL * 1e6) * 100
+    silent = alerts.get(('silent', 'Input 0'))
+    clipping = alerts.get(('clipping', 'Input 1'))
+    return decode, handle, p99, budget, silent, clipping, len(alerts)
+
+def main():
+    parser = argparse.ArgumentParser(description="Audio level watchdog cost per InputVolumeMeters frame")
+    parser.add_argument('--inputs', type=int, nargs='+', default=[10, 30, 100])
+    parser.add_argument('--frames', type=int, default=1200, help="Frames per case, 20 are one second")
+    parser.add_argument('--channels', type=int, default=2)
+    args = parser.parse_args()
+
+    print(f"{'inputs':>8}{'decode us':>12}{'handle us':>12}{'p99 us':>10}{'budget %':>10}"
+          f"{'silent at':>12}{'clip at':>10}{'alerts':>8}")
+    for inputs in args.inputs:
+        decode, handle, p99, budget, silent, clipping, alerts = run(inputs, args.frames, args.channels)
+        print(f"{inputs:>8}{decode:>12.1f}{handle:>12.1f}{p99:>10.1f}{budget:>10.2f}"
+              f"{str(silent):>12}{str(clipping):>10}{alerts:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Error logging benchmark - what an error storm costs the thread that logs it.
+
+Logs --count errors from one thread, the way a polling loop does while OBS is unreachable, once
+with the same message every time and once with a different message every time. Each case runs
+with the old synchronous FileHandler and with the current setup, where records are queued to a
+writer thread and repeats of one message are counted instead of written. For each it reports:
+
+    mean us         average time of one logger.error call
+    max ms          the slowest call
+    lines           lines that ended up in the log file
+    drain ms        time after the storm until the writer thread caught up
+
+--disk-delay-ms delays every write, like a slow or busy disk.
+
+    python benchmarks/bench_logging.py
+    python benchmarks/bench_logging.py --count 20000 --disk-delay-ms 1
+"""
+import argparse
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+
+from log_handler import ThrottledQueueHandler  # noqa: E402
+
+class SlowFileHandler(logging.handlers.RotatingFileHandler):
+    """File handler that takes `delay` seconds longer for every record"""
+
+    def __init__(self, path, delay):
+        super().__init__(path, maxBytes=64 * 1024 * 1024, backupCount=1)
+        self.delay = delay
+
+    def emit(self, record):
+        if self.delay:
+            time.sleep(self.delay)
+        super().emit(record)
+
+def run_case(queued, same, count, delay, directory):
+    """Log `count` errors and return the result row"""
+    path = os.path.join(directory, f"errors-{queued}-{same}.log")
+    file_handler = SlowFileHandler(path, delay)
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    logger = logging.getLogger(f"bench-{queued}-{same}")
+    logger.setLevel(logging.ERROR)
+    logger.propagate = False
+    listener = None
+    if queued:
+        handler = ThrottledQueueHandler(queue.SimpleQueue())
+        listener = logging.handlers.QueueListener(handler.queue, file_handler)
+        listener.start()
+    else:
+        handler = file_handler
+    logger.addHandler(handler)
+
+    durations = []
+    for index in range(count):
+        message = "Error getting scene items: connection refused" if same else f"Error getting scene item {index}"
+        started = time.perf_counter()
+        logger.error(message)
+        durations.append(time.perf_counter() - started)
+
+    drain_started = time.perf_counter()
+    if listener:
+        handler.flush_repeats()
+        listener.stop()
+    drain = time.perf_counter() - drain_started
+    logger.removeHandler(handler)
+    file_handler.close()
+    with open(path) as f:
+        lines = sum(1 for _ in f)
+    return {
+        'mean_us': round(sum(durations) / len(durations) * 1e6, 1),
+        'max_ms': round(max(durations) * 1000, 2),
+        'lines': lines,
+        'drain_ms': round(drain * 1000, 1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Error logging cost for the thread that logs")
+    parser.add_argument('--count', type=int, default=20000, help="Errors logged per case")
+    parser.add_argument('--disk-delay-ms', type=float, default=0.0, help="Simulated delay of every write")
+    args = parser.parse_args()
+
+    columns = ('mean_us', 'max_ms', 'lines', 'drain_ms')
+    print(f"{'case':<18}" + "".join(f"{column:>12}" for column in columns))
+    with tempfile.TemporaryDirectory() as directory:
+        for same in (True, False):
+            for queued in (False, True):
+                result = run_case(queued, same, args.count, args.disk_delay_ms / 1000, directory)
+                name = f"{'same' if same else 'unique'}-{'queued' if queued else 'direct'}"
+                print(f"{name:<18}" + "".join(f"{result[column]:>12}" for column in columns))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Profiling overhead benchmark - what --profile costs while sources are toggled.
+
+fake_obs.py runs in its own process and toggles --items sources at --rate per second while a
+headless OBSSourceMonitor announces them with profiling off, with it on, and with it on while a CPU
+profile is captured for the whole run. For each case it reports:
+
+    p50/p99 ms      time from a toggle to its announcement
+    missed          toggles that were never announced
+    cpu %           monitor process CPU while toggling
+    rss MB          resident memory at the end of the run
+    sample ms       time to take one resource sample, the sampler thread holds the GIL meanwhile
+
+    python benchmarks/bench_profile.py
+    python benchmarks/bench_profile.py --items 1000 --interval 1
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(ROOT))
+
+from bench_detection import HeadlessMonitor, match_toggles, percentile, run_server  # noqa: E402
+import profiler  # noqa: E402
+
+def run_case(profile, capture, items, duration, rate, interval, directory):
+    """Toggle for `duration` seconds and return the result row"""
+    context = multiprocessing.get_context('spawn')
+    parent, child = context.Pipe()
+    server = context.Process(target=run_server, args=(child, items, 0.0, 1234), daemon=True)
+    server.start()
+    port = parent.recv()
+
+    bench = HeadlessMonitor({
+        'port': port,
+        'use_speech': False,
+        'audio_backend': 'null',
+        'state_file': '',
+        'journal': {'enabled': False},
+        'debounce_ms': 0,
+        'flap_threshold': 0,
+        'profile': {
+            'enabled': profile,
+            'file': os.path.join(directory, 'profile.jsonl'),
+            'interval': interval,
+            'capture_seconds': duration,
+        },
+    })
+    try:
+        if not bench.start_monitoring():
+            raise RuntimeError(f"Could not connect to the fake server on port {port}")
+        capturing = None
+        if capture:
+            capturing = threading.Thread(target=profiler.capture, args=(bench.loop, directory, duration))
+            capturing.start()
+        cpu_start = time.process_time()
+        parent.send(('toggle', rate, duration))
+        stats = parent.recv()
+        cpu = time.process_time() - cpu_start
+        time.sleep(0.2)
+        if capturing:
+            capturing.join()
+
+        sample_ms = 0.0
+        if bench.profiler:
+            started = time.perf_counter()
+            bench.profiler.sample()
+            sample_ms = (time.perf_counter() - started) * 1000
+        rss = profiler.rss_bytes()
+    finally:
+        bench.stop_monitoring()
+        parent.send(('stop',))
+        server.join(timeout=5)
+
+    latencies, missed = match_toggles(stats['toggles'], bench.notifications)
+    return {
+        'p50_ms': round(percentile(latencies, 0.50), 2),
+        'p99_ms': round(percentile(latencies, 0.99), 2),
+        'missed': missed,
+        'cpu_percent': round(cpu / duration * 100, 2),
+        'rss_mb': round(rss / (1024 * 1024), 1),
+        'sample_ms': round(sample_ms, 2),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Profiling overhead benchmark against a fake OBS server")
+    parser.add_argument('--items', type=int, default=100)
+    parser.add_argument('--duration', type=float, default=5.0, help="Seconds of toggling per case")
+    parser.add_argument('--rate', type=float, default=20.0, help="Toggles per second")
+    parser.add_argument('--interval', type=float, default=1.0, help="Seconds between resource samples")
+    args = parser.parse_args()
+
+    columns = ('p50_ms', 'p99_ms', 'missed', 'cpu_percent', 'rss_mb', 'sample_ms')
+    print(f"{'case':<10}" + "".join(f"{column:>14}" for column in columns))
+    for name, profile, capture in (('off', False, False), ('profile', True, False), ('capture', True, True)):
+        with tempfile.TemporaryDirectory() as directory:
+            result = run_case(profile, capture, args.items, args.duration, args.rate, args.interval, directory)
+        print(f"{name:<10}" + "".join(f"{result[column]:>14}" for column in columns))
+
+if __name__ == "__main__":
+    main()
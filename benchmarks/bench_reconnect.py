@@ -0,0 +1,121 @@
+"""Reconnect benchmark - how fast a headless OBSSourceMonitor notices a lost connection and recovers.
+
+The fake server from fake_obs.py runs in its own process and breaks the connection three ways:
+
+    drop        connections aborted, like OBS crashing
+    freeze      connections stop answering, like a hung OBS or a dead network path
+    restart     connections aborted and the port closed for --outage seconds
+
+For each case it reports, averaged over --runs:
+
+    detect ms   time from the failure to the monitor noticing it
+    recover ms  time from the failure to the monitor being connected and back in sync
+
+    python benchmarks/bench_reconnect.py                 run and compare against baselines.json
+    python benchmarks/bench_reconnect.py --update        run and rewrite baselines.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from bench_detection import BASELINES, HeadlessMonitor, run_server  # noqa: E402
+
+def run_case(kind, mode, runs, outage, items):
+    """Break the connection `runs` times and return the result row"""
+    context = multiprocessing.get_context('spawn')
+    parent, child = context.Pipe()
+    server = context.Process(target=run_server, args=(child, items, 0.0, 1234), daemon=True)
+    server.start()
+    port = parent.recv()
+
+    bench = HeadlessMonitor({
+        'port': port,
+        'monitor_mode': mode,
+        'use_speech': False,
+        'use_tones': True,
+        'audio_backend': 'null',
+        'state_file': '',
+        'journal': {'enabled': False},
+    })
+    instance = bench.instances[0]
+    detect, recover = [], []
+    try:
+        if not bench.start_monitoring():
+            raise RuntimeError(f"Could not connect to the fake server on port {port}")
+        for _ in range(runs):
+            time.sleep(0.5)
+            recovered_before = instance.recovered_at
+            parent.send((kind, outage) if kind == 'restart' else (kind,))
+            failed_at = parent.recv()
+            
+            deadline = time.perf_counter() + 30
+            while instance.recovered_at == recovered_before and time.perf_counter() < deadline:
+                time.sleep(0.005)
+            if instance.recovered_at == recovered_before:
+                raise RuntimeError(f"{kind}: the monitor did not recover")
+            detect.append((instance.loss_detected_at - failed_at) * 1000)
+            recover.append((instance.recovered_at - failed_at) * 1000)
+    finally:
+        bench.stop_monitoring()
+        parent.send(('stop',))
+        server.join(timeout=5)
+
+    return {
+        'detect_ms': round(statistics.fmean(detect), 1),
+        'detect_max_ms': round(max(detect), 1),
+        'recover_ms': round(statistics.fmean(recover), 1),
+        'recover_max_ms': round(max(recover), 1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Connection loss detection and recovery benchmark against a fake OBS server")
+    parser.add_argument('--kinds', nargs='+', default=['drop', 'freeze', 'restart'], choices=['drop', 'freeze', 'restart'])
+    parser.add_argument('--modes', nargs='+', default=['events', 'polling'], choices=['events', 'polling'])
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--outage', type=float, default=1.0, help="Seconds the port stays closed in the restart case")
+    parser.add_argument('--items', type=int, default=100)
+    parser.add_argument('--tolerance', type=float, default=2.0, help="Allowed factor over baseline")
+    parser.add_argument('--update', action='store_true', help="Write the results as the new baselines")
+    args = parser.parse_args()
+
+    baselines = {}
+    if os.path.exists(BASELINES):
+        with open(BASELINES) as f:
+            baselines = json.load(f)
+
+    columns = ('detect_ms', 'detect_max_ms', 'recover_ms', 'recover_max_ms')
+    print(f"{'case':<26}" + "".join(f"{column:>16}" for column in columns))
+
+    results = {}
+    problems = []
+    for kind in args.kinds:
+        for mode in args.modes:
+            name = f"reconnect-{kind}-{mode}"
+            result = results[name] = run_case(kind, mode, args.runs, args.outage, args.items)
+            print(f"{name:<26}" + "".join(f"{result[column]:>16}" for column in columns))
+            baseline = baselines.get(name)
+            if baseline and not args.update:
+                for key in ('detect_ms', 'recover_ms'):
+                    if result[key] > baseline[key] * args.tolerance + 50:
+                        problems.append(f"{name} {key}: {result[key]} vs baseline {baseline[key]}")
+
+    if args.update:
+        baselines.update(results)
+        with open(BASELINES, 'w') as f:
+            json.dump(baselines, f, indent=4, sort_keys=True)
+        print(f"Baselines written to {BASELINES}")
+    elif problems:
+        print("\nRegressions:")
+        for problem in problems:
+            print(f"  {problem}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Shutdown and idle benchmark - exit latency and idle wakeups of the real program against fake_obs.py.
+
+monitor.py and journal.py are copied into a temporary directory next to a config.json that
+points at the fake server, and monitor.py is run there as the user would run it. Once it has
+been idle for a while the benchmark counts context switches of all its threads, then sends
+SIGINT and times how long the process takes to exit:
+
+    wakeups/s   voluntary and involuntary context switches per second while idle (Linux only)
+    exit ms     time from SIGINT until the process has exited
+
+    python benchmarks/bench_shutdown.py
+    python benchmarks/bench_shutdown.py --source /path/to/older/checkout     compare another version
+"""
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import shutil
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_detection import run_server  # noqa: E402
+
+def context_switches(pid):
+    """Context switches of every thread of a process so far, None where /proc is unavailable"""
+    total = 0
+    paths = glob.glob(f"/proc/{pid}/task/*/status")
+    if not paths:
+        return None
+    for path in paths:
+        try:
+            with open(path) as f:
+                for line in f:
+                    if line.startswith(('voluntary_ctxt_switches', 'nonvoluntary_ctxt_switches')):
+                        total += int(line.split()[1])
+        except FileNotFoundError:
+            pass  # Thread ended meanwhile
+    return total
+
+def run_once(source, port, mode, settle, window):
+    """Start the program, measure idle wakeups, interrupt it, returns (wakeups per second, exit ms)"""
+    with tempfile.TemporaryDirectory() as directory:
+        for path in glob.glob(os.path.join(source, '*.py')):
+            shutil.copy(path, directory)
+        with open(os.path.join(directory, 'config.json'), 'w') as f:
+            json.dump({'port': port, 'monitor_mode': mode, 'use_speech': False, 'audio_backend': 'null'}, f)
+        
+        process = subprocess.Popen([sys.executable, 'monitor.py'], cwd=directory,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            time.sleep(settle)
+            if process.poll() is not None:
+                raise RuntimeError(f"monitor.py exited early with code {process.returncode}")
+            
+            before = context_switches(process.pid)
+            time.sleep(window)
+            after = context_switches(process.pid)
+            wakeups = (after - before) / window if before is not None else float('nan')
+            
+            started = time.perf_counter()
+            process.send_signal(signal.SIGINT)
+            process.wait(timeout=30)
+            return wakeups, (time.perf_counter() - started) * 1000
+        finally:
+            if process.poll() is None:
+                process.kill()
+
+def main():
+    parser = argparse.ArgumentParser(description="Idle wakeups and exit latency of monitor.py")
+    parser.add_argument('--source', default=ROOT, help="Directory holding the monitor.py and journal.py to run")
+    parser.add_argument('--modes', nargs='+', default=['events', 'polling'], choices=['events', 'polling'])
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--settle', type=float, default=3.0, help="Seconds to let the program connect and go idle")
+    parser.add_argument('--window', type=float, default=5.0, help="Seconds to count idle wakeups over")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context('spawn')
+    parent, child = context.Pipe()
+    server = context.Process(target=run_server, args=(child, 100, 0.0, 1234), daemon=True)
+    server.start()
+    port = parent.recv()
+    try:
+        print(f"{'mode':<10}{'wakeups/s':>12}{'exit ms':>12}")
+        for mode in args.modes:
+            results = [run_once(args.source, port, mode, args.settle, args.window) for _ in range(args.runs)]
+            wakeups = statistics.median(result[0] for result in results)
+            exit_ms = statistics.median(result[1] for result in results)
+            print(f"{mode:<10}{wakeups:>12.1f}{exit_ms:>12.1f}")
+    finally:
+        parent.send(('stop',))
+        server.join(timeout=5)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Speech latency benchmark - live screen reader speech against pre-rendered phrases played from memory.
+
+fake_obs.py runs in its own process and toggles --items sources at --rate per second while a
+headless OBSSourceMonitor speaks every change. The live case speaks through a stand-in screen reader
+that takes --reader-delay-ms plus up to as much again of random jitter per utterance, since a real
+one cannot be timed here. The cached case renders "<name> shown" and "<name> hidden" for every
+source with the stub engine after the first snapshot and plays them through a 'timed' audio
+backend. For each case it reports:
+
+    p50/p99 ms      time from a toggle to its speech starting
+    missed          toggles that were never spoken
+    hit %           utterances played from the cache
+    prerender ms    time from connecting until every phrase was rendered
+
+    python benchmarks/bench_speech.py
+    python benchmarks/bench_speech.py --items 500 --reader-delay-ms 80
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(ROOT))
+
+from bench_detection import HeadlessMonitor, match_toggles, percentile, run_server  # noqa: E402
+
+class StandInReader:
+    """Screen reader stand-in - every utterance starts after a delay with jitter"""
+
+    def __init__(self, bench, delay):
+        self.bench = bench
+        self.delay = delay
+        self.random = random.Random(1)
+
+    def speak(self, text):
+        time.sleep(self.delay * (1 + self.random.random()))
+        self.bench.spoken(text)
+
+class SpeechBenchMonitor(HeadlessMonitor):
+    """Headless monitor that records when each utterance starts, from the screen reader or the cache"""
+
+    def __init__(self, config, reader_delay):
+        self.reader_delay = reader_delay
+        self.utterances = []
+        self.current_text = None
+        super().__init__(config)
+        if self.speech_audio:
+            play = self.speech_audio.backend.play
+
+            def timed_play(pcm):
+                self.spoken(self.current_text)
+                play(pcm)
+            self.speech_audio.backend.play = timed_play
+
+    def create_speech(self):
+        return StandInReader(self, self.reader_delay)
+
+    def speak(self, text, single_source=False):
+        self.current_text = text
+        super().speak(text, single_source)
+
+    def spoken(self, text):
+        """Record the sources an utterance names, as announcements"""
+        now = time.perf_counter()
+        label, _, names = text.partition(': ')
+        for state in ('shown', 'hidden'):
+            if label.endswith(f" {state}") and not names:
+                self.utterances.append((now, label[:-len(state) - 1], state == 'shown'))
+            elif label.endswith(f" {state}"):
+                self.utterances.extend((now, name, state == 'shown') for name in names.split(', '))
+
+def run_case(cached, items, duration, rate, reader_delay, directory):
+    """Toggle for `duration` seconds and return the result row"""
+    context = multiprocessing.get_context('spawn')
+    parent, child = context.Pipe()
+    server = context.Process(target=run_server, args=(child, items, 0.0, 1234), daemon=True)
+    server.start()
+    port = parent.recv()
+
+    bench = SpeechBenchMonitor({
+        'port': port,
+        'use_speech': True,
+        'use_tones': False,
+        'audio_backend': 'timed',
+        'state_file': '',
+        'journal': {'enabled': False},
+        'debounce_ms': 0,
+        'flap_threshold': 0,
+        'speech_max_names': items,
+        'speech_cache': {'enabled': cached, 'engine': 'stub', 'directory': directory},
+    }, reader_delay)
+    try:
+        started = time.perf_counter()
+        if not bench.start_monitoring():
+            raise RuntimeError(f"Could not connect to the fake server on port {port}")
+        prerender_ms = 0.0
+        if cached:
+            deadline = time.perf_counter() + 60
+            while len(bench.speech_cache.memory) < 2 * items and time.perf_counter() < deadline:
+                time.sleep(0.005)
+            prerender_ms = (time.perf_counter() - started) * 1000
+        time.sleep(0.2)
+        bench.utterances.clear()
+        hits_before = bench.speech_cache.hits if cached else 0
+        misses_before = bench.speech_cache.misses if cached else 0
+
+        parent.send(('toggle', rate, duration))
+        stats = parent.recv()
+        time.sleep(1.0)  # Let trailing speech finish
+        hits = bench.speech_cache.hits - hits_before if cached else 0
+        misses = bench.speech_cache.misses - misses_before if cached else 0
+    finally:
+        bench.stop_monitoring()
+        parent.send(('stop',))
+        server.join(timeout=5)
+
+    latencies, missed = match_toggles(stats['toggles'], bench.utterances)
+    return {
+        'p50_ms': round(percentile(latencies, 0.50), 2),
+        'p99_ms': round(percentile(latencies, 0.99), 2),
+        'missed': missed,
+        'hit_percent': round(100 * hits / (hits + misses), 1) if hits + misses else 0.0,
+        'prerender_ms': round(prerender_ms, 1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Live against pre-rendered speech latency, against a fake OBS server")
+    parser.add_argument('--items', type=int, default=100)
+    parser.add_argument('--duration', type=float, default=5.0, help="Seconds of toggling per case")
+    parser.add_argument('--rate', type=float, default=2.0, help="Toggles per second")
+    parser.add_argument('--reader-delay-ms', type=float, default=50.0, help="Stand-in screen reader delay before speaking")
+    args = parser.parse_args()
+
+    columns = ('p50_ms', 'p99_ms', 'missed', 'hit_percent', 'prerender_ms')
+    print(f"{'case':<10}" + "".join(f"{column:>14}" for column in columns))
+    for name, cached in (('live', False), ('cached', True)):
+        with tempfile.TemporaryDirectory() as directory:
+            result = run_case(cached, args.items, args.duration, args.rate, args.reader_delay_ms / 1000, directory)
+        print(f"{name:<10}" + "".join(f"{result[column]:>14}" for column in columns))
+
+if __name__ == "__main__":
+    main()
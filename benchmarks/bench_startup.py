@@ -0,0 +1,119 @@
+"""Startup benchmark - import cost of monitor.py and the time until the connected tone starts playing.
+
+Imports are measured with python -X importtime, like:
+
+    python -X importtime -c "import monitor"
+
+The connected tone is timed from process launch in a fresh interpreter against fake_obs.py, with the
+'timed' audio backend so tones take as long as they would on a real device. Two startup paths are
+compared:
+
+    sequential  the original order - import keyboard and the speech backend up front, play the
+                startup sound to the end, register the hotkey, then connect
+    parallel    OBSSourceMonitor.startup() - lazy imports, the connect runs while the startup
+                sound plays and the hotkey is registered
+
+    python benchmarks/bench_startup.py
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_detection import run_server  # noqa: E402
+
+CHILD = r'''
+import sys, time
+sys.path.insert(0, {root!r})
+if {sequential!r}:
+    import keyboard
+    from accessible_output3.outputs import auto
+import monitor
+
+config = {{
+    'port': {port!r},
+    'use_speech': False,
+    'audio_backend': 'timed',
+    'state_file': '',
+    'journal': {{'enabled': False}},
+}}
+bench = monitor.OBSSourceMonitor(config)
+connected = bench.audio.buffers['connected']
+play = bench.audio.backend.play
+
+def timed_play(pcm):
+    if pcm is connected:
+        print(f"connected {{time.perf_counter()}}", flush=True)
+    play(pcm)
+
+bench.audio.backend.play = timed_play
+if {sequential!r}:
+    bench.play_system_sound("startup")
+    bench.setup_hotkey()
+    bench.start_monitoring()
+else:
+    bench.startup()
+time.sleep(0.2)
+bench.stop_monitoring()
+'''
+
+def import_times(runs):
+    """Median cumulative import time of monitor and its heaviest direct imports, in ms"""
+    totals = []
+    children = {}
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import monitor'],
+                                cwd=ROOT, capture_output=True, text=True)
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative, name = line[len('import time:'):].split('|')
+            if name.strip() == 'monitor':
+                totals.append(int(cumulative) / 1000)
+            elif name.startswith('   ') and not name.startswith('    '):
+                children.setdefault(name.strip(), []).append(int(cumulative) / 1000)
+    heaviest = sorted(((statistics.median(times), name) for name, times in children.items()), reverse=True)
+    return statistics.median(totals), heaviest[:8]
+
+def connected_time(port, sequential):
+    """Milliseconds from process launch until the connected tone starts playing"""
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', CHILD.format(root=ROOT, port=port, sequential=sequential)],
+                            cwd=ROOT, capture_output=True, text=True)
+    for line in result.stdout.splitlines():
+        if line.startswith('connected '):
+            return (float(line.split()[1]) - started) * 1000
+    raise RuntimeError(f"No connected tone:\n{result.stderr}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time and time to the connected tone")
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    total, heaviest = import_times(args.runs)
+    print(f"import monitor: {total:.1f} ms")
+    for cumulative, name in heaviest:
+        print(f"    {name:<30}{cumulative:>8.1f} ms")
+
+    context = multiprocessing.get_context('spawn')
+    parent, child = context.Pipe()
+    server = context.Process(target=run_server, args=(child, 100, 0.0, 1234), daemon=True)
+    server.start()
+    port = parent.recv()
+    try:
+        print("\nlaunch to connected tone:")
+        for name, sequential in (('sequential', True), ('parallel', False)):
+            times = [connected_time(port, sequential) for _ in range(args.runs)]
+            print(f"    {name:<12}median {statistics.median(times):>7.1f} ms   min {min(times):>7.1f} ms")
+    finally:
+        parent.send(('stop',))
+        server.join(timeout=5)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Microbenchmark of one steady-state poll diff - name sets against slot bitsets.
+
+Builds a SceneGraph with N items (half of them enabled, a tenth inside a nested scene) and times the
+work a poll does after the snapshot has been stored:
+
+    sets      visible_sources() plus the two set differences the diff used to take
+    bitset    visible_mask() plus a XOR against the previous bitset
+    listed    the same with only_listed_sources and a source rule matching every tenth source,
+              the other sources get no slot and stay out of the bitset
+
+For each it reports microseconds per poll, with no change and with one item toggled, and the peak
+memory a poll allocates.
+
+    python benchmarks/bench_state.py
+    python benchmarks/bench_state.py --items 1000 10000 100000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from monitor import SourceProfiles  # noqa: E402
+from scene_graph import SceneGraph  # noqa: E402
+
+def build_graph(items, profiles=None):
+    """Program scene with `items` sources, a tenth of them inside a nested scene"""
+    def item(item_id, name, enabled, scene=False):
+        return {
+            'sceneItemId': item_id,
+            'sourceName': name,
+            'sceneItemEnabled': enabled,
+            'isGroup': False,
+            'sourceType': 'OBS_SOURCE_TYPE_SCENE' if scene else 'OBS_SOURCE_TYPE_INPUT',
+        }
+    nested = items // 10
+    graph = SceneGraph(profiles)
+    graph.root = 'Program'
+    graph.set_items('Program', [item(i, f"Source {i}", i % 2 == 0) for i in range(1, items - nested + 1)]
+                    + [item(items + 1, 'Nested', True, True)])
+    graph.set_items('Nested', [item(i, f"Nested source {i}", i % 2 == 0) for i in range(1, nested + 1)])
+    return graph
+
+def poll_sets(graph, state):
+    visible = graph.visible_sources()
+    shown = visible - state[0]
+    hidden = state[0] - visible
+    state[0] = visible
+    return shown, hidden
+
+def poll_bitset(graph, state):
+    mask = graph.visible_mask()
+    changed = mask ^ state[0]
+    state[0] = mask
+    return changed
+
+def measure(poll, graph, state, toggle, repeat):
+    """Microseconds per poll and peak bytes allocated by one poll"""
+    item = graph.scenes['Program'][10]
+    started = time.perf_counter()
+    for _ in range(repeat):
+        if toggle:
+            item['sceneItemEnabled'] = not item['sceneItemEnabled']
+        poll(graph, state)
+    elapsed = (time.perf_counter() - started) / repeat * 1e6
+
+    poll(graph, state)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    if toggle:
+        item['sceneItemEnabled'] = not item['sceneItemEnabled']
+    result = poll(graph, state)
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    del result
+    return elapsed, peak
+
+def main():
+    parser = argparse.ArgumentParser(description="Set against bitset visibility diff microbenchmark")
+    parser.add_argument('--items', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    columns = ('steady_us', 'toggle_us', 'peak_bytes')
+    print(f"{'case':<16}" + "".join(f"{column:>14}" for column in columns))
+    listed = SourceProfiles([{'match': '*0'}], only_listed=True)
+    for items in args.items:
+        graph = build_graph(items)
+        listed_graph = build_graph(items, listed)
+        cases = (
+            ('sets', poll_sets, graph),
+            ('bitset', poll_bitset, graph),
+            ('listed', poll_bitset, listed_graph),
+        )
+        for name, poll, graph in cases:
+            initial = graph.visible_sources() if poll is poll_sets else graph.visible_mask()
+            steady, peak = measure(poll, graph, [initial], False, args.repeat)
+            toggle, _ = measure(poll, graph, [initial], True, args.repeat)
+            row = (round(steady, 1), round(toggle, 1), peak)
+            print(f"{name + '-' + str(items):<16}" + "".join(f"{value:>14}" for value in row))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Scene structure benchmark - detection through nested scenes and groups, and while scenes are being edited.
+
+fake_obs.py runs in its own process and toggles random items anywhere in the program scene tree,
+so hiding a group or a nested scene hides everything it holds. The edits case also adds, removes
+and reorders items and renames scenes and groups while toggling. For each case it reports:
+
+    p50/p99 ms      time from a change in what is visible to its announcement
+    missed          changes that were never announced
+    spurious        announcements that match no change, such as a rename read as hidden and shown
+    req/s           requests sent to OBS, batched ones counted individually
+    edits           scene edits made during the run
+
+Cases: flat (one scene), nested (three scenes, each nested in the one before it), groups (one
+scene with groups) and edits (nested scenes with groups, edited at --edit-rate).
+
+    python benchmarks/bench_structure.py
+    python benchmarks/bench_structure.py --items 100 --modes events
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(ROOT))
+
+from bench_detection import HeadlessMonitor, match_toggles, percentile  # noqa: E402
+from fake_obs import FakeOBS  # noqa: E402
+
+CASES = {
+    # name: (scenes, groups, nested, edits)
+    'flat': (1, 0, False, False),
+    'nested': (3, 0, True, False),
+    'groups': (1, 3, False, False),
+    'edits': (3, 2, True, True),
+}
+
+def run_server(conn, scenes, items, groups, nested, seed):
+    """Fake OBS process - toggles and edits on command from the benchmark"""
+    async def serve():
+        obs = FakeOBS(scenes, items, seed=seed, groups=groups, group_items=5, nested=nested)
+        conn.send(await obs.start('localhost', 0))
+        loop = asyncio.get_running_loop()
+        while True:
+            command = await loop.run_in_executor(None, conn.recv)
+            if command[0] == 'run':
+                _, toggle_rate, edit_rate, duration = command
+                obs.reset_counters()
+                obs.edits = 0
+                tasks = [obs.run_toggles(toggle_rate, duration)]
+                if edit_rate:
+                    tasks.append(obs.run_edits(edit_rate, duration))
+                await asyncio.gather(*tasks)
+                conn.send({'requests': obs.requests, 'toggles': obs.toggles, 'edits': obs.edits})
+            else:
+                await obs.stop()
+                return
+    asyncio.run(serve())
+
+def count_spurious(toggles, notifications):
+    """Announcements whose source was not last changed to the announced state"""
+    by_source = {}
+    for t, name, state in toggles:
+        by_source.setdefault(name, []).append((t, state))
+    spurious = 0
+    for nt, name, state in notifications:
+        before = [toggle_state for t, toggle_state in by_source.get(name, ()) if t <= nt]
+        if not before or before[-1] != state:
+            spurious += 1
+    return spurious
+
+def run_case(mode, case, items, duration, rate, edit_rate):
+    """Run one case and return its result row"""
+    scenes, groups, nested, edits = CASES[case]
+    context = multiprocessing.get_context('spawn')
+    parent, child = context.Pipe()
+    server = context.Process(target=run_server, args=(child, scenes, items, groups, nested, 1234), daemon=True)
+    server.start()
+    port = parent.recv()
+
+    bench = HeadlessMonitor({
+        'port': port,
+        'monitor_mode': mode,
+        'use_speech': False,
+        'use_tones': True,
+        'audio_backend': 'null',
+        'state_file': '',
+        'journal': {'enabled': False},
+        'debounce_ms': 0,
+        'flap_threshold': 0,
+    })
+    try:
+        if not bench.start_monitoring():
+            raise RuntimeError(f"Could not connect to the fake server on port {port}")
+        time.sleep(0.5)
+        bench.notifications.clear()
+
+        parent.send(('run', rate, edit_rate if edits else 0, duration))
+        stats = parent.recv()
+        time.sleep(0.5)  # Let trailing announcements land
+    finally:
+        bench.stop_monitoring()
+        parent.send(('stop',))
+        server.join(timeout=5)
+
+    latencies, missed = match_toggles(stats['toggles'], bench.notifications)
+    return {
+        'p50_ms': round(percentile(latencies, 0.50), 2),
+        'p99_ms': round(percentile(latencies, 0.99), 2),
+        'missed': missed,
+        'spurious': count_spurious(stats['toggles'], bench.notifications),
+        'requests_per_s': round(stats['requests'] / duration, 1),
+        'edits': stats['edits'],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Detection through nested scenes and groups, and during scene edits")
+    parser.add_argument('--items', type=int, default=20, help="Sources per scene")
+    parser.add_argument('--modes', nargs='+', default=['events', 'polling'], choices=['events', 'polling'])
+    parser.add_argument('--cases', nargs='+', default=list(CASES), choices=list(CASES))
+    parser.add_argument('--duration', type=float, default=5.0, help="Seconds of toggling per case")
+    parser.add_argument('--rate', type=float, default=10.0, help="Toggles per second")
+    parser.add_argument('--edit-rate', type=float, default=2.0, help="Scene edits per second in the edits case")
+    args = parser.parse_args()
+
+    columns = ('p50_ms', 'p99_ms', 'missed', 'spurious', 'requests_per_s', 'edits')
+    print(f"{'case':<16}" + "".join(f"{column:>16}" for column in columns))
+    for mode in args.modes:
+        for case in args.cases:
+            result = run_case(mode, case, args.items, args.duration, args.rate, args.edit_rate)
+            name = f"{mode}-{case}"
+            print(f"{name:<16}" + "".join(f"{result[column]:>16}" for column in columns))
+
+if __name__ == "__main__":
+    main()
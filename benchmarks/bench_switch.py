@@ -0,0 +1,132 @@
+"""Scene switch benchmark - how fast a program scene switch is announced, with and without the warm scene cache.
+
+The fake server from fake_obs.py runs in its own process with --scenes scenes of --items sources each
+and switches the program scene through every scene twice, in a shuffled order. For each case it reports:
+
+    first p50/max ms    switch to announcement, the first time each scene is shown
+    again p50/max ms    the same for scenes that were shown before
+    req/switch          requests sent to OBS per switch
+    warm ms             time from connecting until every scene was cached, warming runs between events
+
+Without the warm cache a scene is fetched when it is first switched to, and cached from then on.
+--latency-ms delays every OBS response, like a remote or busy OBS.
+
+    python benchmarks/bench_switch.py
+    python benchmarks/bench_switch.py --scenes 200 --items 20 --latency-ms 10
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(ROOT))
+
+from bench_detection import HeadlessMonitor, percentile  # noqa: E402
+from fake_obs import FakeOBS  # noqa: E402
+
+def run_server(conn, scenes, items, latency):
+    """Fake OBS process - switches the program scene on command and reports when and at what request cost"""
+    async def serve():
+        obs = FakeOBS(scenes, items, latency=latency, seed=1234)
+        conn.send(await obs.start('localhost', 0))
+        loop = asyncio.get_running_loop()
+        while True:
+            command = await loop.run_in_executor(None, conn.recv)
+            if command[0] == 'switch':
+                switched_at = time.perf_counter()
+                await obs.set_program_scene(command[1])
+                conn.send(switched_at)
+            elif command[0] == 'requests':
+                conn.send(obs.requests)
+                obs.reset_counters()
+            else:
+                await obs.stop()
+                return
+    asyncio.run(serve())
+
+def run_case(warm, scenes, items, latency):
+    """Switch through every scene twice and return the result row"""
+    context = multiprocessing.get_context('spawn')
+    parent, child = context.Pipe()
+    server = context.Process(target=run_server, args=(child, scenes, items, latency), daemon=True)
+    server.start()
+    port = parent.recv()
+
+    bench = HeadlessMonitor({
+        'port': port,
+        'monitor_mode': 'events',
+        'use_speech': False,
+        'audio_backend': 'null',
+        'state_file': '',
+        'journal': {'enabled': False},
+        'debounce_ms': 0,
+        'flap_threshold': 0,
+        'warm_scene_cache': warm,
+    })
+    instance = bench.instances[0]
+    order = [f"Scene {index}" for index in range(2, scenes + 1)] + ["Scene 1"]
+    random.Random(1).shuffle(order)
+    first, again = [], []
+    try:
+        started = time.perf_counter()
+        if not bench.start_monitoring():
+            raise RuntimeError(f"Could not connect to the fake server on port {port}")
+        deadline = time.perf_counter() + 60
+        while instance.warming and time.perf_counter() < deadline:
+            time.sleep(0.001)
+        warm_ms = (time.perf_counter() - started) * 1000 if warm else 0.0
+        time.sleep(0.2)
+        parent.send(('requests',))
+        parent.recv()
+
+        shown = set()
+        for scene in order + order:
+            count = len(bench.notifications)
+            parent.send(('switch', scene))
+            switched_at = parent.recv()
+            deadline = time.perf_counter() + 5
+            while len(bench.notifications) == count and time.perf_counter() < deadline:
+                time.sleep(0.0005)
+            if len(bench.notifications) > count:
+                (again if scene in shown else first).append((bench.notifications[count][0] - switched_at) * 1000)
+            shown.add(scene)
+            time.sleep(0.02)
+        parent.send(('requests',))
+        requests = parent.recv()
+    finally:
+        bench.stop_monitoring()
+        parent.send(('stop',))
+        server.join(timeout=5)
+
+    return {
+        'first_p50_ms': round(percentile(first, 0.5), 2),
+        'first_max_ms': round(max(first, default=0.0), 2),
+        'again_p50_ms': round(percentile(again, 0.5), 2),
+        'again_max_ms': round(max(again, default=0.0), 2),
+        'req_per_switch': round(requests / (2 * len(order)), 2),
+        'warm_ms': round(warm_ms, 1),
+        'missed': 2 * len(order) - len(first) - len(again),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Program scene switch benchmark against a fake OBS server")
+    parser.add_argument('--scenes', type=int, default=50)
+    parser.add_argument('--items', type=int, default=20, help="Sources per scene")
+    parser.add_argument('--latency-ms', type=float, nargs='+', default=[0.0, 5.0], help="Simulated OBS response delays")
+    args = parser.parse_args()
+
+    columns = ('first_p50_ms', 'first_max_ms', 'again_p50_ms', 'again_max_ms', 'req_per_switch', 'warm_ms', 'missed')
+    print(f"{'case':<14}" + "".join(f"{column:>15}" for column in columns))
+    for latency in args.latency_ms:
+        for warm in (False, True):
+            result = run_case(warm, args.scenes, args.items, latency / 1000)
+            name = f"{'warm' if warm else 'cold'}-{latency:g}ms"
+            print(f"{name:<14}" + "".join(f"{result[column]:>15}" for column in columns))
+
+if __name__ == "__main__":
+    main()
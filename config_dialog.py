@@ -0,0 +1,181 @@
+import wx
+
+class ConfigDialog(wx.Dialog):
+    def __init__(self):
+        super().__init__(None, title="OBS WebSocket Configuration", 
+                         style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER)
+        
+        self.host = "localhost"
+        self.port = 4455
+        self.password = ""
+        self.use_speech = False
+        self.use_tones = True  # Default to True
+        
+        self.create_widgets()
+        self.layout_widgets()
+        self.bind_events()
+        
+        # Center the dialog
+        self.Center()
+        
+    def create_widgets(self):
+        """Create the input widgets"""
+        # Host input
+        self.host_label = wx.StaticText(self, label="Host:")
+        self.host_ctrl = wx.TextCtrl(self, value="localhost", size=(200, -1))
+        
+        # Port input
+        self.port_label = wx.StaticText(self, label="Port:")
+        self.port_ctrl = wx.SpinCtrl(self, value="4455", min=1, max=65535, size=(100, -1))
+        
+        # Password input
+        self.password_label = wx.StaticText(self, label="Password (optional):")
+        self.password_ctrl = wx.TextCtrl(self, value="", style=wx.TE_PASSWORD, size=(200, -1))
+        
+        # Notification checkboxes (without a label)
+        self.speech_checkbox = wx.CheckBox(self, label="Use Speech")
+        self.tones_checkbox = wx.CheckBox(self, label="Use Tones")
+        
+        # Set default values
+        self.speech_checkbox.SetValue(False)  # Default to False
+        self.tones_checkbox.SetValue(True)    # Default to True
+        
+        # Buttons with accelerator keys
+        self.ok_button = wx.Button(self, wx.ID_OK, "&Save && Connect")
+        self.cancel_button = wx.Button(self, wx.ID_CANCEL, "Use &Defaults")
+        
+        # Set default button
+        self.ok_button.SetDefault()
+        
+    def layout_widgets(self):
+        """Layout the widgets using sizers"""
+        main_sizer = wx.BoxSizer(wx.VERTICAL)
+        
+        # Add some padding
+        main_sizer.Add((0, 10))
+        
+        # Host row
+        host_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        host_sizer.Add(self.host_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 10)
+        host_sizer.Add(self.host_ctrl, 1, wx.EXPAND)
+        main_sizer.Add(host_sizer, 0, wx.EXPAND | wx.LEFT | wx.RIGHT, 20)
+        main_sizer.Add((0, 10))
+        
+        # Port row
+        port_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        port_sizer.Add(self.port_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 10)
+        port_sizer.Add(self.port_ctrl, 0)
+        main_sizer.Add(port_sizer, 0, wx.LEFT | wx.RIGHT, 20)
+        main_sizer.Add((0, 10))
+        
+        # Password row
+        password_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        password_sizer.Add(self.password_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 10)
+        password_sizer.Add(self.password_ctrl, 1, wx.EXPAND)
+        main_sizer.Add(password_sizer, 0, wx.EXPAND | wx.LEFT | wx.RIGHT, 20)
+        main_sizer.Add((0, 15))
+        
+        # Checkbox row (without label)
+        checkbox_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        checkbox_sizer.Add(self.speech_checkbox, 0, wx.RIGHT, 20)
+        checkbox_sizer.Add(self.tones_checkbox, 0)
+        main_sizer.Add(checkbox_sizer, 0, wx.LEFT | wx.RIGHT, 20)
+        main_sizer.Add((0, 15))
+        
+        # Button row
+        button_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        button_sizer.Add(self.cancel_button, 0, wx.RIGHT, 10)
+        button_sizer.Add(self.ok_button, 0)
+        main_sizer.Add(button_sizer, 0, wx.ALIGN_RIGHT | wx.LEFT | wx.RIGHT, 20)
+        main_sizer.Add((0, 15))
+        
+        self.SetSizer(main_sizer)
+        self.Fit()
+        
+    def bind_events(self):
+        """Bind events"""
+        self.Bind(wx.EVT_BUTTON, self.on_ok, self.ok_button)
+        self.Bind(wx.EVT_BUTTON, self.on_cancel, self.cancel_button)
+        
+        # Handle keyboard shortcuts
+        self.Bind(wx.EVT_CHAR_HOOK, self.on_key)
+        
+        # Set up accelerator table for Alt+S and Alt+D
+        entries = []
+        entries.append(wx.AcceleratorEntry(wx.ACCEL_ALT, ord('S'), self.ok_button.GetId()))
+        entries.append(wx.AcceleratorEntry(wx.ACCEL_ALT, ord('D'), self.cancel_button.GetId()))
+        accel_table = wx.AcceleratorTable(entries)
+        self.SetAcceleratorTable(accel_table)
+        
+    def on_key(self, event):
+        """Handle key events"""
+        if event.GetKeyCode() == wx.WXK_ESCAPE:
+            # Check if neither option is selected
+            if not self.speech_checkbox.GetValue() and not self.tones_checkbox.GetValue():
+                self.show_error_and_exit()
+            else:
+                # Use CallAfter to ensure proper cleanup for screen readers
+                wx.CallAfter(self.EndModal, wx.ID_CANCEL)
+        else:
+            event.Skip()
+            
+    def on_ok(self, event):
+        """Handle OK button (Alt+S)"""
+        # Validate inputs
+        host = self.host_ctrl.GetValue().strip()
+        if not host:
+            wx.MessageBox("Host cannot be empty", "Error", wx.OK | wx.ICON_ERROR)
+            return
+            
+        # Check if neither notification option is selected
+        if not self.speech_checkbox.GetValue() and not self.tones_checkbox.GetValue():
+            self.show_error_and_exit()
+            return
+        
+        port = self.port_ctrl.GetValue()
+        password = self.password_ctrl.GetValue()
+        
+        # Store values
+        self.host = host
+        self.port = port
+        self.password = password
+        self.use_speech = self.speech_checkbox.GetValue()
+        self.use_tones = self.tones_checkbox.GetValue()
+        
+        self.EndModal(wx.ID_OK)
+        
+    def on_cancel(self, event):
+        """Handle Cancel button (Alt+D) - use defaults"""
+        # Check if neither option is selected
+        if not self.speech_checkbox.GetValue() and not self.tones_checkbox.GetValue():
+            self.show_error_and_exit()
+            return
+            
+        self.host = "localhost"
+        self.port = 4455
+        self.password = ""
+        self.use_speech = self.speech_checkbox.GetValue()
+        self.use_tones = self.tones_checkbox.GetValue()
+        self.EndModal(wx.ID_CANCEL)
+        
+    def show_error_and_exit(self):
+        """Show error message and exit application"""
+        dlg = wx.MessageDialog(
+            self,
+            "You must select at least one notification option (Speech or Tones).",
+            "Error",
+            wx.OK | wx.ICON_ERROR
+        )
+        dlg.ShowModal()
+        dlg.Destroy()
+        self.EndModal(wx.ID_CLOSE)
+        
+    def get_config(self):
+        """Get the configuration values"""
+        return {
+            'host': self.host,
+            'port': self.port,
+            'password': self.password,
+            'use_speech': self.use_speech,
+            'use_tones': self.use_tones
+        }
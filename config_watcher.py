@@ -0,0 +1,114 @@
+"""Change notification for config.json"""
+import ctypes
+import logging
+import os
+import sys
+
+class ConfigWatcher:
+    """Notices changes to config.json without re-reading it.
+
+    On Linux an inotify watch on the config directory wakes the event loop only when a file is
+    written or moved into place there, so an idle watcher costs nothing. Elsewhere the file's
+    mtime and size are compared every `interval` seconds. Editors often save in several steps, so
+    `callback` runs once the file has been quiet for `settle` seconds.
+    """
+
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    EVENT_HEADER = 16  # struct inotify_event without its name: int wd, uint32 mask, cookie, len
+
+    def __init__(self, path, callback, interval=1.0, settle=0.1):
+        self.path = path
+        self.name = os.path.basename(path).encode()
+        self.callback = callback
+        self.interval = interval
+        self.settle = settle
+        self.logger = logging.getLogger('OBSMonitor')
+        self.loop = None
+        self.fd = None
+        self.timer = None
+        self.pending = None
+        self.signature = self.stat()
+
+    def stat(self):
+        try:
+            info = os.stat(self.path)
+            return info.st_mtime_ns, info.st_size
+        except OSError:
+            return None
+
+    def start(self, loop):
+        """Start watching, must be called on the event loop thread"""
+        self.loop = loop
+        if sys.platform.startswith('linux'):
+            try:
+                self.fd = self.open_inotify()
+                loop.add_reader(self.fd, self.on_inotify)
+                return
+            except Exception as e:
+                self.logger.error(f"inotify unavailable, checking config.json every {self.interval}s: {e}")
+                self.close_fd()
+        self.timer = loop.call_later(self.interval, self.check)
+
+    def open_inotify(self):
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        if libc.inotify_add_watch(fd, os.path.dirname(self.path).encode(), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(errno, os.strerror(errno))
+        return fd
+
+    def on_inotify(self):
+        """Read the pending inotify events and react if one of them is the config file"""
+        try:
+            data = os.read(self.fd, 4096)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset + self.EVENT_HEADER <= len(data):
+            name_length = int.from_bytes(data[offset + 12:offset + 16], sys.byteorder)
+            name = data[offset + self.EVENT_HEADER:offset + self.EVENT_HEADER + name_length].rstrip(b'\0')
+            offset += self.EVENT_HEADER + name_length
+            if name == self.name:
+                self.changed()
+
+    def check(self):
+        """mtime fallback - compare the file's signature on a timer"""
+        self.timer = self.loop.call_later(self.interval, self.check)
+        if self.stat() != self.signature:
+            self.changed()
+
+    def changed(self):
+        if self.pending:
+            self.pending.cancel()
+        self.pending = self.loop.call_later(self.settle, self.fire)
+
+    def fire(self):
+        self.pending = None
+        signature = self.stat()
+        if signature is None or signature == self.signature:
+            return
+        self.signature = signature
+        self.callback()
+
+    def close_fd(self):
+        if self.fd is not None:
+            try:
+                self.loop.remove_reader(self.fd)
+            except Exception:
+                pass
+            os.close(self.fd)
+            self.fd = None
+
+    def stop(self):
+        """Stop watching, must be called on the event loop thread"""
+        for handle in (self.timer, self.pending):
+            if handle:
+                handle.cancel()
+        self.timer = self.pending = None
+        self.close_fd()
@@ -0,0 +1,112 @@
+"""Debounce and flap detection for source visibility changes"""
+import itertools
+from typing import Dict, Optional, Set
+
+class _SourceTrack:
+    """Transition history for one source, kept only while the source is pending or flapping"""
+    __slots__ = ('changed_at', 'window_start', 'transitions', 'unreported', 'flapping')
+
+    def __init__(self, now):
+        self.changed_at = now
+        self.window_start = now
+        self.transitions = 0
+        self.unreported = 0
+        self.flapping = False
+
+class TransitionDebouncer:
+    """Debounce and flap detection between a visibility snapshot and its notification.
+
+    A change is only reported once the source has held its new state for `debounce` seconds, so a
+    shown/hidden/shown blip shorter than that is never announced. With a `flap_threshold` other than
+    0, a source that changes that many times within `flap_window` seconds is reported once as
+    flapping and then stays quiet until it has been stable for a full window, after which its final
+    state is reported if it differs from the last one announced. Every raw transition that is never
+    announced is counted in `suppressed`.
+    """
+
+    def __init__(self, debounce=0.0, flap_window=2.0, flap_threshold=0):
+        self.debounce = debounce
+        self.flap_window = flap_window
+        self.flap_threshold = flap_threshold
+        self.raw: Set[str] = set()
+        self.reported: Set[str] = set()
+        self.tracks: Dict[str, _SourceTrack] = {}
+        self.suppressed = 0
+
+    def reset(self, visible: Set[str]):
+        """Take a snapshot as the new baseline without reporting anything"""
+        self.raw = set(visible)
+        self.reported = set(visible)
+        self.tracks.clear()
+
+    def rename(self, old_name, new_name):
+        """Follow a renamed source"""
+        for states in (self.raw, self.reported):
+            if old_name in states:
+                states.discard(old_name)
+                states.add(new_name)
+        if old_name in self.tracks:
+            self.tracks[new_name] = self.tracks.pop(old_name)
+
+    def update(self, newly_shown, newly_hidden, now):
+        """Feed the sources that changed, returns (shown, hidden, flapping) lists that are due for announcement"""
+        for name in itertools.chain(newly_shown, newly_hidden):
+            track = self.tracks.get(name)
+            if track is None:
+                track = self.tracks[name] = _SourceTrack(now)
+            if now - track.window_start > self.flap_window:
+                track.window_start = now
+                track.transitions = 0
+            track.changed_at = now
+            track.transitions += 1
+            track.unreported += 1
+        self.raw.update(newly_shown)
+        self.raw.difference_update(newly_hidden)
+        return self.flush(now)
+
+    def flush(self, now):
+        """Report changes whose debounce or flap window has passed, returns (shown, hidden, flapping)"""
+        shown, hidden, flapping = [], [], []
+
+        for name, track in list(self.tracks.items()):
+            if self.flap_threshold and not track.flapping and track.transitions >= self.flap_threshold:
+                track.flapping = True
+                flapping.append(name)
+
+            if track.flapping:
+                if now - track.changed_at < self.flap_window:
+                    continue
+                track.flapping = False
+            elif now - track.changed_at < self.debounce:
+                continue
+
+            if track.unreported:
+                visible = name in self.raw
+                if visible != (name in self.reported):
+                    (shown if visible else hidden).append(name)
+                    if visible:
+                        self.reported.add(name)
+                    else:
+                        self.reported.discard(name)
+                    self.suppressed += track.unreported - 1
+                else:
+                    self.suppressed += track.unreported
+                track.unreported = 0
+
+            # Keep the history around until the flap window runs out
+            if now - track.window_start >= self.flap_window:
+                del self.tracks[name]
+
+        return shown, hidden, flapping
+
+    def next_deadline(self) -> Optional[float]:
+        """Time at which flush has something to do next, or None"""
+        deadlines = []
+        for track in self.tracks.values():
+            if track.flapping:
+                deadlines.append(track.changed_at + self.flap_window)
+            elif track.unreported:
+                deadlines.append(track.changed_at + self.debounce)
+            else:
+                deadlines.append(track.window_start + self.flap_window)
+        return min(deadlines) if deadlines else None
@@ -0,0 +1,527 @@
+"""Local stand-in for an OBS WebSocket v5 server, for load testing the monitor without OBS.
+
+Simulates N scenes with M items each, optionally with groups in every scene and each scene nested
+in the one before it, answers the requests the monitor uses (plain and batched), sends events to
+clients that subscribed to them, and can toggle random items of the program scene tree and edit it
+(add, remove and reorder items, rename nested scenes and groups) at fixed rates. Run it directly to
+point a real monitor at it:
+
+    python fake_obs.py --scenes 3 --items 100 --toggle-rate 5
+    python fake_obs.py --scenes 3 --items 20 --groups 2 --nested --toggle-rate 5 --edit-rate 1
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import itertools
+import json
+import random
+import secrets
+import time
+from typing import Dict, List, Set, Tuple
+
+import websockets
+
+# eventSubscriptions category of every event the fake server can send
+EVENT_CATEGORIES = {
+    'CurrentSceneCollectionChanged': 1 << 1,
+    'CurrentProgramSceneChanged': 1 << 2,
+    'CurrentPreviewSceneChanged': 1 << 2,
+    'SceneNameChanged': 1 << 2,
+    'InputMuteStateChanged': 1 << 3,
+    'InputVolumeChanged': 1 << 3,
+    'StreamStateChanged': 1 << 6,
+    'RecordStateChanged': 1 << 6,
+    'SceneItemCreated': 1 << 7,
+    'SceneItemRemoved': 1 << 7,
+    'SceneItemListReindexed': 1 << 7,
+    'SceneItemEnableStateChanged': 1 << 7,
+    'StudioModeStateChanged': 1 << 10,
+    'InputVolumeMeters': 1 << 16,
+}
+
+class FakeOBS:
+    """Minimal OBS WebSocket v5 server backed by an in-memory scene collection"""
+
+    def __init__(self, scenes=1, items=10, password='', latency=0.0, seed=None, groups=0, group_items=5, nested=False):
+        self.password = password
+        self.latency = latency
+        self.host = 'localhost'
+        self.port = None
+        self.random = random.Random(seed)
+        self.clients: Dict[object, int] = {}  # websocket -> eventSubscriptions
+        self.server = None
+        self.rejected_subscriptions = 0  # Identify asking for any of these categories is refused, like a server that cannot send them
+        self.batches = True  # False ignores RequestBatch, like a server without batch support
+        self.drop_identify = 0  # Connections to drop right after Identify without a close frame, like a flaky network
+
+        # scene or group name -> {scene item ID: item} in sceneItemIndex order, groups are not in GetSceneList
+        self.scenes: Dict[str, Dict[int, dict]] = {}
+        self.groups: Dict[str, Dict[int, dict]] = {}
+        for scene_index in range(1, scenes + 1):
+            scene_name = f"Scene {scene_index}"
+            self.scenes[scene_name] = {}
+            for item_index in range(1, items + 1):
+                self.add_item(scene_name, f"Source {scene_index}-{item_index}", item_index % 2 == 1)
+            for group_index in range(1, groups + 1):
+                group_name = f"Group {scene_index}-{group_index}"
+                self.groups[group_name] = {}
+                for item_index in range(1, group_items + 1):
+                    self.add_item(group_name, f"{group_name} Source {item_index}", item_index % 2 == 1)
+                self.add_item(scene_name, group_name, True, 'group')
+        if nested:
+            names = list(self.scenes)
+            for parent, child in zip(names, names[1:]):
+                self.add_item(parent, child, True, 'scene')
+        self.program_scene = "Scene 1"
+        self.preview_scene = None  # Studio mode preview, None while studio mode is off
+        self.inputs = {'Mic/Aux': False, 'Desktop Audio': False}  # input name -> muted
+        self.outputs = {'Stream': False, 'Record': False}  # output -> active
+
+        # Counters and the toggle log, for benchmarks
+        self.requests = 0
+        self.messages = 0
+        self.events_sent = 0  # Event messages actually sent, summed over clients
+        self.toggles: List[Tuple[float, str, bool]] = []  # Effective visibility changes in the program scene tree
+        self.edits = 0  # Edits made by edit_random, also numbers the sources and names it creates
+
+    def reset_counters(self):
+        self.requests = 0
+        self.messages = 0
+        self.events_sent = 0
+        self.toggles = []
+
+    async def start(self, host='localhost', port=4455):
+        """Start listening, returns the port actually bound (useful with port 0)"""
+        self.server = await websockets.serve(self.handle_client, host, port, max_size=None)
+        self.host = host
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self):
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def handle_client(self, websocket):
+        """Hello/Identify handshake, then serve requests until the client goes away"""
+        hello = {'obsWebSocketVersion': '5.5.0', 'rpcVersion': 1}
+        if self.password:
+            salt = base64.b64encode(secrets.token_bytes(32)).decode()
+            challenge = base64.b64encode(secrets.token_bytes(32)).decode()
+            hello['authentication'] = {'salt': salt, 'challenge': challenge}
+        await websocket.send(json.dumps({'op': 0, 'd': hello}))
+
+        identify = json.loads(await websocket.recv())
+        if self.drop_identify:
+            self.drop_identify -= 1
+            websocket.transport.abort()
+            return
+        if identify.get('op') != 1:
+            await websocket.close(4003, 'Not identified')
+            return
+        if self.password and identify['d'].get('authentication') != self.expected_auth(salt, challenge):
+            await websocket.close(4009, 'Authentication failed')
+            return
+        if identify['d'].get('eventSubscriptions', 0) & self.rejected_subscriptions:
+            await websocket.close(4008, 'Event subscriptions not supported')
+            return
+
+        await websocket.send(json.dumps({'op': 2, 'd': {'negotiatedRpcVersion': 1}}))
+        self.clients[websocket] = identify['d'].get('eventSubscriptions', 0)
+        try:
+            async for message in websocket:
+                await self.handle_message(websocket, json.loads(message))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self.clients.pop(websocket, None)
+
+    def expected_auth(self, salt, challenge):
+        secret = base64.b64encode(hashlib.sha256((self.password + salt).encode()).digest())
+        return base64.b64encode(hashlib.sha256(secret + challenge.encode()).digest()).decode()
+
+    async def handle_message(self, websocket, message):
+        """Answer a Request (op 6), a RequestBatch (op 8) or a Reidentify (op 3)"""
+        op = message.get('op')
+        data = message.get('d', {})
+        if op == 3:
+            if 'eventSubscriptions' in data:
+                self.clients[websocket] = data['eventSubscriptions']
+            await websocket.send(json.dumps({'op': 2, 'd': {'negotiatedRpcVersion': 1}}))
+            return
+        if op not in (6, 8) or (op == 8 and not self.batches):
+            return
+
+        self.messages += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if op == 6:
+            response = await self.handle_request(data['requestType'], data.get('requestData') or {})
+            response['requestId'] = data['requestId']
+            await websocket.send(json.dumps({'op': 7, 'd': response}))
+        else:
+            results = []
+            for request in data.get('requests', []):
+                result = await self.handle_request(request['requestType'], request.get('requestData') or {})
+                results.append(result)
+                if data.get('haltOnFailure') and not result['requestStatus']['result']:
+                    break
+            await websocket.send(json.dumps({'op': 9, 'd': {'requestId': data['requestId'], 'results': results}}))
+
+    async def handle_request(self, request_type, request_data):
+        """Dispatch one request to its handler"""
+        self.requests += 1
+        handler = getattr(self, f"request_{request_type}", None)
+        if handler is None:
+            return self.failure(request_type, 204, 'Unknown request type')
+        try:
+            response_data = await handler(request_data)
+        except KeyError as e:
+            return self.failure(request_type, 600, f"Resource not found: {e}")
+        response = {'requestType': request_type, 'requestStatus': {'result': True, 'code': 100}}
+        if response_data is not None:
+            response['responseData'] = response_data
+        return response
+
+    @staticmethod
+    def failure(request_type, code, comment):
+        return {'requestType': request_type, 'requestStatus': {'result': False, 'code': code, 'comment': comment}}
+
+    async def emit(self, event_type, event_data):
+        """Send an event to every client subscribed to its category"""
+        category = EVENT_CATEGORIES.get(event_type, 0)
+        message = json.dumps({'op': 5, 'd': {'eventType': event_type, 'eventIntent': category, 'eventData': event_data}})
+        for websocket, subscriptions in list(self.clients.items()):
+            if subscriptions & category:
+                try:
+                    await websocket.send(message)
+                    self.events_sent += 1
+                except websockets.ConnectionClosed:
+                    pass
+
+    # Requests
+
+    async def request_GetVersion(self, data):
+        return {'obsVersion': '30.0.0', 'obsWebSocketVersion': '5.5.0', 'rpcVersion': 1,
+                'availableRequests': [name[8:] for name in dir(self) if name.startswith('request_')]}
+
+    async def request_GetCurrentProgramScene(self, data):
+        return {'currentProgramSceneName': self.program_scene, 'sceneName': self.program_scene}
+
+    async def request_SetCurrentProgramScene(self, data):
+        await self.set_program_scene(data['sceneName'])
+
+    async def request_SetCurrentPreviewScene(self, data):
+        await self.set_preview_scene(data['sceneName'])
+
+    async def request_GetSceneList(self, data):
+        return {
+            'currentProgramSceneName': self.program_scene,
+            'currentPreviewSceneName': self.preview_scene,
+            'scenes': [{'sceneName': name, 'sceneIndex': index} for index, name in enumerate(self.scenes)],
+        }
+
+    async def request_GetSceneItemList(self, data):
+        return {'sceneItems': list(self.scenes[data['sceneName']].values())}
+
+    async def request_GetGroupSceneItemList(self, data):
+        return {'sceneItems': list(self.groups[data['sceneName']].values())}
+
+    async def request_GetSceneItemEnabled(self, data):
+        return {'sceneItemEnabled': self.items_of(data['sceneName'])[data['sceneItemId']]['sceneItemEnabled']}
+
+    async def request_SetSceneItemEnabled(self, data):
+        await self.set_enabled(data['sceneName'], data['sceneItemId'], data['sceneItemEnabled'])
+
+    async def request_GetStreamStatus(self, data):
+        return {'outputActive': self.outputs['Stream'], 'outputReconnecting': False}
+
+    async def request_StartStream(self, data):
+        await self.set_output('Stream', True)
+
+    async def request_StopStream(self, data):
+        await self.set_output('Stream', False)
+
+    async def request_GetRecordStatus(self, data):
+        return {'outputActive': self.outputs['Record'], 'outputPaused': False}
+
+    async def request_StartRecord(self, data):
+        await self.set_output('Record', True)
+
+    async def request_StopRecord(self, data):
+        await self.set_output('Record', False)
+
+    async def request_GetInputList(self, data):
+        return {'inputs': [{'inputName': name, 'inputKind': 'wasapi_input_capture'} for name in self.inputs]}
+
+    async def request_GetInputMute(self, data):
+        return {'inputMuted': self.inputs[data['inputName']]}
+
+    async def request_SetInputMute(self, data):
+        await self.set_input_mute(data['inputName'], data['inputMuted'])
+
+    async def request_ToggleInputMute(self, data):
+        await self.set_input_mute(data['inputName'], not self.inputs[data['inputName']])
+        return {'inputMuted': self.inputs[data['inputName']]}
+
+    # Scene collection
+
+    def items_of(self, name) -> Dict[int, dict]:
+        """Items of a scene or a group, raises KeyError for an unknown name"""
+        return self.scenes[name] if name in self.scenes else self.groups[name]
+
+    def add_item(self, scene_name, source_name, enabled, kind='input') -> dict:
+        """Append an item to a scene or group without sending an event - kind is 'input', 'scene' or 'group'"""
+        items = self.items_of(scene_name)
+        item_id = max(items, default=0) + 1
+        item = items[item_id] = {
+            'sceneItemId': item_id,
+            'sceneItemIndex': len(items),
+            'sourceName': source_name,
+            'sourceType': 'OBS_SOURCE_TYPE_INPUT' if kind == 'input' else 'OBS_SOURCE_TYPE_SCENE',
+            'inputKind': 'color_source_v3' if kind == 'input' else None,
+            'isGroup': kind == 'group',
+            'sceneItemEnabled': enabled,
+        }
+        return item
+
+    def program_tree(self) -> List[str]:
+        """The program scene and every nested scene and group below it, enabled or not"""
+        found = [self.program_scene]
+        for name in found:
+            for item in self.items_of(name).values():
+                if item['sourceType'] == 'OBS_SOURCE_TYPE_SCENE' and item['sourceName'] not in found:
+                    found.append(item['sourceName'])
+        return found
+
+    def visible_sources(self) -> Set[str]:
+        """Names of every effectively visible item of the program scene tree, nested scenes and groups included"""
+        visible = set()
+        seen = {self.program_scene}
+        stack = [self.program_scene]
+        while stack:
+            for item in self.items_of(stack.pop()).values():
+                if not item['sceneItemEnabled']:
+                    continue
+                visible.add(item['sourceName'])
+                if item['sourceType'] == 'OBS_SOURCE_TYPE_SCENE' and item['sourceName'] not in seen:
+                    seen.add(item['sourceName'])
+                    stack.append(item['sourceName'])
+        return visible
+
+    def record_toggles(self, before):
+        """Log every source whose effective visibility changed since `before`, for matching against announcements"""
+        after = self.visible_sources()
+        now = time.perf_counter()
+        self.toggles.extend((now, name, True) for name in after - before)
+        self.toggles.extend((now, name, False) for name in before - after)
+
+    # Simulation
+
+    async def set_enabled(self, scene_name, item_id, enabled):
+        """Change an item's visibility and send SceneItemEnableStateChanged"""
+        item = self.items_of(scene_name)[item_id]
+        before = self.visible_sources()
+        item['sceneItemEnabled'] = enabled
+        self.record_toggles(before)
+        await self.emit('SceneItemEnableStateChanged', {
+            'sceneName': scene_name, 'sceneItemId': item_id, 'sceneItemEnabled': enabled
+        })
+
+    async def create_item(self, scene_name, source_name, enabled=True, kind='input'):
+        """Add an item to a scene or group and send SceneItemCreated, returns its scene item ID"""
+        before = self.visible_sources()
+        item = self.add_item(scene_name, source_name, enabled, kind)
+        self.record_toggles(before)
+        await self.emit('SceneItemCreated', {
+            'sceneName': scene_name, 'sourceName': source_name,
+            'sceneItemId': item['sceneItemId'], 'sceneItemIndex': item['sceneItemIndex'],
+        })
+        return item['sceneItemId']
+
+    async def remove_item(self, scene_name, item_id):
+        """Remove an item from a scene or group and send SceneItemRemoved"""
+        items = self.items_of(scene_name)
+        before = self.visible_sources()
+        item = items.pop(item_id)
+        for index, other in enumerate(items.values()):
+            other['sceneItemIndex'] = index
+        self.record_toggles(before)
+        await self.emit('SceneItemRemoved', {'sceneName': scene_name, 'sourceName': item['sourceName'], 'sceneItemId': item_id})
+
+    async def reindex(self, scene_name):
+        """Reverse the order of the items of a scene or group and send SceneItemListReindexed"""
+        items = self.items_of(scene_name)
+        reordered = list(reversed(items.values()))
+        items.clear()
+        for index, item in enumerate(reordered):
+            item['sceneItemIndex'] = index
+            items[item['sceneItemId']] = item
+        await self.emit('SceneItemListReindexed', {
+            'sceneName': scene_name,
+            'sceneItems': [{'sceneItemId': item['sceneItemId'], 'sceneItemIndex': item['sceneItemIndex']} for item in reordered],
+        })
+
+    async def rename_scene(self, old_name, new_name):
+        """Rename a scene or group and every item showing it, and send SceneNameChanged"""
+        collection = self.scenes if old_name in self.scenes else self.groups
+        if old_name not in collection:
+            raise KeyError(old_name)
+        renamed = {new_name if name == old_name else name: items for name, items in collection.items()}
+        collection.clear()
+        collection.update(renamed)
+        for items in itertools.chain(self.scenes.values(), self.groups.values()):
+            for item in items.values():
+                if item['sourceType'] == 'OBS_SOURCE_TYPE_SCENE' and item['sourceName'] == old_name:
+                    item['sourceName'] = new_name
+        if self.program_scene == old_name:
+            self.program_scene = new_name
+        if self.preview_scene == old_name:
+            self.preview_scene = new_name
+        await self.emit('SceneNameChanged', {'oldSceneName': old_name, 'sceneName': new_name})
+
+    async def set_program_scene(self, scene_name):
+        """Switch the program scene and send CurrentProgramSceneChanged"""
+        if scene_name not in self.scenes:
+            raise KeyError(scene_name)
+        self.program_scene = scene_name
+        await self.emit('CurrentProgramSceneChanged', {'sceneName': scene_name})
+
+    async def set_preview_scene(self, scene_name):
+        """Switch the studio mode preview scene, turning studio mode on if needed, and send CurrentPreviewSceneChanged"""
+        if scene_name not in self.scenes:
+            raise KeyError(scene_name)
+        if self.preview_scene is None:
+            await self.emit('StudioModeStateChanged', {'studioModeEnabled': True})
+        self.preview_scene = scene_name
+        await self.emit('CurrentPreviewSceneChanged', {'sceneName': scene_name})
+
+    async def set_output(self, output, active):
+        """Start or stop streaming or recording and send its state change event"""
+        self.outputs[output] = active
+        state = 'OBS_WEBSOCKET_OUTPUT_STARTED' if active else 'OBS_WEBSOCKET_OUTPUT_STOPPED'
+        await self.emit(f"{output}StateChanged", {'outputActive': active, 'outputState': state})
+
+    async def set_input_mute(self, input_name, muted):
+        """Mute or unmute an input and send InputMuteStateChanged"""
+        if input_name not in self.inputs:
+            raise KeyError(input_name)
+        self.inputs[input_name] = muted
+        await self.emit('InputMuteStateChanged', {'inputName': input_name, 'inputMuted': muted})
+
+    async def toggle_random(self):
+        """Flip one random item of the program scene tree, a group or nested scene item hides or shows all it holds"""
+        items = [(name, item_id) for name in self.program_tree() for item_id in self.items_of(name)]
+        if items:
+            scene_name, item_id = self.random.choice(items)
+            await self.set_enabled(scene_name, item_id, not self.items_of(scene_name)[item_id]['sceneItemEnabled'])
+
+    async def edit_random(self):
+        """Make one random edit to the program scene tree - add or remove a source, reorder a scene or group, or rename one"""
+        scene_name = self.random.choice(self.program_tree())
+        self.edits += 1
+        edit = self.random.randrange(4)
+        if edit == 0:
+            await self.create_item(scene_name, f"Added {self.edits}", self.random.random() < 0.5)
+        elif edit == 1:
+            inputs = [item_id for item_id, item in self.items_of(scene_name).items() if item['sourceType'] == 'OBS_SOURCE_TYPE_INPUT']
+            if inputs:
+                await self.remove_item(scene_name, self.random.choice(inputs))
+        elif edit == 2:
+            await self.reindex(scene_name)
+        else:
+            await self.rename_scene(scene_name, f"{scene_name.split(' #')[0]} #{self.edits}")
+
+    def drop_clients(self):
+        """Abort every client connection, like OBS crashing - returns when it happened"""
+        dropped_at = time.perf_counter()
+        for websocket in list(self.clients):
+            websocket.transport.abort()
+        return dropped_at
+
+    def freeze_clients(self):
+        """Stop reading from every client, so requests and pings go unanswered like a hung OBS or a dead network path"""
+        frozen_at = time.perf_counter()
+        for websocket in list(self.clients):
+            websocket.transport.pause_reading()
+        self.clients.clear()
+        return frozen_at
+
+    async def restart(self, outage):
+        """Drop every client and stop listening for `outage` seconds, like OBS being restarted"""
+        stopped_at = self.drop_clients()
+        self.server.close()
+        await self.server.wait_closed()
+        await asyncio.sleep(outage)
+        await self.start(self.host, self.port)
+        return stopped_at
+
+    async def run_meters(self, duration=None):
+        """Send InputVolumeMeters every 50 ms like OBS does, muted inputs report silence"""
+        started = time.perf_counter()
+        next_frame = started
+        while duration is None or time.perf_counter() - started < duration:
+            inputs = []
+            for input_name, muted in self.inputs.items():
+                peak = 0.0 if muted else self.random.uniform(0.05, 0.6)
+                inputs.append({'inputName': input_name, 'inputLevelsMul': [[peak * 0.7, peak, peak]] * 2})
+            await self.emit('InputVolumeMeters', {'inputs': inputs})
+            next_frame += 0.05
+            await asyncio.sleep(max(0.0, next_frame - time.perf_counter()))
+
+    async def run_toggles(self, rate, duration=None):
+        """Toggle random program scene items `rate` times per second, for `duration` seconds or forever"""
+        interval = 1.0 / rate
+        started = time.perf_counter()
+        next_toggle = started
+        while duration is None or time.perf_counter() - started < duration:
+            await self.toggle_random()
+            next_toggle += interval
+            await asyncio.sleep(max(0.0, next_toggle - time.perf_counter()))
+
+    async def run_edits(self, rate, duration=None):
+        """Edit the program scene tree `rate` times per second, for `duration` seconds or forever"""
+        interval = 1.0 / rate
+        started = time.perf_counter()
+        next_edit = started
+        while duration is None or time.perf_counter() - started < duration:
+            await self.edit_random()
+            next_edit += interval
+            await asyncio.sleep(max(0.0, next_edit - time.perf_counter()))
+
+async def serve(args):
+    obs = FakeOBS(args.scenes, args.items, args.password, args.latency_ms / 1000, args.seed,
+                  args.groups, args.group_items, args.nested)
+    port = await obs.start(args.host, args.port)
+    print(f"Fake OBS listening on ws://{args.host}:{port} ({args.scenes} scenes x {args.items} items)")
+    tasks = [obs.run_meters()] if args.meters else []
+    if args.toggle_rate:
+        tasks.append(obs.run_toggles(args.toggle_rate))
+    if args.edit_rate:
+        tasks.append(obs.run_edits(args.edit_rate))
+    await asyncio.gather(*tasks, asyncio.Future())
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake OBS WebSocket v5 server")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=4455)
+    parser.add_argument('--password', default='')
+    parser.add_argument('--scenes', type=int, default=1)
+    parser.add_argument('--items', type=int, default=10)
+    parser.add_argument('--groups', type=int, default=0, help="Groups in every scene")
+    parser.add_argument('--group-items', type=int, default=5, help="Sources in every group")
+    parser.add_argument('--nested', action='store_true', help="Nest every scene in the one before it")
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="Delay before answering each message")
+    parser.add_argument('--toggle-rate', type=float, default=0.0, help="Random program scene toggles per second")
+    parser.add_argument('--edit-rate', type=float, default=0.0, help="Random program scene tree edits per second")
+    parser.add_argument('--meters', action='store_true', help="Send InputVolumeMeters every 50 ms")
+    parser.add_argument('--seed', type=int, default=None)
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
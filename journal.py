@@ -0,0 +1,244 @@
+"""Append-only journal of source visibility transitions, with rotation and a fast time range query.
+
+Every transition is one tab separated line:
+
+    <unix time in ms>  <instance>  <scene>  <+ shown / - hidden>  <source>
+
+Lines are buffered in memory and written by a background thread in batches, so recording never
+waits for the disk. Files rotate by size or age and are named after the time of their first
+record, to the millisecond. Next to each file a sparse index stores (time, byte offset) as two
+unsigned 64-bit integers every INDEX_EVERY bytes, so a query seeks straight to the right place of
+the right file instead of scanning months of logs:
+
+    python journal.py --from 20:14 --to 20:16
+    python journal.py --from "2026-10-01 20:00" --to "2026-10-01 23:00" --source "Cam"
+"""
+import bisect
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from array import array
+from datetime import datetime
+
+INDEX_EVERY = 4096  # Bytes of journal between two sparse index entries
+FILE_PREFIX = 'journal-'
+FILE_SUFFIX = '.log'
+INDEX_SUFFIX = '.idx'
+
+def clean(field) -> str:
+    """Keep tabs and line breaks in names from breaking the record format"""
+    return str(field or '').replace('\t', ' ').replace('\n', ' ').replace('\r', ' ')
+
+class Journal:
+    """Buffered writer for the transition journal"""
+
+    def __init__(self, directory, max_bytes=8 * 1024 * 1024, rotate_interval=86400.0, flush_interval=1.0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.flush_interval = flush_interval
+        self.logger = logging.getLogger('OBSMonitor')
+
+        self.buffer = []
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.has_records = threading.Event()
+
+        self.file = None
+        self.index_file = None
+        self.file_size = 0
+        self.file_started = 0.0
+        self.next_index_at = 0
+
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def record(self, instance_label, scene_name, shown, source_names, timestamp=None):
+        """Queue transitions of several sources that happened at the same time"""
+        ms = int((timestamp or time.time()) * 1000)
+        prefix = f"{ms}\t{clean(instance_label)}\t{clean(scene_name)}\t{'+' if shown else '-'}\t"
+        with self.lock:
+            self.buffer.extend((ms, f"{prefix}{clean(source_name)}\n") for source_name in source_names)
+        self.has_records.set()
+
+    def close(self):
+        """Write what is still buffered and stop the writer thread"""
+        self.stop_event.set()
+        self.has_records.set()
+        self.thread.join(timeout=2.0)
+        self._close_file()
+
+    def _run(self):
+        """Writer thread - sleeps until something is recorded, then writes what arrived within flush_interval"""
+        while not self.stop_event.is_set():
+            self.has_records.wait()
+            # Closing cuts the batching wait short
+            self.stop_event.wait(self.flush_interval)
+            self.has_records.clear()
+            self._flush()
+        self._flush()
+
+    def _flush(self):
+        with self.lock:
+            records, self.buffer = self.buffer, []
+        if not records:
+            return
+        try:
+            self._write(records)
+        except Exception as e:
+            self.logger.error(f"Error writing journal: {e}")
+
+    def _write(self, records):
+        """Append records to the current file, rotating and indexing as needed"""
+        if self.file and (self.file_size >= self.max_bytes or time.time() - self.file_started >= self.rotate_interval):
+            self._close_file()
+        if not self.file:
+            self._open_file(records[0][0])
+
+        chunk = []
+        index = array('Q')
+        offset = self.file_size
+        for ms, line in records:
+            if offset >= self.next_index_at:
+                index.extend((ms, offset))
+                self.next_index_at = offset + INDEX_EVERY
+            data = line.encode('utf-8')
+            chunk.append(data)
+            offset += len(data)
+
+        self.file.write(b''.join(chunk))
+        self.file.flush()
+        if index:
+            index.tofile(self.index_file)
+            self.index_file.flush()
+        self.file_size = offset
+
+    def _open_file(self, first_ms):
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"{FILE_PREFIX}{datetime.fromtimestamp(first_ms / 1000).strftime('%Y%m%d-%H%M%S')}-{first_ms % 1000:03d}"
+        path = os.path.join(self.directory, name + FILE_SUFFIX)
+        self.file = open(path, 'ab')
+        self.index_file = open(os.path.join(self.directory, name + INDEX_SUFFIX), 'ab')
+        self.file_size = self.file.tell()
+        # Appending to an existing file (a restart within the same millisecond) starts a fresh index run
+        self.next_index_at = self.file_size
+        self.file_started = time.time()
+
+    def _close_file(self):
+        for f in (self.file, self.index_file):
+            if f:
+                try:
+                    f.close()
+                except Exception as e:
+                    self.logger.error(f"Error closing journal: {e}")
+        self.file = None
+        self.index_file = None
+
+def journal_files(directory):
+    """Journal files in time order, as (first record time in ms, path)"""
+    files = []
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return files
+    for name in names:
+        if name.startswith(FILE_PREFIX) and name.endswith(FILE_SUFFIX):
+            stamp = name[len(FILE_PREFIX):-len(FILE_SUFFIX)]
+            try:
+                started = datetime.strptime(stamp[:15], '%Y%m%d-%H%M%S').timestamp()
+                started_ms = int(started) * 1000 + int(stamp[16:19])
+            except ValueError:
+                continue
+            files.append((started_ms, os.path.join(directory, name)))
+    files.sort()
+    return files
+
+def start_offset(path, start_ms):
+    """Byte offset to start reading a journal file at, from its sparse index"""
+    index = array('Q')
+    index_path = path[:-len(FILE_SUFFIX)] + INDEX_SUFFIX
+    try:
+        with open(index_path, 'rb') as f:
+            data = f.read()
+        index.frombytes(data[:len(data) - len(data) % 16])
+    except FileNotFoundError:
+        return 0
+    times = index[0::2]
+    position = bisect.bisect_left(times, start_ms) - 1
+    return index[position * 2 + 1] if position >= 0 else 0
+
+def query(directory, start_ms, end_ms):
+    """Yield (ms, instance, scene, shown, source) for every transition from start_ms up to end_ms"""
+    files = journal_files(directory)
+    for position, (started, path) in enumerate(files):
+        # A file holds records from its own start up to the start of the next one
+        if started > end_ms:
+            break
+        if position + 1 < len(files) and files[position + 1][0] < start_ms:
+            continue
+        with open(path, 'rb') as f:
+            f.seek(start_offset(path, start_ms))
+            for line in f:
+                fields = line.decode('utf-8', 'replace').rstrip('\n').split('\t')
+                if len(fields) != 5:
+                    continue
+                ms = int(fields[0])
+                if ms < start_ms:
+                    continue
+                if ms > end_ms:
+                    break
+                yield ms, fields[1], fields[2], fields[3] == '+', fields[4]
+
+def parse_time(text, day):
+    """Parse "HH:MM[:SS]" on the given day, or a full "YYYY-MM-DD HH:MM[:SS]" date and time"""
+    for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%dT%H:%M'):
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            pass
+    for fmt in ('%H:%M:%S', '%H:%M'):
+        try:
+            parsed = datetime.strptime(text, fmt)
+            return datetime.combine(day, parsed.time())
+        except ValueError:
+            pass
+    raise ValueError(f"Unrecognised time: {text}")
+
+def main():
+    import argparse  # Only the command line needs it, not the monitor importing this module
+
+    default_directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'journal')
+    parser = argparse.ArgumentParser(description="Show source visibility transitions recorded in the journal")
+    parser.add_argument('--dir', default=default_directory, help="Journal directory")
+    parser.add_argument('--from', dest='start', required=True, help='Start, "HH:MM[:SS]" or "YYYY-MM-DD HH:MM[:SS]"')
+    parser.add_argument('--to', dest='end', help="End, same formats, defaults to now")
+    parser.add_argument('--date', help="Day for times given without one, YYYY-MM-DD, defaults to today")
+    parser.add_argument('--instance', help="Only this instance label")
+    parser.add_argument('--source', help="Only sources matching this regular expression")
+    args = parser.parse_args()
+
+    day = datetime.strptime(args.date, '%Y-%m-%d').date() if args.date else datetime.now().date()
+    try:
+        start = parse_time(args.start, day)
+        end = parse_time(args.end, day) if args.end else datetime.now()
+    except ValueError as e:
+        parser.error(str(e))
+    source_filter = re.compile(args.source) if args.source else None
+
+    found = 0
+    for ms, instance, scene, shown, source in query(args.dir, int(start.timestamp() * 1000), int(end.timestamp() * 1000)):
+        if args.instance is not None and instance != args.instance:
+            continue
+        if source_filter and not source_filter.search(source):
+            continue
+        stamp = datetime.fromtimestamp(ms / 1000).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+        print(f"{stamp}  {instance or '-'}  {scene}  {'shown' if shown else 'hidden'}  {source}")
+        found += 1
+    if not found:
+        print("No transitions in that range", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
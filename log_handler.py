@@ -0,0 +1,73 @@
+"""Log handler that keeps an error storm from slowing the thread that logs it"""
+import logging
+import logging.handlers
+import threading
+import time
+
+class ThrottledQueueHandler(logging.handlers.QueueHandler):
+    """Hands log records to the log writer thread, counting repeats of a message instead of queueing them all.
+
+    Every distinct message gets a token bucket of `burst` records, refilled at one record per
+    `repeat_interval` seconds. Once a bucket is empty, a repeat of its message costs the logging
+    thread a dict lookup and is only counted. The count is written as one "(repeated N times in the
+    T s after it was last logged)" line, T running from the last copy that was written to the last
+    repeat, when the message is let through again, when any other message is logged after the
+    repeats stopped for repeat_interval, or when logging stops.
+    """
+    MAX_MESSAGES = 1024
+
+    def __init__(self, log_queue, burst=3, repeat_interval=10.0):
+        super().__init__(log_queue)
+        self.burst = burst
+        self.repeat_interval = repeat_interval
+        self.clock = time.monotonic
+        self.throttle_lock = threading.Lock()
+        self.buckets = {}  # (level, message) -> [tokens, refilled at, last written at]
+        self.repeats = {}  # (level, message) -> [count, last written at, last repeat, record] of repeats not written yet
+
+    def handle(self, record):
+        key = (record.levelno, record.getMessage())
+        now = self.clock()
+        with self.throttle_lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                if len(self.buckets) >= self.MAX_MESSAGES:
+                    self.buckets = {held: self.buckets[held] for held in self.repeats if held in self.buckets}
+                bucket = self.buckets[key] = [float(self.burst), now, now]
+            else:
+                refill = (now - bucket[1]) / self.repeat_interval if self.repeat_interval > 0 else self.burst
+                bucket[0] = min(float(self.burst), bucket[0] + refill)
+                bucket[1] = now
+            if bucket[0] < 1:
+                repeat = self.repeats.get(key)
+                if repeat is None:
+                    self.repeats[key] = [1, bucket[2], now, record]
+                else:
+                    repeat[0] += 1
+                    repeat[2] = now
+                return False
+            bucket[0] -= 1
+            bucket[2] = now
+            summaries = [self.summary(held, self.repeats.pop(held)) for held in [
+                held for held, repeat in self.repeats.items() if held == key or now - repeat[2] >= self.repeat_interval
+            ]]
+        for summary in summaries:
+            super().handle(summary)
+        return super().handle(record)
+
+    def summary(self, key, repeat):
+        """Log record that stands in for the repeats of one message"""
+        count, written, last, record = repeat
+        return logging.LogRecord(
+            record.name, record.levelno, record.pathname, record.lineno,
+            f"{key[1]} (repeated {count} {'time' if count == 1 else 'times'} in the {last - written:.1f} s after it was last logged)",
+            None, None
+        )
+
+    def flush_repeats(self):
+        """Write every repeat count that has not been written yet"""
+        with self.throttle_lock:
+            summaries = [self.summary(key, repeat) for key, repeat in self.repeats.items()]
+            self.repeats.clear()
+        for summary in summaries:
+            super().handle(summary)
@@ -0,0 +1,192 @@
+"""Histograms, counters and gauges for the monitor, rendered in the Prometheus text format"""
+import bisect
+import logging
+import os
+import threading
+from typing import Dict, Tuple
+
+class Histogram:
+    """Cumulative fixed-bucket histogram in the Prometheus layout"""
+    __slots__ = ('bounds', 'counts', 'total', 'count')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+class Metrics:
+    """Histograms and counters for the monitor's stages, exported in the Prometheus text format.
+
+    Series are created on first use and keyed by name plus labels. Gauges are callbacks that are
+    only evaluated when the metrics are rendered, so they cost nothing in between.
+    """
+
+    enabled = True
+
+    LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+    SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 1000)
+
+    HELP = {
+        'obs_request_rtt_seconds': "Round trip time of requests and request batches sent to OBS",
+        'snapshot_duration_seconds': "Time to take a full visibility snapshot",
+        'diff_size': "Sources reported per visibility change",
+        'notify_latency_seconds': "Time from an OBS event or snapshot to its announcement being queued",
+        'speech_queue_wait_seconds': "Time an announcement waited for the speech worker",
+        'audio_queue_wait_seconds': "Time a tone waited for the audio thread",
+        'speech_lock_wait_seconds': "Time spent waiting for the speech lock before speaking",
+        'reconnects_total': "Reconnect attempts after a lost connection",
+        'connections_lost_total': "Connections to OBS that were lost",
+        'connection_silence_seconds': "Time between the last message from OBS and noticing the connection was gone",
+        'connection_recovery_seconds': "Time from noticing a lost connection to being back in sync",
+    }
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms: Dict[Tuple[str, tuple], Histogram] = {}
+        self.counters: Dict[Tuple[str, tuple], float] = {}
+        self.gauges: Dict[Tuple[str, tuple], object] = {}
+        self._exporter_stop = threading.Event()
+        self._http_server = None
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS, **labels):
+        """Record one value in a histogram"""
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def inc(self, name, amount=1, **labels):
+        """Increase a counter"""
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def gauge(self, name, callback, **labels):
+        """Register a value that is read when the metrics are rendered"""
+        with self.lock:
+            self.gauges[(name, tuple(sorted(labels.items())))] = callback
+
+    def remove_gauge(self, name, **labels):
+        """Stop exporting a gauge, such as one of an instance that was dropped or relabelled"""
+        with self.lock:
+            self.gauges.pop((name, tuple(sorted(labels.items()))), None)
+
+    @staticmethod
+    def _labels(labels, extra=()):
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ''
+        return '{' + ','.join(f'{key}="{str(value)}"' for key, value in pairs) + '}'
+
+    def render(self) -> str:
+        """Render every series in the Prometheus text exposition format"""
+        lines = []
+        typed = set()
+
+        def header(name, kind):
+            if name not in typed:
+                typed.add(name)
+                if name in self.HELP:
+                    lines.append(f"# HELP obsmonitor_{name} {self.HELP[name]}")
+                lines.append(f"# TYPE obsmonitor_{name} {kind}")
+
+        with self.lock:
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                header(name, 'histogram')
+                cumulative = 0
+                for bound, count in zip(histogram.bounds, histogram.counts):
+                    cumulative += count
+                    lines.append(f"obsmonitor_{name}_bucket{self._labels(labels, [('le', bound)])} {cumulative}")
+                lines.append(f"obsmonitor_{name}_bucket{self._labels(labels, [('le', '+Inf')])} {histogram.count}")
+                lines.append(f"obsmonitor_{name}_sum{self._labels(labels)} {histogram.total}")
+                lines.append(f"obsmonitor_{name}_count{self._labels(labels)} {histogram.count}")
+            for (name, labels), value in sorted(self.counters.items()):
+                header(name, 'counter')
+                lines.append(f"obsmonitor_{name}{self._labels(labels)} {value}")
+            gauges = sorted(self.gauges.items(), key=lambda entry: entry[0])
+
+        for (name, labels), callback in gauges:
+            try:
+                value = callback()
+            except Exception:
+                continue
+            header(name, 'gauge')
+            lines.append(f"obsmonitor_{name}{self._labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_file(self, path):
+        """Write the metrics to a file, replacing it atomically so scrapers never see half a file"""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as f:
+            f.write(self.render())
+        os.replace(temp_path, path)
+
+    def start_exporters(self, file_path=None, file_interval=10.0, http_host='127.0.0.1', http_port=0):
+        """Start the periodic file writer and/or the HTTP endpoint"""
+        if file_path:
+            threading.Thread(target=self._file_exporter, args=(file_path, file_interval), daemon=True).start()
+        if http_port:
+            import http.server  # Only needed when the endpoint is switched on
+            metrics = self
+
+            class MetricsHandler(http.server.BaseHTTPRequestHandler):
+                def do_GET(self):
+                    body = metrics.render().encode()
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):
+                    pass
+
+            self._http_server = http.server.ThreadingHTTPServer((http_host, http_port), MetricsHandler)
+            threading.Thread(target=self._http_server.serve_forever, daemon=True).start()
+
+    def stop_exporters(self):
+        """Stop the exporters"""
+        self._exporter_stop.set()
+        if self._http_server:
+            self._http_server.shutdown()
+            self._http_server = None
+
+    def _file_exporter(self, path, interval):
+        """Exporter thread - rewrite the metrics file every interval"""
+        logger = logging.getLogger('OBSMonitor')
+        while not self._exporter_stop.wait(interval):
+            try:
+                self.write_file(path)
+            except Exception as e:
+                logger.error(f"Error writing metrics file: {e}")
+
+class NullMetrics:
+    """Stand-in used when metrics are switched off - every call is a no-op"""
+
+    enabled = False
+
+    def observe(self, name, value, buckets=None, **labels):
+        pass
+
+    def inc(self, name, amount=1, **labels):
+        pass
+
+    def gauge(self, name, callback, **labels):
+        pass
+
+    def remove_gauge(self, name, **labels):
+        pass
+
+    def start_exporters(self, *args, **kwargs):
+        pass
+
+    def stop_exporters(self):
+        pass
@@ -1,245 +1,1412 @@
-import obsws_python as obs
+import asyncio
 import threading
 import time
 import json
 import os
+import random
 import sys
 import logging
-from typing import Set
-import keyboard
-import wx
-from accessible_output3.outputs import auto
-import ctypes
-from ctypes import wintypes
+import logging.handlers
+import signal
+import concurrent.futures
+import fnmatch
+import re
+from typing import Dict, List, Optional, Set, Tuple
 import math
+import queue
+from array import array
+from collections import OrderedDict, deque
+from journal import Journal
+import profiler
+import speech_cache
+from metrics import Metrics, NullMetrics
+from audio_backends import create_audio_backend
+from obs_connection import OBSConnection, OBSIdentifyError, OBSRequestError
+from scene_graph import SceneGraph
+from state_store import StateStore
+from debouncer import TransitionDebouncer
+from poll_scheduler import PollScheduler
+from watchers import WATCHERS
+from config_watcher import ConfigWatcher
+from state_server import StateServer
+from log_handler import ThrottledQueueHandler
 
-# Windows DLL imports
-kernel32 = ctypes.windll.kernel32
-winmm = ctypes.windll.winmm
-
-class ConfigDialog(wx.Dialog):
-    def __init__(self):
-        super().__init__(None, title="OBS WebSocket Configuration", 
-                         style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER)
-        
-        self.host = "localhost"
-        self.port = 4455
-        self.password = ""
-        self.use_speech = False
-        self.use_tones = True  # Default to True
-        
-        self.create_widgets()
-        self.layout_widgets()
-        self.bind_events()
-        
-        # Center the dialog
-        self.Center()
-        
-    def create_widgets(self):
-        """Create the input widgets"""
-        # Host input
-        self.host_label = wx.StaticText(self, label="Host:")
-        self.host_ctrl = wx.TextCtrl(self, value="localhost", size=(200, -1))
-        
-        # Port input
-        self.port_label = wx.StaticText(self, label="Port:")
-        self.port_ctrl = wx.SpinCtrl(self, value="4455", min=1, max=65535, size=(100, -1))
-        
-        # Password input
-        self.password_label = wx.StaticText(self, label="Password (optional):")
-        self.password_ctrl = wx.TextCtrl(self, value="", style=wx.TE_PASSWORD, size=(200, -1))
-        
-        # Notification checkboxes (without a label)
-        self.speech_checkbox = wx.CheckBox(self, label="Use Speech")
-        self.tones_checkbox = wx.CheckBox(self, label="Use Tones")
-        
-        # Set default values
-        self.speech_checkbox.SetValue(False)  # Default to False
-        self.tones_checkbox.SetValue(True)    # Default to True
-        
-        # Buttons with accelerator keys
-        self.ok_button = wx.Button(self, wx.ID_OK, "&Save && Connect")
-        self.cancel_button = wx.Button(self, wx.ID_CANCEL, "Use &Defaults")
-        
-        # Set default button
-        self.ok_button.SetDefault()
-        
-    def layout_widgets(self):
-        """Layout the widgets using sizers"""
-        main_sizer = wx.BoxSizer(wx.VERTICAL)
-        
-        # Add some padding
-        main_sizer.Add((0, 10))
-        
-        # Host row
-        host_sizer = wx.BoxSizer(wx.HORIZONTAL)
-        host_sizer.Add(self.host_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 10)
-        host_sizer.Add(self.host_ctrl, 1, wx.EXPAND)
-        main_sizer.Add(host_sizer, 0, wx.EXPAND | wx.LEFT | wx.RIGHT, 20)
-        main_sizer.Add((0, 10))
-        
-        # Port row
-        port_sizer = wx.BoxSizer(wx.HORIZONTAL)
-        port_sizer.Add(self.port_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 10)
-        port_sizer.Add(self.port_ctrl, 0)
-        main_sizer.Add(port_sizer, 0, wx.LEFT | wx.RIGHT, 20)
-        main_sizer.Add((0, 10))
-        
-        # Password row
-        password_sizer = wx.BoxSizer(wx.HORIZONTAL)
-        password_sizer.Add(self.password_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 10)
-        password_sizer.Add(self.password_ctrl, 1, wx.EXPAND)
-        main_sizer.Add(password_sizer, 0, wx.EXPAND | wx.LEFT | wx.RIGHT, 20)
-        main_sizer.Add((0, 15))
-        
-        # Checkbox row (without label)
-        checkbox_sizer = wx.BoxSizer(wx.HORIZONTAL)
-        checkbox_sizer.Add(self.speech_checkbox, 0, wx.RIGHT, 20)
-        checkbox_sizer.Add(self.tones_checkbox, 0)
-        main_sizer.Add(checkbox_sizer, 0, wx.LEFT | wx.RIGHT, 20)
-        main_sizer.Add((0, 15))
-        
-        # Button row
-        button_sizer = wx.BoxSizer(wx.HORIZONTAL)
-        button_sizer.Add(self.cancel_button, 0, wx.RIGHT, 10)
-        button_sizer.Add(self.ok_button, 0)
-        main_sizer.Add(button_sizer, 0, wx.ALIGN_RIGHT | wx.LEFT | wx.RIGHT, 20)
-        main_sizer.Add((0, 15))
-        
-        self.SetSizer(main_sizer)
-        self.Fit()
-        
-    def bind_events(self):
-        """Bind events"""
-        self.Bind(wx.EVT_BUTTON, self.on_ok, self.ok_button)
-        self.Bind(wx.EVT_BUTTON, self.on_cancel, self.cancel_button)
-        
-        # Handle keyboard shortcuts
-        self.Bind(wx.EVT_CHAR_HOOK, self.on_key)
-        
-        # Set up accelerator table for Alt+S and Alt+D
-        entries = []
-        entries.append(wx.AcceleratorEntry(wx.ACCEL_ALT, ord('S'), self.ok_button.GetId()))
-        entries.append(wx.AcceleratorEntry(wx.ACCEL_ALT, ord('D'), self.cancel_button.GetId()))
-        accel_table = wx.AcceleratorTable(entries)
-        self.SetAcceleratorTable(accel_table)
-        
-    def on_key(self, event):
-        """Handle key events"""
-        if event.GetKeyCode() == wx.WXK_ESCAPE:
-            # Check if neither option is selected
-            if not self.speech_checkbox.GetValue() and not self.tones_checkbox.GetValue():
-                self.show_error_and_exit()
-            else:
-                # Use CallAfter to ensure proper cleanup for screen readers
-                wx.CallAfter(self.EndModal, wx.ID_CANCEL)
-        else:
-            event.Skip()
-            
-    def on_ok(self, event):
-        """Handle OK button (Alt+S)"""
-        # Validate inputs
-        host = self.host_ctrl.GetValue().strip()
-        if not host:
-            wx.MessageBox("Host cannot be empty", "Error", wx.OK | wx.ICON_ERROR)
+class ToneSynth:
+    """Renders tones, chords and sequences to 16-bit mono PCM"""
+
+    def __init__(self, volume=0.4, sample_rate=44100, fade=0.005):
+        self.volume = max(0.0, min(1.0, volume))
+        self.sample_rate = sample_rate
+        self.fade = fade
+
+    def silence(self, duration) -> bytes:
+        """Render a gap of silence"""
+        return bytes(2 * int(self.sample_rate * duration))
+
+    def chord(self, frequencies, duration) -> bytes:
+        """Render several frequencies mixed together, a single frequency is a plain tone"""
+        count = int(self.sample_rate * duration)
+        fade_samples = max(1, min(int(self.sample_rate * self.fade), count // 2))
+        steps = [2 * math.pi * freq / self.sample_rate for freq in frequencies]
+        peak = 32767 * self.volume / max(1, len(steps))
+        
+        samples = array('h', bytes(2 * count))
+        for i in range(count):
+            # Short linear fades keep the tone edges from clicking
+            envelope = min(1.0, i / fade_samples, (count - 1 - i) / fade_samples)
+            samples[i] = int(peak * envelope * sum(math.sin(step * i) for step in steps))
+        return samples.tobytes()
+
+    def tone(self, frequency, duration) -> bytes:
+        """Render a single tone"""
+        return self.chord([frequency], duration)
+
+    def sequence(self, frequencies, durations, gaps=None) -> bytes:
+        """Render tones one after another with gaps in between"""
+        if gaps is None:
+            gaps = [0.05] * (len(frequencies) - 1)
+        
+        parts = []
+        for i, (freq, dur) in enumerate(zip(frequencies, durations)):
+            parts.append(self.tone(freq, dur))
+            if i < len(gaps):
+                parts.append(self.silence(gaps[i]))
+        return b''.join(parts)
+
+class AudioScheduler:
+    """One long-lived audio thread fed by a bounded queue of pre-rendered PCM buffers.
+
+    Sounds are rendered once and then referenced by name, so playing one is a queue put. When
+    the queue is full the oldest pending sound is dropped, which keeps latency bounded during
+    bursts of toggles.
+    """
+
+    def __init__(self, backend, max_queue=8, metrics=None):
+        self.backend = backend
+        self.buffers: Dict[str, bytes] = {}
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.logger = logging.getLogger('OBSMonitor')
+        
+        # Metrics
+        self.played = 0
+        self.dropped = 0
+        self.stage_metrics = metrics or NullMetrics()  # Start latency goes to audio_queue_wait_seconds
+        
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def register(self, name, pcm: bytes):
+        """Store a rendered buffer under a name"""
+        self.buffers[name] = pcm
+
+    def play(self, name, wait=False):
+        """Queue a registered sound, optionally blocking until it has been played"""
+        self.play_pcm(self.buffers.get(name), wait)
+
+    def play_pcm(self, pcm: bytes, wait=False):
+        """Queue a rendered buffer, optionally blocking until it has been played"""
+        if not pcm:
             return
+        done = threading.Event() if wait else None
+        item = (pcm, time.perf_counter(), done)
+        
+        while True:
+            try:
+                self.queue.put_nowait(item)
+                break
+            except queue.Full:
+                try:
+                    dropped = self.queue.get_nowait()
+                    self.dropped += 1
+                    if dropped and dropped[2]:
+                        dropped[2].set()
+                except queue.Empty:
+                    pass
+        
+        if done:
+            done.wait()
+
+    def close(self):
+        """Stop the audio thread once everything queued has played"""
+        self.queue.put(None)
+        self.thread.join(timeout=2.0)
+        try:
+            self.backend.close()
+        except Exception as e:
+            self.logger.error(f"Error closing audio backend: {e}")
+
+    def _run(self):
+        """Audio thread - play buffers in order"""
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            pcm, queued_at, done = item
+            
+            self.played += 1
+            self.stage_metrics.observe('audio_queue_wait_seconds', time.perf_counter() - queued_at)
+            try:
+                self.backend.play(pcm)
+            except Exception as e:
+                self.logger.error(f"Error playing audio: {e}")
+            finally:
+                if done:
+                    done.set()
+
+class SpeechQueue:
+    """Single speech worker that coalesces source announcements.
+
+    System messages (connection lost, connected...) go to a small priority lane and are always
+    spoken first. Source changes are kept as the latest state per source, so a newer state replaces
+    a stale queued one, and everything pending when the worker wakes up is read out as one utterance
+    per instance and direction, such as "5 shown: Cam 1, Cam 2, Cam 3, Cam 4, Cam 5".
+    """
+
+    def __init__(self, speak, max_sources=256, max_system=16, max_names=5, metrics=None):
+        self.speak = speak
+        self.max_sources = max_sources
+        self.max_names = max_names
+        self.system_messages = deque(maxlen=max_system)
+        self.source_states: OrderedDict = OrderedDict()  # (instance_label, kind, name) -> 'shown' / 'hidden' / ...
+        self.condition = threading.Condition()
+        self.closed = False
+        self.pending_since = None  # When the oldest pending message was queued
+        
+        # Metrics
+        self.replaced = 0
+        self.dropped = 0
+        self.metrics = metrics or NullMetrics()
+        
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def say(self, text, wait=False):
+        """Queue a system message ahead of any source announcements"""
+        done = threading.Event() if wait else None
+        with self.condition:
+            if len(self.system_messages) == self.system_messages.maxlen:
+                self.dropped += 1
+            self.system_messages.append((text, done))
+            if self.pending_since is None:
+                self.pending_since = time.perf_counter()
+            self.condition.notify()
+        if done:
+            done.wait(timeout=5.0)
+
+    def announce_sources(self, state, source_names, instance_label=None, kind='source'):
+        """Queue the new state of some sources, replacing anything still pending for them.
+
+        kind keeps the states of different things with the same name apart, such as a scene
+        source and the audio input it belongs to.
+        """
+        with self.condition:
+            for source_name in source_names:
+                key = (instance_label, kind, source_name)
+                if key in self.source_states:
+                    self.replaced += 1
+                    del self.source_states[key]
+                self.source_states[key] = state
+            while len(self.source_states) > self.max_sources:
+                self.source_states.popitem(last=False)
+                self.dropped += 1
+            if self.pending_since is None:
+                self.pending_since = time.perf_counter()
+            self.condition.notify()
+
+    def pending(self):
+        """Number of messages waiting to be spoken"""
+        with self.condition:
+            return len(self.system_messages) + len(self.source_states)
+
+    def close(self):
+        """Speak what is still queued, then stop the worker"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.thread.join(timeout=2.0)
+
+    def format_sources(self, state, source_names, instance_label=None):
+        """Build one utterance for several sources that changed the same way"""
+        if len(source_names) == 1:
+            text = f"{source_names[0]} {state}"
+        else:
+            listed = ", ".join(source_names[:self.max_names])
+            text = f"{len(source_names)} {state}: {listed}"
+            if len(source_names) > self.max_names:
+                text += f" and {len(source_names) - self.max_names} more"
+        return f"{instance_label}: {text}" if instance_label else text
+
+    def _next_utterances(self):
+        """Take the next system message, or everything pending for sources as grouped utterances"""
+        if self.system_messages:
+            text, done = self.system_messages.popleft()
+            return [(text, done, False)]
+        
+        groups: Dict[Tuple[Optional[str], str], List[str]] = {}
+        for (instance_label, kind, source_name), state in self.source_states.items():
+            groups.setdefault((instance_label, state), []).append(source_name)
+        self.source_states.clear()
+        return [(self.format_sources(state, names, instance_label), None, len(names) == 1) for (instance_label, state), names in groups.items()]
+
+    def _run(self):
+        """Speech worker"""
+        while True:
+            with self.condition:
+                while not self.closed and not self.system_messages and not self.source_states:
+                    self.condition.wait()
+                if self.closed and not self.system_messages and not self.source_states:
+                    return
+                utterances = self._next_utterances()
+                if self.pending_since is not None:
+                    self.metrics.observe('speech_queue_wait_seconds', time.perf_counter() - self.pending_since)
+                    self.pending_since = time.perf_counter() if self.system_messages or self.source_states else None
             
-        # Check if neither notification option is selected
-        if not self.speech_checkbox.GetValue() and not self.tones_checkbox.GetValue():
-            self.show_error_and_exit()
+            for text, done, single in utterances:
+                self.speak(text, single)
+                if done:
+                    done.set()
+
+class SnapshotEngine:
+    """Fetches scene item visibility in as few WebSocket round trips as possible.
+
+    Modes:
+        batch    - GetCurrentProgramScene and the item lists of every scene in the last known
+                   program scene tree go out in one RequestBatch, so a steady-state poll is
+                   one round trip
+        list     - one GetSceneItemList per scene, visibility read from sceneItemEnabled
+        per_item - legacy behavior, one GetSceneItemEnabled call per item, skipping sources
+                   that `profiles` leaves out
+    """
+
+    MODES = ('batch', 'list', 'per_item')
+    BATCH_TIMEOUTS = 3  # Request batches in a row that time out before the server is taken not to support them
+
+    def __init__(self, mode='batch', profiles=None):
+        self.mode = mode if mode in self.MODES else 'batch'
+        self.profiles = profiles
+        self.logger = logging.getLogger('OBSMonitor')
+        self.batch_timeouts = 0
+        # Counters for measuring request load
+        self.requests_sent = 0
+        self.round_trips = 0
+
+    async def request(self, conn, request_type, request_data=None):
+        """Send one plain request and count it"""
+        self.requests_sent += 1
+        self.round_trips += 1
+        return await conn.request(request_type, request_data)
+
+    async def request_batch(self, conn, requests):
+        """Send a request batch and count it, dropping to 'list' mode for good if the server does not handle batches"""
+        self.requests_sent += len(requests)
+        self.round_trips += 1
+        try:
+            results = await conn.request_batch(requests)
+        except asyncio.TimeoutError:
+            if self.mode != 'batch' or not conn.connected:
+                raise
+            # A busy OBS can be slow once, only a server that never answers batches loses them for good.
+            # Until then this one is answered with plain requests and batches are tried again next time
+            self.batch_timeouts += 1
+            if self.batch_timeouts >= self.BATCH_TIMEOUTS:
+                self.mode = 'list'
+                self.logger.error(f"{self.batch_timeouts} request batches in a row timed out, using one request per scene from now on")
+        except (KeyError, TypeError) as e:
+            if self.mode != 'batch' or not conn.connected:
+                raise
+            # Server does not understand batches, use plain requests from now on
+            self.mode = 'list'
+            self.logger.error(f"OBS sent a malformed request batch reply, using one request per scene from now on: {e!r}")
+        else:
+            self.batch_timeouts = 0
+            return results
+        return [await self._single_result(conn, request_type, request_data) for request_type, request_data in requests]
+
+    async def _single_result(self, conn, request_type, request_data):
+        """Send one plain request and shape its answer like a request batch result"""
+        try:
+            response = await self.request(conn, request_type, request_data)
+            return {'requestStatus': {'result': True, 'code': 100}, 'responseData': response}
+        except OBSRequestError as e:
+            return {'requestStatus': {'result': False, 'code': e.code, 'comment': str(e)}}
+
+    async def scene_lists(self, conn, scenes) -> Dict[str, list]:
+        """Fetch the item lists of several scenes or groups, scenes is a list of (name, is_group)"""
+        lists = {}
+        if not scenes:
+            return lists
+        
+        if self.mode == 'batch':
+            results = await self.request_batch(conn, [self._list_request(name, is_group) for name, is_group in scenes])
+            for (name, is_group), result in zip(scenes, results):
+                if result['requestStatus']['result']:
+                    lists[name] = result['responseData']['sceneItems']
+        else:
+            for name, is_group in scenes:
+                try:
+                    response = await self.request(conn, *self._list_request(name, is_group))
+                    lists[name] = response['sceneItems']
+                except OBSRequestError:
+                    # Scene no longer exists
+                    continue
+        
+        await self._fill_enabled(conn, lists)
+        return lists
+
+    async def program_scene_lists(self, conn, cached_scene, scenes):
+        """Get the program scene name along with the item lists of the given scenes, returns (scene_name, lists)
+
+        In batch mode GetCurrentProgramScene travels in the same batch as the list requests. The lists are
+        only meaningful if the returned scene name still matches cached_scene.
+        """
+        if self.mode == 'batch' and scenes:
+            results = await self.request_batch(
+                conn, [('GetCurrentProgramScene', None)] + [self._list_request(name, is_group) for name, is_group in scenes]
+            )
+            status = results[0]['requestStatus']
+            if not status['result']:
+                raise OBSRequestError('GetCurrentProgramScene', status['code'], status.get('comment'))
+            current_scene = results[0]['responseData']['currentProgramSceneName']
+            if current_scene != cached_scene:
+                return current_scene, {}
+            
+            lists = {}
+            for (name, is_group), result in zip(scenes, results[1:]):
+                if result['requestStatus']['result']:
+                    lists[name] = result['responseData']['sceneItems']
+            await self._fill_enabled(conn, lists)
+            return current_scene, lists
+        
+        current_scene = (await self.request(conn, 'GetCurrentProgramScene'))['currentProgramSceneName']
+        if current_scene != cached_scene:
+            return current_scene, {}
+        return current_scene, await self.scene_lists(conn, scenes)
+
+    @staticmethod
+    def _list_request(name, is_group):
+        """Build the list request for a scene or a group"""
+        return ('GetGroupSceneItemList' if is_group else 'GetSceneItemList', {'sceneName': name})
+
+    async def _fill_enabled(self, conn, lists):
+        """Make sure every item carries sceneItemEnabled, asking OBS only for items that lack it"""
+        missing = []
+        for scene_name, items in lists.items():
+            for item in items:
+                if self.mode != 'per_item' and 'sceneItemEnabled' in item:
+                    continue
+                if self.profiles and SceneGraph.child_of(item) is None and self.profiles.get(item['sourceName']) is None:
+                    # Left out by the source rules, nothing reads its state
+                    item['sceneItemEnabled'] = False
+                    continue
+                missing.append((scene_name, item))
+        if not missing:
             return
         
-        port = self.port_ctrl.GetValue()
-        password = self.password_ctrl.GetValue()
+        if self.mode == 'batch':
+            results = await self.request_batch(conn, [
+                ('GetSceneItemEnabled', {'sceneName': scene_name, 'sceneItemId': item['sceneItemId']})
+                for scene_name, item in missing
+            ])
+            for (scene_name, item), result in zip(missing, results):
+                item['sceneItemEnabled'] = bool(
+                    result['requestStatus']['result'] and result['responseData']['sceneItemEnabled']
+                )
+            return
         
-        # Store values
+        # Compatibility fallback - one GetSceneItemEnabled round trip per item
+        for scene_name, item in missing:
+            try:
+                response = await self.request(conn, 'GetSceneItemEnabled', {
+                    'sceneName': scene_name, 'sceneItemId': item['sceneItemId']
+                })
+                item['sceneItemEnabled'] = response['sceneItemEnabled']
+            except OBSRequestError:
+                item['sceneItemEnabled'] = False
+
+class SourceProfile:
+    """How changes of one source are announced"""
+    __slots__ = ('speech', 'label', 'earcons')
+
+    def __init__(self, speech=True, label=None, earcons=None):
+        self.speech = speech
+        self.label = label
+        self.earcons = earcons or SourceProfiles.EARCONS
+
+class SourceProfiles:
+    """Per-source notification rules from the source_rules setting, compiled once per load or reload.
+
+    A rule matches source names with a glob (`match`) or a regular expression searched for in the
+    name (`regex`), and the first rule that matches decides how the source is announced: left out
+    (`exclude`), spoken or only heard as a tone (`speech`), spoken under another name (`label`), or
+    with its own tones (`shown_tone`, `hidden_tone`, `flapping_tone`). With only_listed, sources no
+    rule matches are left out too, so the rules work as an allow list.
+
+    get() resolves a source name against the rules the first time it is seen and keeps the result,
+    so routing a change is one dict lookup however many rules there are. Left out sources resolve to
+    None, and SceneGraph gives their items no slot, so they never enter a visibility bitset, a diff
+    or a per-item request.
+    """
+
+    EARCONS = {'shown': 'source_shown', 'hidden': 'source_hidden', 'flapping': 'source_flapping'}
+    RULE_FIELDS = {'match': str, 'regex': str, 'exclude': bool, 'speech': bool, 'label': str}
+    TONE_FIELDS = {'shown_tone': 'shown', 'hidden_tone': 'hidden', 'flapping_tone': 'flapping'}
+
+    def __init__(self, rules=(), only_listed=False):
+        self.only_listed = only_listed
+        self.rules = []  # (match function, profile or None when the rule excludes)
+        self.tones: Dict[str, object] = {}  # Earcon name -> tone of every custom tone, for render_earcons
+        self.cache: Dict[str, Optional[SourceProfile]] = {}
+        self.default = SourceProfile()
+        
+        for position, rule in enumerate(rules):
+            if self.rule_problems(rule, position):
+                continue
+            if 'match' in rule:
+                matches = re.compile(fnmatch.translate(rule['match'])).match
+            else:
+                matches = re.compile(rule['regex']).search
+            if rule.get('exclude'):
+                self.rules.append((matches, None))
+                continue
+        
+            earcons = dict(self.EARCONS)
+            for field, state in self.TONE_FIELDS.items():
+                if field in rule:
+                    earcons[state] = f"source_rule_{position}_{state}"
+                    self.tones[earcons[state]] = rule[field]
+            self.rules.append((matches, SourceProfile(rule.get('speech', True), rule.get('label') or None, earcons)))
+
+    @classmethod
+    def check(cls, rules) -> List[str]:
+        """Problems with the source_rules setting, empty if every rule is valid"""
+        if not isinstance(rules, list):
+            return ["source_rules must be a list"]
+        problems = []
+        for position, rule in enumerate(rules):
+            problems += cls.rule_problems(rule, position)
+        return problems
+
+    @classmethod
+    def rule_problems(cls, rule, position) -> List[str]:
+        name = f"source_rules[{position}]"
+        if not isinstance(rule, dict):
+            return [f"{name} must be an object"]
+        problems = []
+        if ('match' in rule) == ('regex' in rule):
+            problems.append(f"{name} needs either match or regex")
+        for field, value in rule.items():
+            if field in cls.RULE_FIELDS:
+                if not isinstance(value, cls.RULE_FIELDS[field]):
+                    problems.append(f"{name}.{field} must be {cls.RULE_FIELDS[field].__name__}")
+            elif field in cls.TONE_FIELDS:
+                tones = value if isinstance(value, list) and value else [value]
+                if not all(is_number(tone) and tone > 0 for tone in tones):
+                    problems.append(f"{name}.{field} must be a positive number or a list of them")
+            else:
+                problems.append(f"{name}.{field} is not a rule setting")
+        if isinstance(rule.get('regex'), str):
+            try:
+                re.compile(rule['regex'])
+            except re.error as e:
+                problems.append(f"{name}.regex is not a valid regular expression: {e}")
+        return problems
+
+    def get(self, source_name) -> Optional[SourceProfile]:
+        """Profile of a source, None if it is left out"""
+        try:
+            return self.cache[source_name]
+        except KeyError:
+            pass
+        profile = None if self.only_listed else self.default
+        for matches, rule_profile in self.rules:
+            if matches(source_name):
+                profile = rule_profile
+                break
+        self.cache[source_name] = profile
+        return profile
+
+    def spoken(self, source_names) -> List[str]:
+        """Names to speak for some sources, leaving out those that are excluded or silent"""
+        spoken = []
+        for source_name in source_names:
+            profile = self.get(source_name)
+            if profile is not None and profile.speech:
+                spoken.append(profile.label or source_name)
+        return spoken
+
+class OBSInstance:
+    """One monitored OBS host - its connection, scene graph, visibility state and reconnect state"""
+
+    WARM_BATCH = 16  # Scenes fetched per round trip while warming the scene cache
+    GAUGES = ('debounce_suppressed', 'visible_sources', 'cached_scenes', 'poll_period_seconds')
+
+    def __init__(self, monitor, label, host, port, password):
+        self.monitor = monitor
+        self.label = label
         self.host = host
         self.port = port
         self.password = password
-        self.use_speech = self.speech_checkbox.GetValue()
-        self.use_tones = self.tones_checkbox.GetValue()
+        self.state_key = f"{host}:{port}"
+        self.logger = monitor.logger
+        self.metrics = monitor.metrics
+        self.metric_labels = {'instance': label} if label else {}
+        self.observed_at = None  # When the change being processed was first seen, for notify latency
+        
+        self.conn = None
+        self.events = None
+        self.events_failed = False  # OBS refused the scene event subscription, this instance polls instead
+        self.renames_received = 0  # SceneNameChanged events read off the socket, handled or not
+        self.scene_graph = SceneGraph(monitor.source_profiles, monitor.config.get('scene_cache_size', 500))
+        self.snapshot_engine = SnapshotEngine(monitor.config.get('snapshot_mode', 'batch'), monitor.source_profiles)
+        self.currently_visible_sources: Set[str] = set()
+        self.visible_mask = 0  # Raw visibility bitset over scene_graph.slots
+        self.mask_generation = -1
+        self.debouncer = TransitionDebouncer(
+            monitor.config.get('debounce_ms', 0) / 1000,
+            monitor.config.get('flap_window_ms', 2000) / 1000,
+            monitor.config.get('flap_threshold', 0)
+        )
+        self._flush_handle = None
+        self._save_handle = None
         
-        self.EndModal(wx.ID_OK)
+        # Scenes outside the program tree are fetched while no event is waiting, so a switch finds them cached
+        self.warming = False
+        self.warm_list_needed = False
+        self.warm_queue: List[Tuple[str, bool]] = []
         
-    def on_cancel(self, event):
-        """Handle Cancel button (Alt+D) - use defaults"""
-        # Check if neither option is selected
-        if not self.speech_checkbox.GetValue() and not self.tones_checkbox.GetValue():
-            self.show_error_and_exit()
+        self.poll_scheduler = PollScheduler(
+            monitor.poll_interval,
+            monitor.config.get('poll_max_interval', 1.0),
+            health_interval=monitor.config.get('health_check_interval', 3.0)
+        )
+        self.connection_lost = False
+        self.consecutive_errors = 0
+        self.task = None
+        
+        # Reconnect timing, perf_counter values
+        self.loss_detected_at = None
+        self.recovered_at = None
+        
+        self.register_gauges()
+        
+        # Watcher events are announced as they arrive and never reach the poll or event loop
+        self.watchers = self.create_watchers(monitor.watchers)
+        self.watcher_handlers = self.map_watchers(self.watchers)
+        
+        self.event_handlers = {
+            'CurrentProgramSceneChanged': self.on_current_program_scene_changed,
+            'CurrentPreviewSceneChanged': self.on_current_preview_scene_changed,
+            'StudioModeStateChanged': self.on_studio_mode_state_changed,
+            'SceneCreated': self.on_scene_created,
+            'SceneRemoved': self.on_scene_removed,
+            'SceneItemEnableStateChanged': self.on_scene_item_enable_state_changed,
+            'SceneItemCreated': self.on_scene_item_created,
+            'SceneItemRemoved': self.on_scene_item_removed,
+            'SceneItemListReindexed': self.on_scene_item_list_reindexed,
+            'SceneNameChanged': self.on_scene_name_changed,
+            'CurrentSceneCollectionChanged': self.on_current_scene_collection_changed,
+        }
+
+    @property
+    def use_events(self):
+        return self.monitor.monitor_mode == 'events' and not self.events_failed
+
+    async def play_system_sound(self, sound_type: str, wait=True):
+        """Play a system sound for this instance without blocking the event loop"""
+        if wait:
+            await asyncio.to_thread(self.monitor.play_system_sound, sound_type, self.label)
+        else:
+            self.monitor.play_system_sound(sound_type, self.label, wait=False)
+
+    async def is_connection_alive(self):
+        """Check if the WebSocket connection is still alive - recent traffic proves it, otherwise a ping"""
+        try:
+            if not self.conn or not self.conn.connected:
+                return False
+            if self.conn.idle_time() < self.conn.heartbeat_interval:
+                return True
+            return await self.conn.ping()
+        except Exception:
+            return False
+
+    def create_watchers(self, enabled):
+        """This instance's own watcher objects from (watcher class, settings) pairs"""
+        watchers = []
+        for watcher_class, settings in enabled:
+            try:
+                watchers.append(watcher_class(settings))
+            except Exception as e:
+                self.logger.error(f"Failed to start the {watcher_class.name} watcher{self.log_suffix()}: {e}")
+        return watchers
+
+    def map_watchers(self, watchers):
+        """Event type -> the watcher handling it"""
+        return {event_type: watcher for watcher in watchers for event_type in watcher.events}
+
+    async def set_watchers(self, enabled):
+        """Switch to another set of watchers, changing the subscriptions of a live connection in place"""
+        self.watchers = self.create_watchers(enabled)
+        self.watcher_handlers = self.map_watchers(self.watchers)
+        if self.conn and self.conn.connected:
+            await self.conn.reidentify(self.event_subscriptions())
+
+    async def set_source_profiles(self, profiles):
+        """Switch to recompiled source rules, the visibility under them becomes the baseline without announcing anything"""
+        self.snapshot_engine.profiles = profiles
+        self.scene_graph.set_profiles(profiles)
+        if not (self.conn and self.conn.connected) or self.scene_graph.root is None:
             return
-            
-        self.host = "localhost"
-        self.port = 4455
-        self.password = ""
-        self.use_speech = self.speech_checkbox.GetValue()
-        self.use_tones = self.tones_checkbox.GetValue()
-        self.EndModal(wx.ID_CANCEL)
-        
-    def show_error_and_exit(self):
-        """Show error message and exit application"""
-        dlg = wx.MessageDialog(
-            self,
-            "You must select at least one notification option (Speech or Tones).",
-            "Error",
-            wx.OK | wx.ICON_ERROR
+        if self.snapshot_engine.mode == 'per_item':
+            # Items that were left out until now were never asked for their state
+            self.scene_graph.invalidate_all()
+            await self.load_missing_scenes()
+        self.reset_visible_sources(self.scene_graph.visible_sources())
+
+    def event_subscriptions(self):
+        """Only the event categories something here listens to - scene events in event mode, plus the watchers'"""
+        subscriptions = 0
+        if self.use_events:
+            subscriptions = OBSConnection.SUB_CONFIG | OBSConnection.SUB_SCENES | OBSConnection.SUB_SCENE_ITEMS
+            if self.monitor.config.get('announce_preview'):
+                # Only for hearing when studio mode is switched off
+                subscriptions |= OBSConnection.SUB_UI
+        for watcher in self.watchers:
+            subscriptions |= watcher.subscriptions
+        return subscriptions
+
+    def on_event(self, events, event_type, data):
+        """Announce watcher events right away, queue everything else for the monitoring loop"""
+        if event_type == 'SceneNameChanged':
+            self.renames_received += 1
+        watcher = self.watcher_handlers.get(event_type)
+        if watcher is None:
+            # The polling loop only waits for the socket to close, other events of the watchers'
+            # categories, such as a fader being dragged, must not cut its wait short
+            if self.use_events:
+                events.put_nowait((event_type, data, time.perf_counter()))
+            return
+        try:
+            for state, subject, earcon in watcher.handle(event_type, data):
+                self.monitor.play_watch_sound(watcher.name, state, subject, earcon, self.label)
+                self.publish('watch', kind=watcher.name, state=state, subject=subject)
+        except Exception as e:
+            self.logger.error(f"Error handling {event_type}{self.log_suffix()}: {e}")
+
+    async def connect_to_obs(self):
+        """Connect to OBS WebSocket, subscribing only to the events that are listened to"""
+        events = self.events = asyncio.Queue()
+        try:
+            self.conn = await self.open_connection(events)
+            return True
+        except OBSIdentifyError as e:
+            error = e
+            if self.use_events and e.refused:
+                # Try the same host without scene events, and poll it if that is accepted - a socket that
+                # merely dropped is retried with events on the next attempt
+                self.events_failed = True
+                try:
+                    self.conn = await self.open_connection(events)
+                    self.logger.error(f"OBS refused the event subscription{self.log_suffix()}, falling back to polling: {e}")
+                    self.register_gauges()
+                    return True
+                except Exception:
+                    self.events_failed = False
+        except Exception as e:
+            error = e
+        self.logger.error(f"Failed to connect to OBS{self.log_suffix()}: {error}")
+        self.conn = None
+        return False
+
+    async def open_connection(self, events):
+        """Open a connection with the current event subscriptions, its events go to the events queue"""
+        conn = OBSConnection(
+            self.host, self.port, self.password, self.event_subscriptions(),
+            on_event=lambda event_type, data: self.on_event(events, event_type, data),
+            on_close=lambda: events.put_nowait(None),
+            request_timeout=self.monitor.config.get('request_timeout', 5.0),
+            metrics=self.metrics,
+            metric_labels=self.metric_labels,
+            heartbeat_interval=self.monitor.config.get('heartbeat_interval', 1.0),
+            heartbeat_timeout=self.monitor.config.get('heartbeat_timeout', 1.0),
         )
-        dlg.ShowModal()
-        dlg.Destroy()
-        self.EndModal(wx.ID_CLOSE)
+        await conn.connect()
+        return conn
+
+    async def connect_to_obs_with_retry(self, max_retries=3, retry_delay=2.0, play_sounds=True):
+        """Connect with retry logic and exponential backoff"""
+        for attempt in range(max_retries):
+            if await self.connect_to_obs():
+                if play_sounds:  # Play sound on every successful connection, the snapshot does not wait for it
+                    await self.play_system_sound("connected", wait=False)
+                self.consecutive_errors = 0
+                return True
+            
+            if attempt < max_retries - 1:
+                await asyncio.sleep(retry_delay)
+                retry_delay *= 1.5  # Exponential backoff
+        
+        if play_sounds:
+            await self.play_system_sound("failed_blocking")
+        return False
+
+    async def disconnect_from_obs(self):
+        """Disconnect from OBS WebSocket"""
+        if self.conn:
+            try:
+                await self.conn.close()
+            except Exception:
+                pass
+            finally:
+                self.conn = None
+
+    async def handle_connection_loss(self):
+        """Reconnect with jittered backoff and resync right away, returns False if OBS stayed unreachable"""
+        if self.connection_lost:  # Prevent multiple calls
+            return False
+            
+        self.connection_lost = True
+        self.loss_detected_at = time.perf_counter()
+        self.metrics.inc('connections_lost_total', **self.metric_labels)
+        if self.conn:
+            self.metrics.observe('connection_silence_seconds', self.conn.idle_time(), **self.metric_labels)
+        await self.disconnect_from_obs()
+        self.publish('connection', connected=False)
+        # Queued without waiting for it to play, the first reconnect attempt starts immediately
+        await self.play_system_sound("connection_lost", wait=False)
+        
+        if not await self.reconnect():
+            self.metrics.inc('reconnects_total', result='failed', **self.metric_labels)
+            if self.monitor.monitoring.is_set():
+                await self.play_system_sound("failed_blocking")
+            return False
+        
+        self.metrics.inc('reconnects_total', result='ok', **self.metric_labels)
+        self.connection_lost = False
+        self.consecutive_errors = 0
+        await self.play_system_sound("connected", wait=False)
+        
+        # Changes made while disconnected are announced as one diff against the state before the loss
+        try:
+            self.catch_up(await self.get_visible_sources(), self.debouncer.reported)
+        except Exception as e:
+            self.logger.error(f"Error resyncing after reconnect{self.log_suffix()}: {e}")
+        self.start_warming()
+        
+        self.recovered_at = time.perf_counter()
+        self.metrics.observe('connection_recovery_seconds', self.recovered_at - self.loss_detected_at, **self.metric_labels)
+        return True
+
+    async def reconnect(self):
+        """Retry the connection with jittered exponential backoff until reconnect_timeout runs out"""
+        config = self.monitor.config
+        deadline = time.perf_counter() + config.get('reconnect_timeout', 10.0)
+        max_delay = config.get('reconnect_max_delay', 1.0)
+        delay = 0.05
+        while self.monitor.monitoring.is_set():
+            if await self.connect_to_obs():
+                return True
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return False
+            # Full jitter, so instances that lost the same host do not retry in lockstep
+            await asyncio.sleep(min(remaining, random.uniform(delay / 2, delay)))
+            delay = min(delay * 2, max_delay)
+        return False
+
+    def log_suffix(self):
+        """Instance label for log messages"""
+        return f" ({self.label})" if self.label else ""
+
+    def register_gauges(self):
+        """Export this instance's gauges under its current labels"""
+        self.metrics.gauge('debounce_suppressed', lambda: self.debouncer.suppressed, **self.metric_labels)
+        self.metrics.gauge('visible_sources', lambda: len(self.currently_visible_sources), **self.metric_labels)
+        self.metrics.gauge('cached_scenes', lambda: len(self.scene_graph.scenes), **self.metric_labels)
+        if not self.use_events:
+            self.metrics.gauge('poll_period_seconds', self.poll_scheduler.period, **self.metric_labels)
+
+    def unregister_gauges(self):
+        """Stop exporting this instance's gauges, before it is dropped or relabelled"""
+        for name in self.GAUGES:
+            self.metrics.remove_gauge(name, **self.metric_labels)
+
+    def relabel(self, label):
+        """Take a new label from a reloaded config, its gauges must be unregistered first"""
+        self.label = label
+        self.metric_labels = {'instance': label} if label else {}
+        if self.conn:
+            self.conn.metric_labels = self.metric_labels
+        self.register_gauges()
+
+    async def load_missing_scenes(self):
+        """Fetch scenes the graph has not cached yet or that were invalidated, following nested scenes down"""
+        missing = self.scene_graph.missing()
+        while missing:
+            lists = await self.fetch_scene_lists(missing)
+            if lists is None:
+                return
+            for name, is_group in missing:
+                # A scene that no longer exists is recorded as empty so it is not requested again
+                self.store_scene(name, lists.get(name, []), is_group)
+            missing = self.scene_graph.missing()
+
+    async def fetch_scene_lists(self, scenes):
+        """Item lists of the scenes, or None when a scene was renamed while they were requested"""
+        # The answer may already use a new name the graph only learns once the SceneNameChanged event is
+        # handled, so it is dropped and the rename fetches the scenes again. An answer that overtakes its
+        # event is followed by store_scene()
+        renames = self.renames_received
+        lists = await self.snapshot_engine.scene_lists(self.conn, scenes)
+        return None if self.renames_received != renames else lists
+
+    def store_scene(self, name, items, is_group):
+        """Cache a refetched scene, following nested scenes it shows renamed before the SceneNameChanged event is handled"""
+        for old_name, new_name in self.scene_graph.renamed_children(name, items):
+            self.rename_scene(old_name, new_name)
+        self.scene_graph.set_items(name, items, is_group)
+
+    async def get_visible_sources(self) -> Set[str]:
+        """Get all currently visible sources, including those inside nested scenes and groups"""
+        await self.refresh_scene_graph()
+        return self.scene_graph.visible_sources()
+
+    async def refresh_scene_graph(self):
+        """Fetch the program scene tree from OBS in as few round trips as the snapshot engine allows"""
+        try:
+            started = time.perf_counter()
+            graph = self.scene_graph
+            scenes = graph.reachable()
+            current_scene, lists = await self.snapshot_engine.program_scene_lists(self.conn, graph.root, scenes)
+            
+            # Without events nothing cached can be trusted, except what was just fetched
+            graph.invalidate_all()
+            graph.root = current_scene
+            for name, is_group in scenes:
+                if name in lists:
+                    graph.set_items(name, lists[name], is_group)
+            await self.load_missing_scenes()
+            graph.trim()
+            
+            self.consecutive_errors = 0
+            self.metrics.observe('snapshot_duration_seconds', time.perf_counter() - started, **self.metric_labels)
+            
+        except Exception as e:
+            self.logger.error(f"Error getting visible sources{self.log_suffix()}: {e}")
+            raise
+
+    def apply_visibility(self) -> bool:
+        """Diff the visibility bitset against the last one and announce what the debouncer lets through, True on any change"""
+        graph = self.scene_graph
+        slots = graph.slots
+        mask = graph.visible_mask()
+        raw = self.debouncer.raw
+        
+        if slots.generation != self.mask_generation:
+            # Slots were renumbered, so this one diff goes by name
+            visible_sources = graph.visible_sources()
+            newly_shown = list(visible_sources - raw)
+            newly_hidden = list(raw - visible_sources)
+        else:
+            changed = mask ^ self.visible_mask
+            if not changed:
+                return False
+            newly_shown, newly_hidden = [], []
+            for name in slots.changed_names(changed):
+                # A source used in several places stays visible while any of its items is
+                visible = bool(mask & slots.name_masks.get(name, 0))
+                if visible != (name in raw):
+                    (newly_shown if visible else newly_hidden).append(name)
+        
+        self.visible_mask = mask
+        self.mask_generation = slots.generation
+        if not newly_shown and not newly_hidden:
+            return False
+        
+        if self.monitor.journal:
+            self.journal_transitions(newly_shown, newly_hidden)
+        reported = self.debouncer.update(newly_shown, newly_hidden, asyncio.get_running_loop().time())
+        self.announce_changes(*reported)
+        
+        announced = sum(len(names) for names in reported)
+        if announced and self.metrics.enabled and self.observed_at is not None:
+            self.metrics.observe('diff_size', announced, Metrics.SIZE_BUCKETS, **self.metric_labels)
+            self.metrics.observe('notify_latency_seconds', time.perf_counter() - self.observed_at, **self.metric_labels)
+        self.schedule_flush()
+        return True
+
+    def announce_changes(self, newly_shown, newly_hidden, flapping):
+        """Announce changes that made it through the debouncer and store the new state"""
+        if newly_shown:
+            self.monitor.play_source_sound("shown", newly_shown, self.label)
+        
+        if newly_hidden:
+            self.monitor.play_source_sound("hidden", newly_hidden, self.label)
         
-    def get_config(self):
-        """Get the configuration values"""
+        if flapping:
+            self.monitor.play_source_sound("flapping", flapping, self.label)
+        
+        self.currently_visible_sources = self.debouncer.reported
+        if newly_shown or newly_hidden:
+            self.state_changed()
+        if newly_shown or newly_hidden or flapping:
+            self.publish('diff', scene=self.scene_graph.root, shown=list(newly_shown), hidden=list(newly_hidden),
+                         flapping=list(flapping))
+
+    def publish(self, op, **fields):
+        """Hand a change to the local state server, if anyone is subscribed"""
+        server = self.monitor.state_server
+        if server is not None and server.subscribers:
+            server.publish({'op': op, 'instance': self.label, 'time': int(time.time() * 1000), **fields})
+
+    def server_state(self) -> dict:
+        """State of this instance for the local state server"""
         return {
-            'host': self.host,
-            'port': self.port,
-            'password': self.password,
-            'use_speech': self.use_speech,
-            'use_tones': self.use_tones
+            'instance': self.label,
+            'connected': bool(self.conn and self.conn.connected) and not self.connection_lost,
+            'scene': self.scene_graph.root,
+            'preview': self.scene_graph.preview,
+            'visible': sorted(self.currently_visible_sources),
         }
 
-class WindowsToneGenerator:
-    """Windows-based tone generator using kernel32.dll Beep function"""
-    
-    def __init__(self, volume=0.4):
-        self.volume = volume  # Note: Windows Beep doesn't support volume control
-        self.audio_lock = threading.Lock()
+    def announce_preview(self):
+        """Announce which sources the preview scene would show or hide compared to program"""
+        graph = self.scene_graph
+        if graph.preview is None:
+            return
+        preview = graph.visible_sources(graph.preview)
+        program = graph.visible_sources()
+        self.monitor.play_preview_diff(sorted(preview - program), sorted(program - preview), self.label)
+
+    def schedule_flush(self):
+        """Wake up when the debouncer next has a held-back change to report"""
+        deadline = self.debouncer.next_deadline()
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if deadline is not None:
+            self._flush_handle = asyncio.get_running_loop().call_at(deadline, self.flush_debounced)
+
+    def flush_debounced(self):
+        """Timer callback - report held-back changes whose window has passed"""
+        self._flush_handle = None
+        self.announce_changes(*self.debouncer.flush(asyncio.get_running_loop().time()))
+        self.schedule_flush()
+
+    def reset_visible_sources(self, visible_sources: Set[str]):
+        """Take a snapshot as the baseline without announcing anything"""
+        self.debouncer.reset(visible_sources)
+        self.currently_visible_sources = self.debouncer.reported
+        self.visible_mask = self.scene_graph.visible_mask()
+        self.mask_generation = self.scene_graph.slots.generation
+        self.state_changed()
+        self.publish('sync', **self.server_state())
+        self.monitor.prerender_speech(self)
+
+    def catch_up(self, visible_sources: Set[str], baseline: Set[str]):
+        """Announce the net changes since an earlier state as one notification and take the snapshot as the baseline"""
+        newly_shown = sorted(visible_sources - baseline)
+        newly_hidden = sorted(baseline - visible_sources)
+        if self.monitor.journal:
+            self.journal_transitions(newly_shown, newly_hidden)
+        self.reset_visible_sources(visible_sources)
+        if newly_shown or newly_hidden:
+            self.monitor.play_catch_up(newly_shown, newly_hidden, self.label)
+
+    def journal_transitions(self, newly_shown, newly_hidden):
+        """Record every raw transition in the journal, before debouncing, with the scene holding the source"""
+        source_scenes = self.scene_graph.source_scenes()
+        now = time.time()
+        for shown, source_names in ((True, newly_shown), (False, newly_hidden)):
+            by_scene: Dict[str, List[str]] = {}
+            for source_name in source_names:
+                by_scene.setdefault(source_scenes.get(source_name, self.scene_graph.root), []).append(source_name)
+            for scene_name, names in by_scene.items():
+                self.monitor.journal.record(self.label, scene_name, shown, names, now)
+
+    def state_changed(self):
+        """Save the scene state shortly, so a burst of changes causes a single write"""
+        if self.monitor.state_store and self._save_handle is None:
+            self._save_handle = asyncio.get_running_loop().call_later(
+                self.monitor.config.get('state_save_delay', 1.0), self.save_state
+            )
+
+    def save_state(self, flush=True):
+        """Hand the scene state to the state store and write it from a worker thread"""
+        if self._save_handle:
+            self._save_handle.cancel()
+            self._save_handle = None
+        store = self.monitor.state_store
+        if not store or self.scene_graph.root is None:
+            return
+        store.update(self.state_key, self.scene_graph.export())
+        if flush:
+            asyncio.get_running_loop().run_in_executor(None, store.flush)
+
+    async def on_current_program_scene_changed(self, data):
+        """Program scene switched - cached scenes are reused, only unknown ones are fetched"""
+        self.scene_graph.root = data['sceneName']
+        await self.load_missing_scenes()
+        self.apply_visibility()
+        self.publish('scene', scene=self.scene_graph.root, preview=self.scene_graph.preview)
+        self.scene_graph.trim()
+
+    async def on_current_preview_scene_changed(self, data):
+        """Studio mode preview switched - its tree is kept cached, and how it differs from program can be announced"""
+        self.scene_graph.preview = data['sceneName']
+        await self.load_missing_scenes()
+        self.publish('scene', scene=self.scene_graph.root, preview=self.scene_graph.preview)
+        self.scene_graph.trim()
+        if self.monitor.config.get('announce_preview'):
+            self.announce_preview()
+
+    async def on_studio_mode_state_changed(self, data):
+        """Without studio mode there is no preview scene to keep"""
+        if not data.get('studioModeEnabled'):
+            self.scene_graph.preview = None
+
+    async def on_scene_created(self, data):
+        """A new scene is fetched the next time nothing else is waiting"""
+        if self.warm_enabled:
+            self.warm_queue.append((data['sceneName'], bool(data.get('isGroup'))))
+            self.warming = True
+
+    async def on_scene_removed(self, data):
+        """A removed scene leaves the cache, the items that used it are removed by their own events"""
+        if data['sceneName'] not in (self.scene_graph.root, self.scene_graph.preview):
+            self.scene_graph.evict(data['sceneName'])
+
+    async def on_scene_item_enable_state_changed(self, data):
+        """A scene item was shown or hidden, in the program scene or any scene nested in it"""
+        scene_name = data['sceneName']
+        if not self.scene_graph.set_enabled(scene_name, data['sceneItemId'], data['sceneItemEnabled']):
+            # Item we have not seen yet, refetch just that scene
+            self.scene_graph.invalidate(scene_name)
+        elif self.scene_graph.ignored(scene_name, data['sceneItemId']):
+            return
+        if self.scene_graph.scene_visible(scene_name):
+            await self.load_missing_scenes()
+            self.apply_visibility()
+
+    async def on_scene_item_created(self, data):
+        """A scene item was added to a scene"""
+        await self.on_scene_items_changed(data['sceneName'])
+
+    async def on_scene_item_removed(self, data):
+        """A scene item was removed from a scene"""
+        self.scene_graph.remove_item(data['sceneName'], data['sceneItemId'])
+        if self.scene_graph.scene_visible(data['sceneName']):
+            self.apply_visibility()
+
+    async def on_scene_item_list_reindexed(self, data):
+        """Scene items were reordered"""
+        await self.on_scene_items_changed(data['sceneName'])
+
+    async def on_scene_items_changed(self, scene_name):
+        """Invalidate one scene and refetch it if it is part of the program or preview tree, or else while warming"""
+        self.scene_graph.invalidate(scene_name)
+        await self.load_missing_scenes()
+        if self.scene_graph.scene_visible(scene_name):
+            self.apply_visibility()
+        elif scene_name in self.scene_graph.stale and self.warm_enabled:
+            self.warming = True
+
+    async def on_scene_name_changed(self, data):
+        """A scene was renamed - follow it without announcing it as hidden and shown"""
+        self.rename_scene(data['oldSceneName'], data['sceneName'])
+        if self.scene_graph.missing():
+            # Refetches dropped because of the rename
+            await self.load_missing_scenes()
+            self.apply_visibility()
+
+    def rename_scene(self, old_name, new_name):
+        """Follow a renamed scene in the graph and the debouncer, a no-op once it was followed"""
+        self.scene_graph.rename(old_name, new_name)
+        self.debouncer.rename(old_name, new_name)
+
+    async def on_current_scene_collection_changed(self, data):
+        """A different scene collection was loaded, nothing cached is valid anymore"""
+        self.scene_graph.clear()
+        await self.refresh_scene_graph()
+        self.apply_visibility()
+        self.start_warming()
+
+    async def monitor_sources(self):
+        """Polling loop with connection loss detection and recovery, timed by the poll scheduler"""
+        loop = asyncio.get_running_loop()
+        scheduler = self.poll_scheduler
+        scheduler.reset(loop.time())
+        while self.monitor.monitoring.is_set():
+            try:
+                # Health check, only when nothing has proved the connection for a while or the socket closed
+                if scheduler.health_check_due(loop.time()) or not (self.conn and self.conn.connected):
+                    if await self.is_connection_alive():
+                        scheduler.health_checked(loop.time())
+                    elif await self.handle_connection_loss():
+                        # Successfully reconnected, continue monitoring
+                        scheduler.reset(loop.time())
+                        continue
+                    else:
+                        # Failed to reconnect, exit monitoring
+                        break
+                
+                started = loop.time()
+                self.observed_at = time.perf_counter()
+                await self.refresh_scene_graph()
+                changed = self.apply_visibility()
+                self.consecutive_errors = 0
+                
+                now = loop.time()
+                await self.wait_for_poll(scheduler.poll_succeeded(changed, now - started, now))
+                
+            except Exception as e:
+                self.consecutive_errors += 1
+                self.logger.error(f"Error in monitoring{self.log_suffix()} (attempt {self.consecutive_errors}): {e}")
+                
+                # A closed socket will not recover by itself, so that is handled right away
+                if self.consecutive_errors >= self.monitor.max_consecutive_errors or not (self.conn and self.conn.connected):
+                    if await self.handle_connection_loss():
+                        # Successfully reconnected, reset and continue
+                        scheduler.reset(loop.time())
+                        continue
+                    else:
+                        # Failed to reconnect, exit monitoring
+                        break
+                
+                await asyncio.sleep(scheduler.error_delay(self.consecutive_errors))
+
+    async def wait_for_poll(self, delay):
+        """Sleep until the next poll, waking up early when the socket closes"""
+        try:
+            await asyncio.wait_for(self.events.get(), delay)
+        except asyncio.TimeoutError:
+            pass
+
+    @property
+    def warm_enabled(self):
+        return self.use_events and self.monitor.config.get('warm_scene_cache', True)
+
+    def start_warming(self):
+        """Fetch every scene of the collection into the cache, a few at a time between events"""
+        if self.warm_enabled:
+            self.warming = True
+            self.warm_list_needed = True
+
+    async def warm_scene_cache(self):
+        """Fetch the next few scenes the cache lacks, one round trip per call"""
+        graph = self.scene_graph
+        if self.warm_list_needed:
+            self.warm_list_needed = False
+            scene_list = await self.snapshot_engine.request(self.conn, 'GetSceneList')
+            graph.preview = scene_list.get('currentPreviewSceneName') or None
+            self.warm_queue = graph.uncached([scene['sceneName'] for scene in scene_list['scenes']])
+        elif not self.warm_queue:
+            # Nested scenes and groups of what was just fetched, and scenes that changed since
+            self.warm_queue = graph.uncached(())
+        if not self.warm_queue:
+            self.warming = False
+            self.monitor.prerender_speech(self)
+            return
+        
+        chunk, self.warm_queue = self.warm_queue[:self.WARM_BATCH], self.warm_queue[self.WARM_BATCH:]
+        lists = await self.fetch_scene_lists(chunk)
+        if lists is None:
+            # The chunk may hold the old name of a renamed scene, list the collection again
+            self.warm_queue = []
+            self.warm_list_needed = True
+            return
+        for name, is_group in chunk:
+            # A scene that no longer exists is recorded as empty so it is not requested again
+            self.store_scene(name, lists.get(name, []), is_group)
+        graph.trim()
+
+    async def monitor_events(self):
+        """Event-driven loop - changes arrive as OBS events, silence only costs an occasional health check"""
+        while self.monitor.monitoring.is_set():
+            if self.warming and self.events.empty():
+                # Warming only uses the time between events, so it never holds one back for long
+                try:
+                    await self.warm_scene_cache()
+                except Exception as e:
+                    self.logger.error(f"Error warming the scene cache{self.log_suffix()}: {e}")
+                    self.warming = False
+                continue
+            
+            try:
+                event = await asyncio.wait_for(self.events.get(), self.monitor.event_health_interval)
+            except asyncio.TimeoutError:
+                event = ()
+                if await self.is_connection_alive():
+                    continue
+            
+            if event:
+                handler = self.event_handlers.get(event[0])
+                if handler is None:
+                    continue
+                self.observed_at = event[2]
+                try:
+                    await handler(event[1])
+                    continue
+                except Exception as e:
+                    self.logger.error(f"Error handling {event[0]}{self.log_suffix()}: {e}")
+                    if self.conn and self.conn.connected:
+                        continue
+            
+            # Socket closed (None) or health check failed
+            if not await self.handle_connection_loss():
+                # Failed to reconnect, exit monitoring
+                break
+            if not self.use_events:
+                # The reconnected session has no scene events, so it is polled from now on
+                await self.monitor_sources()
+                return
+
+    async def start(self):
+        """Connect and take the initial snapshot, returns False if this instance could not connect"""
+        # The saved state is read while connecting, so it adds nothing to startup time
+        store = self.monitor.state_store
+        saved_state = asyncio.ensure_future(asyncio.to_thread(store.get, self.state_key)) if store else None
+        
+        if not await self.connect_to_obs_with_retry():
+            return False
+        
+        self.connection_lost = False
+        self.consecutive_errors = 0
+        try:
+            # In event mode the subscription is already live, so no change can fall between
+            # this snapshot and the first event
+            visible_sources = await self.get_visible_sources()
+        except Exception as e:
+            self.logger.error(f"Initial snapshot failed{self.log_suffix()}: {e}")
+            await self.disconnect_from_obs()
+            return False
+        
+        # Changes made while the program was not running are announced against the saved state
+        try:
+            saved_state = await saved_state if saved_state else None
+            baseline = SceneGraph.restore(saved_state, self.monitor.source_profiles).visible_sources() if saved_state else None
+        except Exception as e:
+            self.logger.error(f"Error restoring saved state{self.log_suffix()}: {e}")
+            baseline = None
+        if baseline is None:
+            self.reset_visible_sources(visible_sources)
+        else:
+            self.catch_up(visible_sources, baseline)
+        self.start_warming()
+        return True
+
+    async def run(self):
+        """Monitor until stopped or until the connection is lost for good"""
+        try:
+            if self.use_events:
+                await self.monitor_events()
+            else:
+                await self.monitor_sources()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Fatal error monitoring{self.log_suffix()}: {e}")
+            # Don't call handle_connection_loss here to avoid duplicate sounds
+        finally:
+            await self.disconnect_from_obs()
+            self.monitor.instance_stopped(self)
+
+# Allowed values and ranges, checked on top of every setting having the type of its default
+CONFIG_CHOICES = {
+    'monitor_mode': ('events', 'polling'),
+    'snapshot_mode': SnapshotEngine.MODES,
+    'audio_backend': ('auto', 'winmm', 'pulse', 'alsa', 'wav', 'null', 'timed'),
+}
+CONFIG_RANGES = {
+    'port': (1, 65535),
+    'volume': (0.0, 1.0),
+    'poll_interval': (0.001, None),
+    'poll_max_interval': (0.001, None),
+    'health_check_interval': (0.01, None),
+    'max_consecutive_errors': (1, None),
+    'event_health_interval': (0.01, None),
+    'request_timeout': (0.01, None),
+    'heartbeat_interval': (0.01, None),
+    'heartbeat_timeout': (0.01, None),
+    'reconnect_timeout': (0.0, None),
+    'reconnect_max_delay': (0.05, None),
+    'state_save_delay': (0.0, None),
+    'audio_queue_size': (1, None),
+    'speech_queue_size': (1, None),
+    'speech_max_names': (1, None),
+    'debounce_ms': (0, None),
+    'flap_window_ms': (0, None),
+    'flap_threshold': (0, None),
+    'config_check_interval': (0.05, None),
+    'scene_cache_size': (1, None),
+}
+INSTANCE_FIELDS = {'label': str, 'host': str, 'port': int, 'password': str}
+# Settings a running monitor cannot pick up, changing them in config.json only logs a note.
+# request_timeout, heartbeat_*, reconnect_* and state_save_delay are read when used, so they
+# apply from the next connection or save on.
+RESTART_SETTINGS = {'monitor_mode', 'snapshot_mode', 'metrics', 'state_file', 'config_check_interval'}
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def validate_config(config, defaults, path=''):
+    """Check a merged config against the defaults it was merged into, returns a list of problems"""
+    problems = []
+    for key, default in defaults.items():
+        name = f"{path}{key}"
+        value = config.get(key)
+        if isinstance(default, dict):
+            if not isinstance(value, dict):
+                problems.append(f"{name} must be an object")
+            elif path != '' or key not in ('tones', 'tone_durations'):
+                problems += validate_config(value, default, f"{name}.")
+            else:
+                # Every tone is a number or a list of numbers, whichever its default is
+                for tone, tone_default in default.items():
+                    tone_value = value.get(tone)
+                    if isinstance(tone_default, list):
+                        if not isinstance(tone_value, list) or not tone_value or not all(is_number(v) and v > 0 for v in tone_value):
+                            problems.append(f"{name}.{tone} must be a list of positive numbers")
+                    elif not (is_number(tone_value) and tone_value > 0):
+                        problems.append(f"{name}.{tone} must be a positive number")
+            continue
         
-    def play_tone_blocking(self, frequency, duration=0.1):
-        """Play a single tone using Windows Beep function"""
-        with self.audio_lock:
-            try:
-                # Convert duration from seconds to milliseconds
-                duration_ms = int(duration * 1000)
-                # Ensure frequency is within valid range (37 to 32767 Hz)
-                frequency = max(37, min(32767, int(frequency)))
-                kernel32.Beep(frequency, duration_ms)
-            except Exception as e:
-                print(f"Error playing tone {frequency}Hz: {e}")
-    
-    def play_chord_blocking(self, frequencies, duration=0.15):
-        """Play multiple frequencies sequentially (Windows Beep can't play simultaneous tones)"""
-        # Since Windows Beep can't play simultaneous tones, we'll play them in quick succession
-        chord_duration = duration / len(frequencies)
-        for freq in frequencies:
-            self.play_tone_blocking(freq, chord_duration)
-    
-    def play_sequence_blocking(self, frequencies, durations, gaps=None):
-        """Play a sequence of tones with gaps"""
-        if gaps is None:
-            gaps = [0.05] * (len(frequencies) - 1)
+        if isinstance(default, bool):
+            valid = isinstance(value, bool)
+        elif isinstance(default, float):
+            valid = is_number(value)
+        elif isinstance(default, int):
+            valid = isinstance(value, int) and not isinstance(value, bool)
+        else:
+            valid = isinstance(value, type(default))
+        if not valid:
+            problems.append(f"{name} must be {type(default).__name__}, not {type(value).__name__}")
+            continue
         
-        for i, (freq, dur) in enumerate(zip(frequencies, durations)):
-            self.play_tone_blocking(freq, dur)
-            if i < len(gaps):
-                time.sleep(gaps[i])
+        if path:
+            continue
+        if key in CONFIG_CHOICES and value not in CONFIG_CHOICES[key]:
+            problems.append(f"{name} must be one of {', '.join(CONFIG_CHOICES[key])}")
+        if key in CONFIG_RANGES:
+            low, high = CONFIG_RANGES[key]
+            if (low is not None and value < low) or (high is not None and value > high):
+                problems.append(f"{name} must be between {low} and {high}" if high is not None else f"{name} must be at least {low}")
+        if key == 'source_rules':
+            problems += SourceProfiles.check(value)
+        if key == 'instances':
+            for position, target in enumerate(value):
+                if not isinstance(target, dict):
+                    problems.append(f"instances[{position}] must be an object")
+                    continue
+                for field, field_type in INSTANCE_FIELDS.items():
+                    if field in target and not (isinstance(target[field], field_type) and not isinstance(target[field], bool)):
+                        problems.append(f"instances[{position}].{field} must be {field_type.__name__}")
+    return problems
 
 class OBSSourceMonitor:
-    def __init__(self):
-        # Initialize speech output
-        self.speech = auto.Auto()
-        
-        # Load configuration
-        self.config = self.load_config()
+    def __init__(self, config=None, profile=False):
+        # Load configuration - a config passed in (headless runs, benchmarks) skips config.json and the dialog
+        self.config = self.load_config(config)
+        self.profile_forced = profile  # --profile on the command line, profiling stays on whatever the config says
         
         # Apply configuration settings
         self.host = self.config['host']
@@ -248,52 +1415,123 @@ class OBSSourceMonitor:
         self.volume = self.config['volume']
         self.poll_interval = self.config['poll_interval']
         self.max_consecutive_errors = self.config['max_consecutive_errors']
+        self.monitor_mode = self.config.get('monitor_mode', 'events')
+        self.event_health_interval = self.config.get('event_health_interval', 10.0)
         
         # Notification settings
         self.use_speech = self.config.get('use_speech', False)  # Default to False
         self.use_tones = self.config.get('use_tones', True)    # Default to True
         
-        # Connection and monitoring state
-        self.ws = None
-        self.currently_visible_sources: Set[str] = set()
-        self.monitoring = False
-        self.should_exit = False
+        # Speech output is loaded by the speech worker on first use, keeping it off the startup path
+        self.speech = None
+        
+        # Monitoring state - connection state lives on each OBSInstance
+        self.loop = None
+        self.active_instances = []
+        self.starting = None
         self.exit_tone_played = False
-        self.connection_lost = False
-        self.consecutive_errors = 0
-        self._health_check_counter = 0
+        
+        # Lifecycle signals, so every wait that has to end on exit can be woken right away
+        self.monitoring = threading.Event()
+        self.should_exit = threading.Event()  # Hotkey, SIGINT/SIGTERM, or every instance lost for good
+        self.connection_lost = threading.Event()
         
         # Threading locks
         self.exit_lock = threading.Lock()
-        self.monitor_lock = threading.Lock()
         self.speech_lock = threading.Lock()
         
-        # Audio setup - use Windows tone generator
-        self.tone_generator = WindowsToneGenerator(self.volume) if self.use_tones else None
+        # Local state server for other tools, runs on the event loop
+        self.state_server = None
+        
+        # Config hot reload - reloads run one at a time on the event loop
+        self.config_watcher = None
+        self.reload_lock = asyncio.Lock()
+        self.hotkey_handle = None
+        self.profile_hotkey_handle = None
         
         # Setup logging
         self.setup_logging()
+        for problem in self.config_problems:
+            self.logger.error(f"Config error: {problem}")
+        
+        # Long-run memory, thread and GC sampling, for shows that grow or slow down over hours
+        self.profiler = self.create_profiler()
+        
+        # Stage latency metrics - a no-op stand-in unless switched on in the config
+        self.metrics = self.create_metrics()
+        
+        # Last known scene state, for announcing what changed while disconnected or not running
+        state_file = self.config.get('state_file')
+        if state_file and not os.path.isabs(state_file):
+            state_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), state_file)
+        self.state_store = StateStore(state_file) if state_file else None
+        
+        # Journal of every visibility transition, for reviewing a show afterwards
+        self.journal = self.create_journal()
+        
+        # Per-source announcement rules, compiled once - the custom tones among them are rendered with the earcons
+        self.source_profiles = self.create_source_profiles()
+        
+        # Audio setup - every earcon is rendered once, then played by one scheduler thread
+        self.audio = self.create_audio() if self.use_tones else None
+        
+        # Pre-rendered source announcements, with their own audio thread so speech never holds up a tone
+        self.speech_cache, self.speech_audio = self.create_speech_cache() if self.use_speech else (None, None)
+        
+        # Speech setup - one worker thread that coalesces announcements
+        self.speech_queue = SpeechQueue(
+            self.speak, self.config.get('speech_queue_size', 256), max_names=self.config.get('speech_max_names', 5),
+            metrics=self.metrics
+        ) if self.use_speech else None
+        
+        # Stream, recording and mute announcements, driven by events only
+        self.watchers = self.create_watchers()
+        
+        # One instance per OBS host, all driven by a single asyncio event loop
+        self.instances = self.create_instances()
 
-    def speak(self, text):
-        """Speak text using accessible_output3"""
+    def speak(self, text, single_source=False):
+        """Speak text using accessible_output3 - single_source marks a "<name> shown/hidden" phrase, the only kind worth caching"""
         if not self.use_speech:
             return
+        
+        # Pre-rendered phrases play straight from memory, anything else goes to the screen reader.
+        # Only single source phrases are rendered on a miss, one-off text would push them out of the cache
+        cache = self.speech_cache
+        if cache:
+            pcm = cache.get(text) if single_source else cache.peek(text)
+            if pcm:
+                self.speech_audio.play_pcm(pcm, wait=True)
+                return
             
+        started = time.perf_counter()
         with self.speech_lock:
+            self.metrics.observe('speech_lock_wait_seconds', time.perf_counter() - started)
             try:
+                if self.speech is None:
+                    self.speech = self.create_speech()
                 self.speech.speak(text)
             except Exception as e:
                 self.logger.error(f"Error speaking text '{text}': {e}")
 
-    def speak_threaded(self, text):
-        """Speak text in a background thread"""
-        if not self.use_speech:
+    def create_speech(self):
+        """Load the screen reader output - accessible_output3 is only imported when speech is used"""
+        from accessible_output3.outputs import auto
+        return auto.Auto()
+
+    def say(self, text, wait=False):
+        """Queue a system message on the speech worker, ahead of source announcements"""
+        if not self.use_speech or not self.speech_queue:
             return
-        threading.Thread(target=lambda: self.speak(text), daemon=True).start()
+        self.speech_queue.say(text, wait)
 
     def show_config_dialog(self):
         """Show configuration dialog and return config"""
         try:
+            # wx is only needed for this dialog, so it is imported on first launch only
+            import wx
+            from config_dialog import ConfigDialog
+            
             app = wx.App()
             dialog = ConfigDialog()
             
@@ -325,29 +1563,124 @@ class OBSSourceMonitor:
                 'use_tones': True
             }, False
 
-    def load_config(self):
-        """Load configuration from file with defaults, show dialog if no config exists"""
-        config_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
-        
-        default_config = {
+    def default_config(self):
+        """Every setting with its default value"""
+        return {
             'host': 'localhost',
             'port': 4455,
             'password': '',
             'volume': 0.4,
-            'poll_interval': 0.1,
+            'poll_interval': 0.1,  # Fastest polling rate, used right after a change
+            'poll_max_interval': 1.0,  # Slowest polling rate once nothing has changed for a while
+            'health_check_interval': 3.0,  # Check the connection when no poll has succeeded for this long
             'max_consecutive_errors': 3,
+            'monitor_mode': 'events',  # 'events' or 'polling'
+            'snapshot_mode': 'batch',  # 'batch', 'list' or 'per_item'
+            'event_health_interval': 10.0,
+            'request_timeout': 5.0,
+            'heartbeat_interval': 1.0,  # WebSocket ping period, a missing pong after heartbeat_timeout drops the connection
+            'heartbeat_timeout': 1.0,
+            'reconnect_timeout': 10.0,  # Give up on a lost instance after this many seconds of failed reconnects
+            'reconnect_max_delay': 1.0,
+            'state_file': '',  # Where to keep the last known scene state, such as 'state.json', to announce changes made while disconnected
+            'state_save_delay': 1.0,
+            'journal': {
+                'enabled': False,  # Record every transition to disk, for looking back at a show
+                'directory': 'journal',  # Query it with journal.py
+                'max_bytes': 8 * 1024 * 1024,  # Start a new file at this size...
+                'rotate_interval': 86400,  # ...or after this many seconds
+                'flush_interval': 1.0,
+            },
+            'instances': [],  # Optional list of {'label', 'host', 'port', 'password'} to monitor several OBS hosts
             'hotkey': 'shift+win+f4',
             'fallback_hotkey': 'ctrl+shift+f4',
             'use_speech': False,  # Default to False
             'use_tones': True,    # Default to True
+            'audio_backend': 'auto',  # 'auto', 'winmm', 'pulse', 'alsa', 'wav', 'null' or 'timed' (silent but takes real time)
+            'audio_wav_path': 'tones.wav',
+            'audio_queue_size': 8,
+            'speech_queue_size': 256,
+            'speech_max_names': 5,
+            'debounce_ms': 0,  # Hold changes back until a source has kept its new state this long
+            'flap_window_ms': 2000,
+            'flap_threshold': 0,  # Changes within flap_window_ms before a source counts as flapping, 0 disables
+            'warm_scene_cache': True,  # Keep every scene cached between events, so switching to one needs no request
+            'scene_cache_size': 500,  # Most scenes kept cached, least recently used ones are dropped first
+            'announce_preview': False,  # Say how the studio mode preview scene differs from program when it changes
+            'speech_cache': {  # Source announcements synthesized ahead of time and played from memory
+                'enabled': False,
+                'engine': 'pyttsx3',  # 'pyttsx3', 'espeak' or 'stub'
+                'voice': '',  # Engine voice ID, '' for the default voice
+                'rate': 0,  # Words per minute, 0 for the default rate
+                'directory': 'speech_cache',
+                'max_bytes': 64 * 1024 * 1024,  # Rendered phrases kept on disk, least recently used ones are removed first
+                'memory_bytes': 32 * 1024 * 1024,  # Rendered phrases kept in memory
+            },
+            'source_rules': [],  # {'match': glob} or {'regex': ...}, plus exclude, speech, label, shown_tone, hidden_tone, flapping_tone
+            'only_listed_sources': False,  # Leave out every source no source rule matches
+            'metrics': {
+                'enabled': False,
+                'file': 'metrics.prom',  # Prometheus text file, rewritten every file_interval seconds, '' disables
+                'file_interval': 10.0,
+                'http_host': '127.0.0.1',
+                'http_port': 0,  # Serve the same text over HTTP on this port, 0 disables
+            },
+            'state_server': {  # Serves the scene state to other local tools, so they need no OBS connection of their own
+                'enabled': False,
+                'host': '127.0.0.1',
+                'port': 4466,
+                'unix_socket': '',  # Listen on this Unix domain socket path instead of TCP
+                'client_buffer': 65536,  # Bytes a client may fall behind before it is disconnected
+                'max_clients': 32,
+            },
+            'logging': {  # errors.log is written by a thread of its own, so errors never wait on the disk
+                'max_bytes': 1024 * 1024,  # errors.log moves to errors.log.1 at this size
+                'backup_count': 3,
+                'burst': 3,  # Copies of the same message written before repeats are only counted
+                'repeat_interval': 10.0,  # One more copy, with the count of those left out, per this many seconds
+            },
+            'profile': {  # Resource sampling for long runs, also switched on by --profile
+                'enabled': False,
+                'file': 'profile.jsonl',  # One line per sample, CPU profiles are written next to it
+                'interval': 60.0,
+                'top': 10,  # Allocation sites per sample that grew the most
+                'max_bytes': 1024 * 1024,  # The file moves to <file>.1 at this size
+                'capture_seconds': 10.0,  # Length of a CPU profile taken with the hotkey or SIGUSR1
+                'hotkey': 'shift+win+f5',
+            },
+            'watchers': {  # Announcements besides source visibility, each only adds its own OBS events
+                'stream': {'enabled': False},
+                'record': {'enabled': False},
+                'input_mute': {'enabled': False, 'inputs': []},  # Empty inputs watches every audio input
+                'audio_levels': {  # Silence and clipping alerts from live audio levels, needs NumPy
+                    'enabled': False,
+                    'inputs': [],
+                    'silence_db': -50.0,
+                    'silence_seconds': 10.0,
+                    'clip_db': -0.5,
+                    'clip_seconds': 2.0,
+                    'clip_frames': 3,
+                    'hysteresis_db': 6.0,
+                    'check_every': 5,  # Meter frames between evaluations, 5 frames is 250 ms
+                    'capacity': 32,  # Inputs the ring buffers start with, they grow when needed
+                },
+            },
             'tones': {
                 'startup': [523, 784],
                 'connected': [523, 659, 784],
                 'source_shown': 800,
                 'source_hidden': 400,
+                'source_flapping': 600,
                 'error': [400, 300],
                 'connection_lost': [500, 400, 300],
-                'exit': [659, 523, 392]
+                'exit': [659, 523, 392],
+                'output_started': [587, 880],
+                'output_stopped': [880, 587],
+                'input_muted': 330,
+                'input_unmuted': 660,
+                'level_alert': [220, 220, 220],
+                'level_ok': [440, 554],
+                'preview': [698, 698]
             },
             'tone_durations': {
                 'startup': [0.12, 0.15],
@@ -355,10 +1688,26 @@ class OBSSourceMonitor:
                 'source': 0.08,
                 'error': 0.08,
                 'connection_lost': 0.06,
-                'exit': 0.25
-            }
+                'exit': 0.25,
+                'output': 0.1,
+                'input': 0.06
+            },
+            'config_check_interval': 1.0,  # How often config.json is checked for changes where inotify is unavailable
         }
+
+    def load_config(self, overrides=None):
+        """Load configuration from file with defaults, show dialog if no config exists"""
+        config_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
+        default_config = self.default_config()
+        
+        if overrides is not None:
+            # Headless runs are not tied to config.json, so there is nothing to watch
+            self.config_file = None
+            self._deep_update(default_config, overrides)
+            self.config_problems = self.repair_config(default_config)
+            return default_config
         
+        self.config_file = config_file
         config_exists = os.path.exists(config_file)
         
         if config_exists:
@@ -386,8 +1735,28 @@ class OBSSourceMonitor:
             # Always save config file (whether user pressed Save or Use Defaults)
             self.save_config(config_file, default_config)
         
+        self.config_problems = self.repair_config(default_config)
         return default_config
 
+    def repair_config(self, config):
+        """Check a merged config the way a reload is checked, putting back the default of every setting with a problem.
+
+        Returns the problems, logged once logging is set up. A reload rejects the whole file instead,
+        but at startup there are no previous settings to keep.
+        """
+        defaults = self.default_config()
+        problems = []
+        for key, default in defaults.items():
+            key_problems = validate_config({key: config.get(key)}, {key: default})
+            if key_problems:
+                problems.append(f"{'; '.join(key_problems)}, using the default for {key}")
+                config[key] = default
+        if config['poll_max_interval'] < config['poll_interval']:
+            problems.append("poll_max_interval must not be below poll_interval, using the defaults for both")
+            config['poll_interval'] = defaults['poll_interval']
+            config['poll_max_interval'] = defaults['poll_max_interval']
+        return problems
+
     def _deep_update(self, base_dict, update_dict):
         """Recursively update nested dictionaries"""
         for key, value in update_dict.items():
@@ -404,135 +1773,693 @@ class OBSSourceMonitor:
         except Exception as e:
             print(f"Error saving config: {e}")
 
+    def read_config(self):
+        """Read config.json merged over the defaults, raises if it cannot be read or parsed"""
+        config = self.default_config()
+        with open(self.config_file, 'r') as f:
+            self._deep_update(config, json.load(f))
+        return config
+
+    def start_config_watch(self):
+        """Watch config.json for changes, on the event loop thread"""
+        if not self.config_file:
+            return
+        try:
+            self.config_watcher = ConfigWatcher(self.config_file, self.config_file_changed,
+                                                self.config.get('config_check_interval', 1.0))
+            self.config_watcher.start(self.loop)
+        except Exception as e:
+            self.logger.error(f"Failed to watch config.json, changes need a restart: {e}")
+            self.config_watcher = None
+
+    async def start_state_server(self):
+        """Start serving the scene state to local tools if the state server is switched on"""
+        settings = self.config['state_server']
+        if not settings.get('enabled'):
+            return
+        unix_socket = settings.get('unix_socket', '')
+        if unix_socket and not os.path.isabs(unix_socket):
+            unix_socket = os.path.join(os.path.dirname(os.path.abspath(__file__)), unix_socket)
+        server = StateServer(
+            self.server_state, settings.get('host', '127.0.0.1'), settings.get('port', 4466), unix_socket,
+            settings.get('client_buffer', 65536), settings.get('max_clients', 32)
+        )
+        try:
+            await server.start()
+        except Exception as e:
+            self.logger.error(f"Failed to start the state server: {e}")
+            return
+        self.state_server = server
+        self.metrics.gauge('state_server_clients', lambda: len(server.clients))
+        self.metrics.gauge('state_server_dropped_clients', lambda: server.dropped)
+
+    async def stop_state_server(self):
+        if self.state_server:
+            server, self.state_server = self.state_server, None
+            await server.stop()
+
+    def server_state(self) -> list:
+        """Current state of every instance, answered by the state server"""
+        return [instance.server_state() for instance in self.instances]
+
+    def stop_config_watch(self):
+        if self.config_watcher:
+            self.config_watcher.stop()
+            self.config_watcher = None
+
+    def config_file_changed(self):
+        """Called by the watcher on the event loop thread"""
+        self.reload_task = asyncio.ensure_future(self.reload_config())
+
+    async def reload_config(self):
+        """Re-read config.json and apply only the sections that changed, keeping the OBS connections"""
+        async with self.reload_lock:
+            try:
+                config = await asyncio.to_thread(self.read_config)
+            except Exception as e:
+                self.logger.error(f"Config not reloaded, config.json could not be read: {e}")
+                self.config_rejected()
+                return
+            
+            problems = validate_config(config, self.default_config())
+            if not problems and config['poll_max_interval'] < config['poll_interval']:
+                problems.append("poll_max_interval must not be below poll_interval")
+            if problems:
+                self.logger.error(f"Config not reloaded: {'; '.join(problems)}")
+                self.config_rejected()
+                return
+            
+            changed = {key for key in config.keys() | self.config.keys() if config.get(key) != self.config.get(key)}
+            if not changed:
+                return
+            old_config, self.config = self.config, config
+            
+            for settings, apply in self.config_sections():
+                if changed & settings:
+                    try:
+                        await apply(old_config, changed)
+                    except Exception as e:
+                        self.logger.error(f"Error applying config change to {', '.join(sorted(changed & settings))}: {e}")
+            
+            restart = changed & RESTART_SETTINGS
+            if restart:
+                self.logger.error(f"Config changes to {', '.join(sorted(restart))} take effect after a restart")
+            self.say("Config reloaded")
+
+    def config_rejected(self):
+        """Let the user know their edit was not applied"""
+        self.play_earcon('error')
+        self.say("Config file has errors, changes not applied")
+
+    def config_sections(self):
+        """Which settings each apply step handles, in the order they are applied"""
+        return (
+            ({'source_rules', 'only_listed_sources'}, self.apply_source_rules_config),
+            ({'use_tones', 'audio_backend', 'audio_wav_path', 'audio_queue_size', 'volume', 'tones', 'tone_durations'},
+             self.apply_audio_config),
+            ({'use_speech', 'speech_queue_size', 'speech_max_names', 'speech_cache'}, self.apply_speech_config),
+            ({'poll_interval', 'poll_max_interval', 'health_check_interval', 'debounce_ms', 'flap_window_ms',
+              'flap_threshold', 'max_consecutive_errors', 'event_health_interval'}, self.apply_timing_config),
+            ({'warm_scene_cache', 'scene_cache_size', 'announce_preview'}, self.apply_scene_cache_config),
+            ({'journal'}, self.apply_journal_config),
+            ({'state_server'}, self.apply_state_server_config),
+            ({'watchers'}, self.apply_watchers_config),
+            ({'logging'}, self.apply_logging_config),
+            ({'profile'}, self.apply_profile_config),
+            ({'hotkey', 'fallback_hotkey'}, self.apply_hotkey_config),
+            ({'host', 'port', 'password', 'instances'}, self.apply_instances_config),
+        )
+
+    async def apply_audio_config(self, old_config, changed):
+        """Re-render the earcons, or reopen the audio backend if it changed"""
+        self.volume = self.config['volume']
+        self.use_tones = self.config['use_tones']
+        if self.audio and not changed & {'use_tones', 'audio_backend', 'audio_wav_path', 'audio_queue_size'}:
+            await asyncio.to_thread(self.render_earcons, self.audio)
+            return
+        
+        old_audio = self.audio
+        self.audio = await asyncio.to_thread(self.create_audio) if self.use_tones else None
+        if old_audio:
+            await asyncio.to_thread(old_audio.close)
+
+    async def apply_speech_config(self, old_config, changed):
+        """Start, stop or rebuild the speech worker and the speech cache"""
+        old_queue = self.speech_queue
+        old_cache, old_audio = self.speech_cache, self.speech_audio
+        self.use_speech = self.config['use_speech']
+        if old_queue:
+            await asyncio.to_thread(old_queue.close)
+        self.speech_queue = None
+        
+        # The cache is kept when only the queue settings changed, so nothing is rendered again
+        if changed & {'use_speech', 'speech_cache'}:
+            self.speech_cache, self.speech_audio = (
+                await asyncio.to_thread(self.create_speech_cache) if self.use_speech else (None, None)
+            )
+            await asyncio.to_thread(self.close_speech_cache, old_cache, old_audio)
+        self.speech_queue = SpeechQueue(
+            self.speak, self.config['speech_queue_size'], max_names=self.config['speech_max_names'],
+            metrics=self.metrics
+        ) if self.use_speech else None
+        self.prerender_speech()
+
+    async def apply_timing_config(self, old_config, changed):
+        """Hand new poll, debounce and health check timings to every instance"""
+        config = self.config
+        self.poll_interval = config['poll_interval']
+        self.max_consecutive_errors = config['max_consecutive_errors']
+        self.event_health_interval = config['event_health_interval']
+        for instance in self.instances:
+            instance.poll_scheduler.configure(
+                config['poll_interval'], config['poll_max_interval'], config['health_check_interval']
+            )
+            instance.debouncer.debounce = config['debounce_ms'] / 1000
+            instance.debouncer.flap_window = config['flap_window_ms'] / 1000
+            instance.debouncer.flap_threshold = config['flap_threshold']
+
+    async def apply_source_rules_config(self, old_config, changed):
+        """Recompile the source rules and hand them to every instance, rendering their tones unless the audio step will"""
+        self.source_profiles = self.create_source_profiles()
+        if self.audio and not changed & {'use_tones', 'audio_backend', 'audio_wav_path', 'audio_queue_size',
+                                         'volume', 'tones', 'tone_durations'}:
+            await asyncio.to_thread(self.render_earcons, self.audio)
+        for instance in self.instances:
+            await instance.set_source_profiles(self.source_profiles)
+        self.prerender_speech()
+
+    async def apply_scene_cache_config(self, old_config, changed):
+        """Resize the scene caches, start warming them and follow studio mode as configured"""
+        for instance in self.instances:
+            instance.scene_graph.max_scenes = self.config['scene_cache_size']
+            instance.scene_graph.trim()
+            instance.start_warming()
+            if 'announce_preview' in changed and instance.conn and instance.conn.connected:
+                await instance.conn.reidentify(instance.event_subscriptions())
+
+    async def apply_journal_config(self, old_config, changed):
+        """Reopen the journal with its new settings"""
+        old_journal = self.journal
+        self.journal = self.create_journal()
+        if old_journal:
+            await asyncio.to_thread(old_journal.close)
+
+    async def apply_state_server_config(self, old_config, changed):
+        """Restart the state server with its new settings, clients reconnect on their own"""
+        await self.stop_state_server()
+        await self.start_state_server()
+
+    async def apply_watchers_config(self, old_config, changed):
+        """Swap the watchers, every connection only changes its event subscriptions"""
+        self.watchers = self.create_watchers()
+        for instance in self.instances:
+            await instance.set_watchers(self.watchers)
+
+    async def apply_logging_config(self, old_config, changed):
+        """Hand the new rotation and repeat settings to the log handlers"""
+        settings = self.config['logging']
+        self.log_file_handler.maxBytes = settings['max_bytes']
+        self.log_file_handler.backupCount = settings['backup_count']
+        with self.log_handler.throttle_lock:
+            self.log_handler.burst = settings['burst']
+            self.log_handler.repeat_interval = settings['repeat_interval']
+
+    async def apply_profile_config(self, old_config, changed):
+        """Restart resource sampling with its new settings and swap the profile hotkey"""
+        old_profiler = self.profiler
+        if old_profiler:
+            await asyncio.to_thread(old_profiler.stop)
+        self.profiler = await asyncio.to_thread(self.create_profiler)
+        await asyncio.to_thread(self.setup_hotkey)
+
+    async def apply_hotkey_config(self, old_config, changed):
+        """Swap the exit hotkey"""
+        await asyncio.to_thread(self.setup_hotkey)
+
+    async def apply_instances_config(self, old_config, changed):
+        """Reconnect only the instances whose host, port or password changed"""
+        self.host = self.config['host']
+        self.port = self.config['port']
+        self.password = self.config['password']
+        
+        current = list(self.instances)
+        kept, relabelled, targets = [], [], []
+        for label, host, port, password in self.instance_targets():
+            match = next((instance for instance in current
+                          if (instance.host, instance.port, instance.password) == (host, port, password)), None)
+            if match:
+                current.remove(match)
+                kept.append(match)
+                if match.label != label:
+                    relabelled.append((match, label))
+            else:
+                targets.append((label, host, port, password))
+        
+        # Gauges are keyed by label, so every old label is let go before any new one is taken
+        for instance in current + [instance for instance, _ in relabelled]:
+            instance.unregister_gauges()
+        for instance, label in relabelled:
+            instance.relabel(label)
+        added = [OBSInstance(self, *target) for target in targets]
+        
+        # New hosts connect before the old ones are dropped, so monitoring never stops when a host moves
+        results = await asyncio.gather(*(instance.start() for instance in added))
+        started = [instance for instance, ok in zip(added, results) if ok]
+        for instance in started:
+            instance.task = asyncio.create_task(instance.run())
+        
+        self.instances = kept + started
+        self.active_instances = [instance for instance in self.active_instances if instance not in current] + started
+        await self._stop_instances(current)
+        if not self.active_instances and self.monitoring.is_set():
+            self.all_connections_lost()
+
     def setup_logging(self):
-        """Setup logging to file"""
+        """Setup logging to a rotating file, written by a thread of its own"""
         log_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'errors.log')
+        settings = self.config['logging']
         
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(logging.ERROR)
+        self.log_file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=settings.get('max_bytes', 1024 * 1024), backupCount=settings.get('backup_count', 3), delay=True
+        )
+        self.log_file_handler.setLevel(logging.ERROR)
         
         formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(formatter)
+        self.log_file_handler.setFormatter(formatter)
         
-        self.logger = logging.getLogger(__name__)
+        # Callers only queue the record, repeats of the same error are mostly just counted
+        self.log_handler = ThrottledQueueHandler(queue.SimpleQueue(), settings.get('burst', 3), settings.get('repeat_interval', 10.0))
+        self.log_listener = logging.handlers.QueueListener(self.log_handler.queue, self.log_file_handler, respect_handler_level=True)
+        self.log_listener.start()
+        
+        self.logger = logging.getLogger('OBSMonitor')
+        for handler in list(self.logger.handlers):
+            # Left by an earlier monitor in this process, such as in a benchmark
+            self.logger.removeHandler(handler)
+            handler.close()
         self.logger.setLevel(logging.ERROR)
-        self.logger.addHandler(file_handler)
+        self.logger.addHandler(self.log_handler)
         self.logger.propagate = False
 
-    def play_tone_blocking(self, frequency, duration=0.1):
-        """Play a single tone - blocking version"""
-        if not self.use_tones or not self.tone_generator:
+    def stop_logging(self):
+        """Write the pending repeat counts and stop the log writer thread, later errors are written directly"""
+        if self.log_listener is None:
+            return
+        self.log_handler.flush_repeats()
+        self.log_listener.stop()
+        self.log_listener = None
+        self.logger.removeHandler(self.log_handler)
+        self.logger.addHandler(self.log_file_handler)
+
+    def create_metrics(self):
+        """Create the metrics registry, or a no-op stand-in when metrics are switched off"""
+        if not self.config['metrics'].get('enabled'):
+            return NullMetrics()
+        
+        metrics = Metrics()
+        metrics.gauge('speech_queue_depth', lambda: self.speech_queue.pending() if self.speech_queue else 0)
+        metrics.gauge('speech_replaced', lambda: self.speech_queue.replaced if self.speech_queue else 0)
+        metrics.gauge('speech_dropped', lambda: self.speech_queue.dropped if self.speech_queue else 0)
+        metrics.gauge('audio_queue_depth', lambda: self.audio.queue.qsize() if self.audio else 0)
+        metrics.gauge('audio_played', lambda: self.audio.played if self.audio else 0)
+        metrics.gauge('audio_dropped', lambda: self.audio.dropped if self.audio else 0)
+        metrics.gauge('speech_cache_hits', lambda: self.speech_cache.hits if self.speech_cache else 0)
+        metrics.gauge('speech_cache_misses', lambda: self.speech_cache.misses if self.speech_cache else 0)
+        return metrics
+
+    def start_metrics(self):
+        """Start the metrics file writer and HTTP endpoint"""
+        if not self.metrics.enabled:
             return
-        self.tone_generator.play_tone_blocking(frequency, duration)
+        settings = self.config['metrics']
+        file_path = settings.get('file')
+        if file_path and not os.path.isabs(file_path):
+            file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), file_path)
+        try:
+            self.metrics.start_exporters(file_path, settings.get('file_interval', 10.0),
+                                         settings.get('http_host', '127.0.0.1'), settings.get('http_port', 0))
+        except Exception as e:
+            self.logger.error(f"Failed to start metrics export: {e}")
+        self.metrics_file = file_path
 
-    def play_tone(self, frequency, duration=0.1):
-        """Play a tone in background thread"""
-        if not self.use_tones:
+    def stop_metrics(self):
+        """Stop the exporters and write the file one last time"""
+        if not self.metrics.enabled:
             return
-        threading.Thread(target=lambda: self.play_tone_blocking(frequency, duration), daemon=True).start()
+        self.metrics.stop_exporters()
+        if getattr(self, 'metrics_file', None):
+            try:
+                self.metrics.write_file(self.metrics_file)
+            except Exception as e:
+                self.logger.error(f"Error writing metrics file: {e}")
+
+    def create_journal(self):
+        """Create the transition journal, returns None if it is switched off"""
+        settings = self.config['journal']
+        if not settings.get('enabled'):
+            return None
+        directory = settings.get('directory', 'journal')
+        if not os.path.isabs(directory):
+            directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), directory)
+        return Journal(directory, settings.get('max_bytes', 8 * 1024 * 1024),
+                       settings.get('rotate_interval', 86400), settings.get('flush_interval', 1.0))
+
+    def profiling_enabled(self):
+        """Whether resource sampling and the profile hotkey are on"""
+        return self.profile_forced or self.config['profile'].get('enabled', False)
+
+    def profile_path(self):
+        """Absolute path of the resource sample file"""
+        path = self.config['profile'].get('file') or 'profile.jsonl'
+        if not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+        return path
+
+    def create_profiler(self):
+        """Start resource sampling, returns None if profiling is switched off"""
+        if not self.profiling_enabled():
+            return None
+        settings = self.config['profile']
+        sampler = profiler.ResourceProfiler(self.profile_path(), settings.get('interval', 60.0),
+                                            settings.get('top', 10), settings.get('max_bytes', 1024 * 1024))
+        try:
+            sampler.start()
+        except Exception as e:
+            self.logger.error(f"Failed to start profiling: {e}")
+            return None
+        return sampler
+
+    def capture_profile(self):
+        """Take a CPU profile of the running program on a thread of its own, from the hotkey or SIGUSR1"""
+        threading.Thread(target=self._capture_profile, name='profile-capture', daemon=True).start()
 
-    def play_chord_blocking(self, frequencies, duration=0.15):
-        """Play multiple frequencies"""
-        if not self.use_tones or not self.tone_generator:
+    def _capture_profile(self):
+        """Run one capture and say when it is saved"""
+        seconds = self.config['profile'].get('capture_seconds', 10.0)
+        try:
+            self.say(f"Profiling for {seconds:g} seconds")
+            paths = profiler.capture(self.loop, os.path.dirname(self.profile_path()), seconds)
+            if paths is None:
+                self.say("Already profiling")
+                return
+            self.say("Profile saved")
+        except Exception as e:
+            self.logger.error(f"Error capturing profile: {e}")
+            self.play_earcon('error')
+
+    def create_speech_cache(self):
+        """Start the speech cache and its audio output, returns (None, None) if it is off or unavailable"""
+        settings = self.config['speech_cache']
+        if not settings.get('enabled'):
+            return None, None
+        directory = settings.get('directory') or 'speech_cache'
+        if not os.path.isabs(directory):
+            directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), directory)
+        
+        backend_name = self.config.get('audio_backend', 'auto')
+        wav_path = self.config.get('audio_wav_path') or 'tones.wav'
+        try:
+            backend = create_audio_backend(backend_name, wav_path=f"{os.path.splitext(wav_path)[0]}-speech.wav")
+        except Exception as e:
+            self.logger.error(f"Failed to open audio backend for cached speech, speaking live: {e}")
+            return None, None
+        try:
+            engine = speech_cache.create_engine(settings.get('engine', 'pyttsx3'), settings.get('voice', ''),
+                                                settings.get('rate', 0), backend.sample_rate)
+        except Exception as e:
+            self.logger.error(f"Failed to load the speech engine, speaking live: {e}")
+            backend.close()
+            return None, None
+        
+        cache = speech_cache.SpeechCache(directory, engine, settings.get('max_bytes', 64 * 1024 * 1024),
+                                         settings.get('memory_bytes', 32 * 1024 * 1024))
+        return cache, AudioScheduler(backend, self.config.get('audio_queue_size', 8), self.metrics)
+
+    def close_speech_cache(self, cache, audio):
+        """Stop a speech cache and its audio output"""
+        if cache:
+            cache.close()
+        if audio:
+            audio.close()
+
+    def prerender_speech(self, instance=None):
+        """Queue "<name> shown" and "<name> hidden" of every source an instance knows, every instance by default"""
+        cache, speech_queue = self.speech_cache, self.speech_queue
+        if not cache or not speech_queue:
             return
-        self.tone_generator.play_chord_blocking(frequencies, duration)
+        for instance in [instance] if instance else self.instances:
+            names = self.source_profiles.spoken(list(instance.scene_graph.slots.name_masks))
+            cache.prerender([
+                speech_queue.format_sources(state, [name], instance.label) for name in names for state in ('shown', 'hidden')
+            ])
+
+    def create_source_profiles(self):
+        """Compile the source rules, a rule with a mistake is logged and skipped"""
+        rules = self.config.get('source_rules', [])
+        for problem in SourceProfiles.check(rules):
+            self.logger.error(f"Ignoring source rule: {problem}")
+        return SourceProfiles(rules if isinstance(rules, list) else [], self.config.get('only_listed_sources', False))
+
+    def create_watchers(self):
+        """(watcher class, settings) of every watcher switched on in the config, each instance creates its own"""
+        watchers = []
+        for name, settings in self.config['watchers'].items():
+            if name not in WATCHERS:
+                self.logger.error(f"Unknown watcher '{name}' in config")
+            elif settings.get('enabled'):
+                watchers.append((WATCHERS[name], settings))
+        return watchers
+
+    def create_audio(self):
+        """Create the audio scheduler and pre-render all earcons, returns None if audio is unavailable"""
+        try:
+            backend = create_audio_backend(
+                self.config.get('audio_backend', 'auto'),
+                wav_path=self.config.get('audio_wav_path')
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to open audio backend, tones disabled: {e}")
+            return None
+        
+        audio = AudioScheduler(backend, self.config.get('audio_queue_size', 8), self.metrics)
+        self.render_earcons(audio)
+        return audio
+
+    def render_earcons(self, audio):
+        """Render every configured tone to PCM once"""
+        tones = self.config['tones']
+        durations = self.config['tone_durations']
+        synth = ToneSynth(self.volume, audio.backend.sample_rate)
+        
+        audio.register('startup', synth.sequence(tones['startup'], durations['startup']))
+        audio.register('connected', synth.chord(tones['connected'], durations['connected']))
+        audio.register('error', synth.sequence(tones['error'], [durations['error']] * 2))
+        audio.register('connection_lost', synth.sequence(
+            tones['connection_lost'], [durations['connection_lost']] * len(tones['connection_lost']), [0.03, 0.03]
+        ))
+        audio.register('exit', synth.chord(tones['exit'], durations['exit']))
+        audio.register('source_shown', synth.tone(tones['source_shown'], durations['source']))
+        audio.register('source_hidden', synth.tone(tones['source_hidden'], durations['source']))
+        audio.register('source_flapping', synth.sequence(
+            [tones['source_flapping']] * 2, [durations['source']] * 2, [0.03]
+        ))
+        audio.register('output_started', synth.sequence(tones['output_started'], [durations['output']] * len(tones['output_started'])))
+        audio.register('output_stopped', synth.sequence(tones['output_stopped'], [durations['output']] * len(tones['output_stopped'])))
+        audio.register('input_muted', synth.tone(tones['input_muted'], durations['input']))
+        audio.register('input_unmuted', synth.tone(tones['input_unmuted'], durations['input']))
+        audio.register('level_alert', synth.sequence(tones['level_alert'], [durations['input']] * len(tones['level_alert'])))
+        audio.register('level_ok', synth.sequence(tones['level_ok'], [durations['input']] * len(tones['level_ok'])))
+        audio.register('preview', synth.sequence(tones['preview'], [durations['source']] * len(tones['preview'])))
+        for earcon, tone in self.source_profiles.tones.items():
+            if isinstance(tone, list):
+                audio.register(earcon, synth.sequence(tone, [durations['source']] * len(tone)))
+            else:
+                audio.register(earcon, synth.tone(tone, durations['source']))
 
-    def play_sequence_blocking(self, frequencies, durations, gaps=None):
-        """Play a sequence of tones with gaps"""
-        if not self.use_tones or not self.tone_generator:
+    def play_earcon(self, name, wait=False):
+        """Play a pre-rendered earcon, optionally blocking until it has been played"""
+        if not self.use_tones or not self.audio:
             return
-        self.tone_generator.play_sequence_blocking(frequencies, durations, gaps)
+        self.audio.play(name, wait)
 
-    def play_system_sound(self, sound_type: str):
-        """Play system notification sounds based on configuration"""
+    def play_system_sound(self, sound_type: str, instance_label=None, wait=True):
+        """Play system notification sounds based on configuration, wait=False only queues the earcon"""
         try:
-            tones = self.config['tones']
-            durations = self.config['tone_durations']
-            
             if sound_type == "startup":
                 if self.use_speech:
-                    self.speak("OBS Monitor started")
-                if self.use_tones:
-                    freqs = tones['startup']
-                    durs = durations['startup']
-                    self.play_sequence_blocking(freqs, durs)
+                    self.say("OBS Monitor started")
+                self.play_earcon('startup', wait=wait)
                 
             elif sound_type == "connected":
                 if self.use_speech:
-                    self.speak("Connected to OBS")
-                if self.use_tones:
-                    freqs = tones['connected']
-                    dur = durations['connected']
-                    self.play_chord_blocking(freqs, dur)
+                    self.say(self.labelled("Connected to OBS", instance_label))
+                self.play_earcon('connected', wait=wait)
                 
             elif sound_type == "failed" or sound_type == "failed_blocking":
                 if self.use_speech:
-                    self.speak("Failed to connect to OBS")
-                if self.use_tones:
-                    freqs = tones['error']
-                    dur = durations['error']
-                    self.play_sequence_blocking(freqs, [dur, dur])
+                    self.say(self.labelled("Failed to connect to OBS", instance_label))
+                self.play_earcon('error', wait=wait)
                 
             elif sound_type == "connection_lost":
                 if self.use_speech:
-                    self.speak("Connection lost")
-                if self.use_tones:
-                    freqs = tones['connection_lost']
-                    dur = durations['connection_lost']
-                    gaps = [0.03, 0.03]
-                    self.play_sequence_blocking(freqs, [dur] * len(freqs), gaps)
+                    self.say(self.labelled("Connection lost", instance_label))
+                self.play_earcon('connection_lost', wait=wait)
                 
             elif sound_type == "exit":
                 if self.use_speech:
-                    self.speak("OBS Monitor exiting")
-                if self.use_tones:
-                    freqs = tones['exit']
-                    dur = durations['exit']
-                    self.play_chord_blocking(freqs, dur)
+                    self.say("OBS Monitor exiting", wait=True)
+                self.play_earcon('exit', wait=True)
                 
         except Exception as e:
             self.logger.error(f"Error playing system sound '{sound_type}': {e}")
 
-    def play_source_sound(self, sound_type: str, source_names=None):
-        """Play quick tones and speech for source changes with source names"""
-        try:
-            tones = self.config['tones']
-            dur = self.config['tone_durations']['source']
-            
-            if sound_type == "shown":
-                if self.use_speech and source_names:
-                    # Announce each source name
-                    for source_name in source_names:
-                        message = f"{source_name} shown"
-                        self.speak_threaded(message)
-                if self.use_tones:
-                    self.play_tone(tones['source_shown'], dur)
-                    
-            elif sound_type == "hidden":
-                if self.use_speech and source_names:
-                    # Announce each source name
-                    for source_name in source_names:
-                        message = f"{source_name} hidden"
-                        self.speak_threaded(message)
-                if self.use_tones:
-                    self.play_tone(tones['source_hidden'], dur)
+    def labelled(self, text, instance_label=None):
+        """Prefix spoken text with the OBS instance it belongs to"""
+        return f"{instance_label}: {text}" if instance_label else text
+
+    def play_source_sound(self, sound_type: str, source_names=None, instance_label=None):
+        """Play quick tones and speech for source changes, each source as its profile says"""
+        try:
+            if sound_type not in SourceProfiles.EARCONS:
+                return
+            if not source_names:
+                self.play_earcon(SourceProfiles.EARCONS[sound_type])
+                return
+            
+            earcons = []
+            spoken = []
+            for source_name in source_names:
+                profile = self.source_profiles.get(source_name)
+                if profile is None:
+                    continue
+                if profile.earcons[sound_type] not in earcons:
+                    earcons.append(profile.earcons[sound_type])
+                if profile.speech:
+                    spoken.append(profile.label or source_name)
+            
+            if self.use_speech and spoken and self.speech_queue:
+                self.speech_queue.announce_sources(sound_type, spoken, instance_label)
+            for earcon in earcons:
+                self.play_earcon(earcon)
                 
         except Exception as e:
             self.logger.error(f"Error playing source sound '{sound_type}': {e}")
 
+    def play_watch_sound(self, kind, state, subject, earcon, instance_label=None):
+        """Announce a change seen by a watcher through the same tone and speech path as sources"""
+        try:
+            if self.use_speech and self.speech_queue:
+                self.speech_queue.announce_sources(state, [subject], instance_label, kind)
+            self.play_earcon(earcon)
+            
+        except Exception as e:
+            self.logger.error(f"Error announcing {kind} {state}: {e}")
+
+    def play_preview_diff(self, added, removed, instance_label=None):
+        """Announce how the preview scene differs from program"""
+        try:
+            if self.use_speech and self.speech_queue:
+                changes = [
+                    self.speech_queue.format_sources(state, source_names)
+                    for state, source_names in (("added", self.source_profiles.spoken(added)),
+                                                ("removed", self.source_profiles.spoken(removed))) if source_names
+                ]
+                text = f"Preview differs from program, {'; '.join(changes)}" if changes else "Preview matches program"
+                self.say(self.labelled(text, instance_label))
+            self.play_earcon('preview')
+            
+        except Exception as e:
+            self.logger.error(f"Error announcing the preview scene: {e}")
+
+    def play_catch_up(self, newly_shown, newly_hidden, instance_label=None):
+        """Announce everything that changed while disconnected as one notification"""
+        try:
+            if self.use_speech and self.speech_queue:
+                changes = [
+                    self.speech_queue.format_sources(state, source_names)
+                    for state, source_names in (("shown", self.source_profiles.spoken(newly_shown)),
+                                                ("hidden", self.source_profiles.spoken(newly_hidden))) if source_names
+                ]
+                if changes:
+                    self.say(self.labelled(f"While disconnected, {'; '.join(changes)}", instance_label))
+            self.play_earcon('source_shown' if newly_shown else 'source_hidden')
+            
+        except Exception as e:
+            self.logger.error(f"Error announcing changes made while disconnected: {e}")
+
     def setup_hotkey(self):
         """Setup global hotkey for exit with fallback"""
         try:
-            keyboard.add_hotkey(self.config['hotkey'], self.trigger_exit)
+            import keyboard  # Imported here so it stays off the import path of headless runs
+        except Exception as e:
+            self.logger.error(f"Failed to setup hotkeys: {e}")
+            return
+        
+        if self.hotkey_handle is not None:
+            try:
+                keyboard.remove_hotkey(self.hotkey_handle)
+            except Exception as e:
+                self.logger.error(f"Failed to remove the previous hotkey: {e}")
+            self.hotkey_handle = None
+        
+        try:
+            self.hotkey_handle = keyboard.add_hotkey(self.config['hotkey'], self.trigger_exit)
         except Exception as e:
             try:
-                keyboard.add_hotkey(self.config['fallback_hotkey'], self.trigger_exit)
+                self.hotkey_handle = keyboard.add_hotkey(self.config['fallback_hotkey'], self.trigger_exit)
             except Exception as e2:
                 self.logger.error(f"Failed to setup hotkeys: {e}, {e2}")
+        
+        if self.profile_hotkey_handle is not None:
+            try:
+                keyboard.remove_hotkey(self.profile_hotkey_handle)
+            except Exception as e:
+                self.logger.error(f"Failed to remove the previous profile hotkey: {e}")
+            self.profile_hotkey_handle = None
+        
+        if self.profiling_enabled() and self.config['profile'].get('hotkey'):
+            try:
+                self.profile_hotkey_handle = keyboard.add_hotkey(self.config['profile']['hotkey'], self.capture_profile)
+            except Exception as e:
+                self.logger.error(f"Failed to setup the profile hotkey: {e}")
 
     def trigger_exit(self):
-        """Triggered by hotkey - signals exit"""
-        self.should_exit = True
+        """Triggered by the hotkey or a signal - wakes the main thread and abandons a startup still connecting"""
+        self.should_exit.set()
+        starting = self.starting
+        if starting and not starting.done():
+            starting.cancel()
+
+    def all_connections_lost(self):
+        """Every instance stopped for good - the main thread exits with an error"""
+        self.connection_lost.set()
+        self.should_exit.set()
+
+    def install_signal_handlers(self):
+        """Make SIGINT and SIGTERM (and SIGBREAK on Windows) exit the same way as the hotkey"""
+        for name in ('SIGINT', 'SIGTERM', 'SIGBREAK'):
+            signum = getattr(signal, name, None)
+            if signum is None:
+                continue
+            try:
+                signal.signal(signum, lambda signum, frame: self.trigger_exit())
+            except (ValueError, OSError) as e:
+                self.logger.error(f"Failed to handle {name}: {e}")
+        
+        # SIGUSR1 takes a CPU profile, for when the hotkey cannot be reached, like on a headless machine
+        if hasattr(signal, 'SIGUSR1'):
+            try:
+                signal.signal(signal.SIGUSR1, lambda signum, frame: self.capture_profile())
+            except (ValueError, OSError) as e:
+                self.logger.error(f"Failed to handle SIGUSR1: {e}")
+
+    def wait_for_exit(self):
+        """Block the main thread until something asks the program to exit"""
+        # On Windows a wait without a timeout cannot be interrupted by Ctrl+C, so the main
+        # thread wakes once a second there to let the signal handler run
+        timeout = 1.0 if sys.platform == 'win32' else None
+        while not self.should_exit.wait(timeout):
+            pass
 
     def play_exit_tone(self):
         """Play exit tone and mark as played"""
@@ -544,217 +2471,165 @@ class OBSSourceMonitor:
     def exit_program(self):
         """Exit the program gracefully"""
         self.play_exit_tone()
-        time.sleep(0.4)
         self.stop_monitoring()
 
-    def is_connection_alive(self):
-        """Check if the WebSocket connection is still alive"""
-        try:
-            if not self.ws:
-                return False
-            self.ws.get_version()
-            return True
-        except Exception:
-            return False
-
-    def connect_to_obs(self):
-        """Connect to OBS WebSocket"""
-        try:
-            self.ws = obs.ReqClient(host=self.host, port=self.port, password=self.password)
-            if self.is_connection_alive():
-                return True
-            else:
-                self.ws = None
-                return False
-        except Exception as e:
-            self.logger.error(f"Failed to connect to OBS: {e}")
-            self.ws = None
-            return False
+    def create_instances(self):
+        """Build one OBSInstance per configured host"""
+        return [OBSInstance(self, *target) for target in self.instance_targets()]
 
-    def connect_to_obs_with_retry(self, max_retries=3, retry_delay=2.0, play_sounds=True):
-        """Connect with retry logic and exponential backoff"""
-        for attempt in range(max_retries):
-            try:
-                if self.connect_to_obs():
-                    if play_sounds:  # Play sound on every successful connection
-                        self.play_system_sound("connected")
-                    self.consecutive_errors = 0
-                    return True
-                
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                    retry_delay *= 1.5  # Exponential backoff
-                    
-            except Exception as e:
-                self.logger.error(f"Connection attempt {attempt + 1} failed: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                    retry_delay *= 1.5
+    def instance_targets(self):
+        """(label, host, port, password) per configured host, or a single unlabelled one from host/port/password"""
+        targets = self.config.get('instances') or []
+        if not targets:
+            return [(None, self.host, self.port, self.password)]
         
-        if play_sounds:
-            self.play_system_sound("failed_blocking")
-        return False
+        instances = []
+        for target in targets:
+            host = target.get('host', 'localhost')
+            port = target.get('port', 4455)
+            label = target.get('label') or f"{host}:{port}"
+            instances.append((label, host, port, target.get('password', '')))
+        return instances
 
-    def disconnect_from_obs(self):
-        """Disconnect from OBS WebSocket"""
-        if self.ws:
-            try:
-                self.ws.disconnect()
-            except:
-                pass
-            finally:
-                self.ws = None
+    def instance_stopped(self, instance):
+        """Called when an instance stops monitoring - the program gives up once none are left"""
+        if instance in self.active_instances:
+            self.active_instances.remove(instance)
+        if not self.active_instances and self.monitoring.is_set():
+            self.all_connections_lost()
 
-    def handle_connection_loss(self):
-        """Handle connection loss with reconnection attempt"""
-        if self.connection_lost:  # Prevent multiple calls
-            return False
-            
-        self.connection_lost = True
-        self.play_system_sound("connection_lost")
-        
-        # Try to reconnect after a delay
-        time.sleep(2.0)
-        if not self.should_exit:
-            if self.connect_to_obs_with_retry(max_retries=2, play_sounds=True):
-                self.connection_lost = False
-                self.consecutive_errors = 0
-                return True
-        return False
+    async def _start_instances(self):
+        """Connect every instance concurrently and start monitoring the ones that connected"""
+        results = await asyncio.gather(*(instance.start() for instance in self.instances))
+        self.active_instances = [instance for instance, ok in zip(self.instances, results) if ok]
+        for instance in self.active_instances:
+            instance.task = asyncio.create_task(instance.run())
+        return bool(self.active_instances)
 
-    def get_visible_sources(self) -> Set[str]:
-        """Get all currently visible sources"""
-        visible_sources = set()
-        
-        try:
-            current_scene_response = self.ws.get_current_program_scene()
-            current_scene = current_scene_response.current_program_scene_name
-            
-            scene_items_response = self.ws.get_scene_item_list(current_scene)
-            scene_items = scene_items_response.scene_items
-            
-            for item in scene_items:
-                try:
-                    item_enabled_response = self.ws.get_scene_item_enabled(
-                        current_scene, item['sceneItemId']
-                    )
-                    
-                    if item_enabled_response.scene_item_enabled:
-                        visible_sources.add(item['sourceName'])
-                except Exception:
-                    continue
-            
-            self.consecutive_errors = 0
-            
-        except Exception as e:
-            self.logger.error(f"Error getting visible sources: {e}")
-            raise
-        
-        return visible_sources
+    async def _stop_instances(self, instances=None):
+        """Cancel the instance tasks, all of them by default, and close their connections"""
+        if instances is None:
+            self.stop_config_watch()
+            await self.stop_state_server()
+            instances = self.instances
+        tasks = [instance.task for instance in instances if instance.task and not instance.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for instance in instances:
+            await instance.disconnect_from_obs()
+            instance.save_state(flush=False)
 
-    def monitor_sources(self):
-        """Enhanced monitoring loop with connection loss detection and recovery"""
-        try:
-            self.currently_visible_sources = self.get_visible_sources()
-            
-            while self.monitoring and not self.should_exit:
-                try:
-                    # Periodic connection health check
-                    self._health_check_counter += 1
-                    if self._health_check_counter % 30 == 0:
-                        if not self.is_connection_alive():
-                            if self.handle_connection_loss():
-                                # Successfully reconnected, continue monitoring
-                                continue
-                            else:
-                                # Failed to reconnect, exit monitoring
-                                break
-                    
-                    new_visible_sources = self.get_visible_sources()
-                    
-                    # Check for changes
-                    newly_shown = new_visible_sources - self.currently_visible_sources
-                    newly_hidden = self.currently_visible_sources - new_visible_sources
-                    
-                    if newly_shown:
-                        self.play_source_sound("shown", list(newly_shown))
-                    
-                    if newly_hidden:
-                        self.play_source_sound("hidden", list(newly_hidden))
-                    
-                    self.currently_visible_sources = new_visible_sources
-                    self.consecutive_errors = 0
-                    
-                    time.sleep(self.poll_interval)
-                    
-                except Exception as e:
-                    self.consecutive_errors += 1
-                    self.logger.error(f"Error in monitoring (attempt {self.consecutive_errors}): {e}")
-                    
-                    if self.consecutive_errors >= self.max_consecutive_errors:
-                        if self.handle_connection_loss():
-                            # Successfully reconnected, reset and continue
-                            continue
-                        else:
-                            # Failed to reconnect, exit monitoring
-                            break
-                    
-                    # Exponential backoff for errors
-                    error_delay = min(0.5 * (2 ** (self.consecutive_errors - 1)), 5.0)
-                    time.sleep(error_delay)
-                    
-        except Exception as e:
-            self.logger.error(f"Fatal error in monitor_sources: {e}")
-            # Don't call handle_connection_loss here to avoid duplicate sounds
-            self.connection_lost = True
+    def startup(self):
+        """Play the startup sound, register the hotkey and connect all at once, returns False if no instance connected"""
+        self.play_system_sound("startup", wait=False)
+        connecting = self.begin_monitoring()
+        self.setup_hotkey()
+        return self.finish_starting(connecting)
 
     def start_monitoring(self):
-        """Start monitoring with retry logic"""
-        if not self.connect_to_obs_with_retry():
-            return False
+        """Start the event loop thread and connect every instance, returns False if none could connect"""
+        return self.finish_starting(self.begin_monitoring())
+
+    def begin_monitoring(self):
+        """Start the event loop thread and begin connecting, returns a future for the result"""
+        self.monitoring.set()
+        self.connection_lost.clear()
+        self.start_metrics()
         
-        self.monitoring = True
-        self.connection_lost = False
-        self.consecutive_errors = 0
-        self._health_check_counter = 0
-        self.monitor_thread = threading.Thread(target=self.monitor_sources, daemon=True)
+        self.loop = asyncio.new_event_loop()
+        self.monitor_thread = threading.Thread(target=self.loop.run_forever, daemon=True)
         self.monitor_thread.start()
-        return True
+        self.loop.call_soon_threadsafe(self.start_config_watch)
+        asyncio.run_coroutine_threadsafe(self.start_state_server(), self.loop)
+        
+        self.starting = asyncio.run_coroutine_threadsafe(self._start_instances(), self.loop)
+        return self.starting
+
+    def finish_starting(self, connecting):
+        """Wait for the instances to connect, returns False if none did or exit was asked for meanwhile"""
+        try:
+            started = connecting.result()
+        except concurrent.futures.CancelledError:
+            started = False
+        self.starting = None
+        if not started:
+            self.monitoring.clear()
+        return started
 
     def stop_monitoring(self):
         """Stop monitoring with proper cleanup"""
-        self.monitoring = False
-        self.should_exit = True
+        self.monitoring.clear()
+        self.should_exit.set()
+        
+        if self.loop and self.loop.is_running():
+            try:
+                asyncio.run_coroutine_threadsafe(self._stop_instances(), self.loop).result(timeout=2.0)
+            except Exception as e:
+                self.logger.error(f"Error stopping instances: {e}")
+            self.loop.call_soon_threadsafe(self.loop.stop)
         
         # Wait for monitor thread to finish (with timeout)
         if hasattr(self, 'monitor_thread') and self.monitor_thread.is_alive():
             self.monitor_thread.join(timeout=2.0)
         
-        self.disconnect_from_obs()
+        if self.audio:
+            self.audio.close()
+            self.audio = None
+        
+        if self.speech_queue:
+            self.speech_queue.close()
+            self.speech_queue = None
+        
+        self.close_speech_cache(self.speech_cache, self.speech_audio)
+        self.speech_cache = self.speech_audio = None
+        
+        if self.state_store:
+            self.state_store.flush()
+        
+        if self.journal:
+            self.journal.close()
+            self.journal = None
+        
+        self.stop_metrics()
+        
+        if self.profiler:
+            self.profiler.stop()
+            self.profiler = None
+        
+        self.stop_logging()
 
 def main():
     """Main function with improved error handling and reconnection logic"""
+    import argparse
+    parser = argparse.ArgumentParser(description="Announce OBS source visibility changes")
+    parser.add_argument('--profile', action='store_true',
+                        help="Sample memory, threads and GC into the profile file, and take CPU profiles on the hotkey or SIGUSR1")
+    args = parser.parse_args()
+    
     monitor = None
     try:
-        monitor = OBSSourceMonitor()
-        monitor.play_system_sound("startup")
-        monitor.setup_hotkey()
+        monitor = OBSSourceMonitor(profile=args.profile)
+        monitor.install_signal_handlers()
         
-        # Initial connection with retries
-        if not monitor.start_monitoring():
+        # Initial connection with retries, while the startup sound plays and the hotkey is registered
+        if not monitor.startup():
+            if monitor.should_exit.is_set():
+                # Asked to exit while still connecting
+                monitor.exit_program()
+                return
             sys.exit(1)
         
         try:
-            # Main monitoring loop
-            while not monitor.should_exit:
-                if monitor.connection_lost:
-                    # Connection was lost and couldn't be restored
-                    # Don't play exit tone here since connection_lost tone was already played
-                    monitor.stop_monitoring()
-                    sys.exit(1)
-                time.sleep(0.1)
+            # Sleeps until the hotkey, a signal or the loss of every instance sets should_exit
+            monitor.wait_for_exit()
+            if monitor.connection_lost.is_set():
+                # Connection was lost and couldn't be restored
+                # Don't play exit tone here since connection_lost tone was already played
+                monitor.stop_monitoring()
+                sys.exit(1)
             
-            # Normal exit (hotkey triggered)
+            # Normal exit (hotkey or signal)
             monitor.exit_program()
             
         except KeyboardInterrupt:
@@ -0,0 +1,210 @@
+"""Client side of the OBS WebSocket v5 protocol, and the errors it raises"""
+import asyncio
+import base64
+import hashlib
+import itertools
+import json
+import time
+from typing import Dict
+
+import websockets
+
+from metrics import NullMetrics
+
+class OBSRequestError(Exception):
+    """Raised when OBS answers a request with a failure status"""
+
+    def __init__(self, request_type, code, comment=None):
+        self.request_type = request_type
+        self.code = code
+        message = f"Request {request_type} returned code {code}"
+        if comment:
+            message += f": {comment}"
+        super().__init__(message)
+
+class OBSIdentifyError(ConnectionError):
+    """Raised when OBS refuses the Identify message, such as for a wrong password or event subscriptions it cannot serve"""
+
+    def __init__(self, message, close_code=None):
+        self.close_code = close_code
+        super().__init__(message)
+
+    @property
+    def refused(self) -> bool:
+        """OBS closed the socket with one of its own close codes, a definite answer rather than a dropped connection"""
+        return self.close_code is not None and 4000 <= self.close_code < 5000
+
+class OBSConnection:
+    """Asyncio client for the OBS WebSocket v5 protocol.
+
+    Requests, request batches and events share one socket. A reader task matches responses to
+    their request by ID and hands events to on_event, on_close is called once the socket is gone.
+    WebSocket pings every heartbeat_interval seconds close a socket whose peer has stopped
+    answering, so a hung OBS or a dead network path is noticed without sending OBS any requests.
+    """
+
+    # eventSubscriptions bits from the obs-websocket protocol
+    SUB_CONFIG = 1 << 1
+    SUB_SCENES = 1 << 2
+    SUB_INPUTS = 1 << 3
+    SUB_OUTPUTS = 1 << 6
+    SUB_SCENE_ITEMS = 1 << 7
+    SUB_UI = 1 << 10
+    SUB_INPUT_VOLUME_METERS = 1 << 16  # High volume, every input's levels every 50 ms
+
+    def __init__(self, host, port, password='', event_subscriptions=0,
+                 on_event=None, on_close=None, request_timeout=5.0, metrics=None, metric_labels=None,
+                 heartbeat_interval=1.0, heartbeat_timeout=1.0):
+        self.host = host
+        self.port = port
+        self.password = password
+        self.event_subscriptions = event_subscriptions
+        self.on_event = on_event
+        self.on_close = on_close
+        self.request_timeout = request_timeout
+        self.metrics = metrics or NullMetrics()
+        self.metric_labels = metric_labels or {}
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.last_received = 0.0  # perf_counter of the last message from OBS
+        self.websocket = None
+        self._request_ids = itertools.count(1)
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._reader_task = None
+
+    @property
+    def connected(self):
+        """True while the reader task is still receiving"""
+        return self._reader_task is not None and not self._reader_task.done()
+
+    async def connect(self, timeout=5.0):
+        """Open the socket and run the Hello/Identify handshake"""
+        self.websocket = await websockets.connect(
+            f"ws://{self.host}:{self.port}", open_timeout=timeout, max_size=None,
+            ping_interval=self.heartbeat_interval or None, ping_timeout=self.heartbeat_timeout or None,
+            close_timeout=self.heartbeat_timeout or timeout  # A peer that missed a pong will not answer a close either
+        )
+        try:
+            hello = json.loads(await asyncio.wait_for(self.websocket.recv(), timeout))
+            identify = {'rpcVersion': 1, 'eventSubscriptions': self.event_subscriptions}
+
+            authentication = hello['d'].get('authentication')
+            if authentication:
+                if not self.password:
+                    raise ConnectionError("Authentication enabled but no password provided")
+                secret = base64.b64encode(hashlib.sha256(
+                    (self.password + authentication['salt']).encode()
+                ).digest())
+                identify['authentication'] = base64.b64encode(hashlib.sha256(
+                    secret + authentication['challenge'].encode()
+                ).digest()).decode()
+
+            await self.websocket.send(json.dumps({'op': 1, 'd': identify}))
+            try:
+                identified = json.loads(await asyncio.wait_for(self.websocket.recv(), timeout))
+            except websockets.ConnectionClosed as e:
+                raise OBSIdentifyError(f"OBS closed the connection after Identify: {e}", e.rcvd.code if e.rcvd else None) from None
+            if identified.get('op') != 2:
+                raise OBSIdentifyError("Failed to identify with OBS, check the connection settings")
+        except BaseException:
+            await self.websocket.close()
+            raise
+
+        self.last_received = time.perf_counter()
+        self._reader_task = asyncio.create_task(self._read_messages())
+
+    async def reidentify(self, event_subscriptions):
+        """Change the event subscriptions of the open session (Reidentify, op 3) without reconnecting"""
+        self.event_subscriptions = event_subscriptions
+        if self.connected:
+            await self.websocket.send(json.dumps({'op': 3, 'd': {'eventSubscriptions': event_subscriptions}}))
+
+    def idle_time(self):
+        """Seconds since the last message from OBS"""
+        return time.perf_counter() - self.last_received
+
+    async def ping(self, timeout=None):
+        """Check the socket with a WebSocket ping, which OBS answers without handling a request"""
+        if not self.connected:
+            return False
+        try:
+            pong = await self.websocket.ping()
+            await asyncio.wait_for(pong, timeout or self.heartbeat_timeout or self.request_timeout)
+            self.last_received = time.perf_counter()
+            return True
+        except Exception:
+            return False
+
+    async def close(self):
+        """Close the socket and wait for the reader task to finish"""
+        if self.websocket:
+            await self.websocket.close()
+        if self._reader_task:
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+
+    async def request(self, request_type, request_data=None):
+        """Send one request and return its responseData"""
+        payload = {'requestType': request_type, 'requestId': str(next(self._request_ids))}
+        if request_data:
+            payload['requestData'] = request_data
+        response = await self._send(6, payload)
+
+        status = response['requestStatus']
+        if not status['result']:
+            raise OBSRequestError(request_type, status['code'], status.get('comment'))
+        return response.get('responseData', {})
+
+    async def request_batch(self, requests, halt_on_failure=False):
+        """Send several requests in one RequestBatch (op 8) and return their results in order"""
+        response = await self._send(8, {
+            'requestId': str(next(self._request_ids)),
+            'haltOnFailure': halt_on_failure,
+            'executionType': 0,  # OBS_WEBSOCKET_REQUEST_BATCH_EXECUTION_TYPE_SERIAL_REALTIME
+            'requests': [
+                {'requestType': request_type, 'requestData': request_data}
+                if request_data else {'requestType': request_type}
+                for request_type, request_data in requests
+            ]
+        })
+        return response['results']
+
+    async def _send(self, op, payload):
+        """Send a message and wait for the response carrying the same request ID"""
+        if not self.connected:
+            raise ConnectionError("Not connected to OBS")
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[payload['requestId']] = future
+        started = time.perf_counter()
+        try:
+            await self.websocket.send(json.dumps({'op': op, 'd': payload}))
+            response = await asyncio.wait_for(future, self.request_timeout)
+            self.metrics.observe('obs_request_rtt_seconds', time.perf_counter() - started,
+                                 kind='batch' if op == 8 else 'single', **self.metric_labels)
+            return response
+        finally:
+            self._pending.pop(payload['requestId'], None)
+
+    async def _read_messages(self):
+        """Dispatch responses and events until the socket closes"""
+        try:
+            async for message in self.websocket:
+                self.last_received = time.perf_counter()
+                message = json.loads(message)
+                op = message.get('op')
+                data = message.get('d', {})
+
+                if op in (7, 9):
+                    future = self._pending.get(data.get('requestId'))
+                    if future and not future.done():
+                        future.set_result(data)
+                elif op == 5 and self.on_event:
+                    self.on_event(data.get('eventType'), data.get('eventData') or {})
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Connection to OBS closed"))
+            if self.on_close:
+                self.on_close()
@@ -0,0 +1,65 @@
+"""Timing of the polling loop"""
+
+class PollScheduler:
+    """Timing for the polling loop - poll period, health checks and error backoff in one place.
+
+    The period drops to min_interval as soon as a poll sees a change and grows by `growth` after
+    every quiet poll, up to max_interval. It is never shorter than rtt_factor times the smoothed
+    poll round trip, so a slow or busy OBS is asked less often. The wait is counted from the end
+    of the previous poll, so two polls never overlap.
+    """
+
+    def __init__(self, min_interval=0.1, max_interval=1.0, growth=1.25, rtt_factor=4.0,
+                 health_interval=3.0, max_error_delay=5.0):
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.growth = growth
+        self.rtt_factor = rtt_factor
+        self.health_interval = health_interval
+        self.max_error_delay = max_error_delay
+        self.interval = min_interval
+        self.rtt = 0.0
+        self.last_ok = 0.0
+
+    def configure(self, min_interval, max_interval, health_interval):
+        """Take new limits from a reloaded config, starting over at the fastest rate"""
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.health_interval = health_interval
+        self.interval = min_interval
+
+    def reset(self, now):
+        """Start over at the fastest rate, after connecting or reconnecting"""
+        self.interval = self.min_interval
+        self.rtt = 0.0
+        self.last_ok = now
+
+    def period(self):
+        """Current time between the start of one poll and the next"""
+        return max(self.interval, self.rtt * self.rtt_factor)
+
+    def poll_succeeded(self, changed, rtt, now):
+        """Record a finished poll, returns how long to wait before the next one"""
+        self.last_ok = now
+        self.rtt = rtt if not self.rtt else self.rtt * 0.8 + rtt * 0.2
+        if changed:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.max_interval, self.interval * self.growth)
+        return self.until_next(max(0.0, self.period() - rtt), now)
+
+    def health_check_due(self, now):
+        """A successful poll proves the connection, so a check is only due after a quiet stretch"""
+        return now - self.last_ok >= self.health_interval
+
+    def health_checked(self, now):
+        self.last_ok = now
+
+    def until_next(self, delay, now):
+        """Shorten a wait so it ends in time for the next health check"""
+        return max(0.0, min(delay, self.last_ok + self.health_interval - now))
+
+    def error_delay(self, consecutive_errors):
+        """Exponential backoff after failed polls"""
+        self.interval = self.min_interval
+        return min(0.5 * (2 ** (consecutive_errors - 1)), self.max_error_delay)
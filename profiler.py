@@ -0,0 +1,209 @@
+"""Long-run resource sampling and on-demand CPU profiles, for finding leaks and hot spots during a show.
+
+With profiling on, a background thread appends one JSON line to a rolling file every `interval`
+seconds:
+
+    {"t": <unix time>, "rss": <bytes>, "threads": <live threads>, "new": [...], "gone": [...],
+     "gc": [<gen0>, <gen1>, <gen2> pending], "collections": [...], "traced": <bytes>, "peak": <bytes>,
+     "top": [["<file>:<line>", <bytes grown>, <blocks grown>], ...]}
+
+"new" and "gone" name the threads that appeared or ended since the previous line, and "top" lists
+the allocation sites that grew the most since then, from tracemalloc. The file moves to <file>.1
+when it passes max_bytes, so a 12 hour show never fills the disk.
+
+capture() profiles for a few seconds without a restart: cProfile on the event loop thread, where
+all OBS traffic and diffing happens, written as a .pstats file, and a stack sampler over every
+thread, written as collapsed stacks ("thread;outer;...;inner count") for flame graph tools:
+
+    python -m pstats profile-20261018-201500.pstats
+"""
+import collections
+import gc
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+def rss_bytes() -> int:
+    """Resident set size of this process, 0 where it cannot be read"""
+    if sys.platform == 'win32':
+        import ctypes
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [('cb', ctypes.c_ulong), ('PageFaultCount', ctypes.c_ulong)] + [
+                (name, ctypes.c_size_t) for name in (
+                    'PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage', 'QuotaPagedPoolUsage',
+                    'QuotaPeakNonPagedPoolUsage', 'QuotaNonPagedPoolUsage', 'PagefileUsage', 'PeakPagefileUsage',
+                )
+            ]
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+        return 0
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        # Peak rather than current where /proc is missing, in bytes on macOS
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except Exception:
+        return 0
+
+class ResourceProfiler:
+    """Samples memory, threads and GC into a rolling JSON lines file from a background thread"""
+
+    def __init__(self, path, interval=60.0, top=10, max_bytes=1024 * 1024):
+        self.path = path
+        self.interval = interval
+        self.top = top
+        self.max_bytes = max_bytes
+        self.logger = logging.getLogger('OBSMonitor')
+
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.threads = set()
+        self.snapshot = None
+        self.started_tracing = False
+
+    def start(self):
+        import tracemalloc  # Only profiling runs pay for it
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+        self.threads = {thread.name for thread in threading.enumerate()}
+        self.thread = threading.Thread(target=self._run, name='resource-profiler', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Write a last sample and stop sampling"""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=5.0)
+        if self.started_tracing:
+            import tracemalloc
+            tracemalloc.stop()
+
+    def _run(self):
+        # The first line right away, as the baseline the rest of the show is compared with
+        while True:
+            try:
+                self._write(self.sample())
+            except Exception as e:
+                self.logger.error(f"Error writing profile sample: {e}")
+            if self.stop_event.wait(self.interval):
+                break
+        try:
+            self._write(self.sample())
+        except Exception as e:
+            self.logger.error(f"Error writing profile sample: {e}")
+
+    def sample(self) -> dict:
+        """One line of the profile file"""
+        import tracemalloc
+        threads = {thread.name for thread in threading.enumerate()}
+        new, gone = sorted(threads - self.threads), sorted(self.threads - threads)
+        self.threads = threads
+
+        sample = {
+            't': round(time.time(), 1),
+            'rss': rss_bytes(),
+            'threads': threading.active_count(),
+            'new': new,
+            'gone': gone,
+            'gc': list(gc.get_count()),
+            'collections': [generation['collections'] for generation in gc.get_stats()],
+        }
+        if tracemalloc.is_tracing():
+            sample['traced'], sample['peak'] = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            ))
+            if self.snapshot is not None:
+                stats = snapshot.compare_to(self.snapshot, 'lineno')
+                grown = sorted((stat for stat in stats if stat.size_diff > 0), key=lambda stat: stat.size_diff, reverse=True)
+                sample['top'] = [
+                    [f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}", stat.size_diff, stat.count_diff]
+                    for stat in grown[:self.top]
+                ]
+            self.snapshot = snapshot
+        return sample
+
+    def _write(self, sample):
+        line = json.dumps(sample, separators=(',', ':')) + '\n'
+        try:
+            if os.path.getsize(self.path) + len(line) > self.max_bytes:
+                os.replace(self.path, self.path + '.1')
+        except FileNotFoundError:
+            pass
+        with open(self.path, 'a') as f:
+            f.write(line)
+
+_capture_lock = threading.Lock()
+
+def capture(loop, directory, seconds=10.0, sample_interval=0.005):
+    """Profile for `seconds` and write the results to `directory`, returns the file paths or None if a capture is running.
+
+    Blocks for the whole capture, so call it from a thread of its own.
+    """
+    if not _capture_lock.acquire(blocking=False):
+        return None
+    try:
+        import cProfile
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"profile-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+
+        # cProfile only sees the thread that enables it, so it is switched on from inside the event loop
+        profile = cProfile.Profile()
+        toggled = threading.Event()
+
+        def toggle(enable):
+            try:
+                profile.enable() if enable else profile.disable()
+            finally:
+                toggled.set()
+
+        loop_profiled = loop is not None and loop.is_running()
+        if loop_profiled:
+            loop.call_soon_threadsafe(toggle, True)
+            loop_profiled = toggled.wait(1.0)
+
+        stacks = collections.Counter()
+        names = {}
+        me = threading.get_ident()
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stacks[(names.get(ident, str(ident)),) + tuple(reversed(stack))] += 1
+            time.sleep(sample_interval)
+
+        paths = []
+        if loop_profiled:
+            toggled.clear()
+            loop.call_soon_threadsafe(toggle, False)
+            toggled.wait(1.0)
+            profile.dump_stats(base + '.pstats')
+            paths.append(base + '.pstats')
+        with open(base + '.txt', 'w') as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{';'.join(stack)} {count}\n")
+        paths.append(base + '.txt')
+        return paths
+    finally:
+        _capture_lock.release()
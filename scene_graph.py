@@ -0,0 +1,466 @@
+"""Cached scene tree of an OBS instance, nested scenes and groups included, with visibility as bitsets"""
+import itertools
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+class SourceSlots:
+    """Interns scene items to small integer slots, so visibility can be kept as a bitset.
+
+    A slot is keyed by (scene name, scene item ID), so a source used in several places gets one slot
+    per use instead of collapsing into one name. `names` maps a slot back to its source name and
+    `name_masks` holds every slot of a source name, so whether a source is visible anywhere is a
+    single AND. Released slots are only reused after clear(), which bumps `generation`, so a slot
+    never changes meaning inside an older bitset.
+    """
+
+    def __init__(self):
+        self.slots: Dict[Tuple[str, int], int] = {}
+        self.names: List[str] = []
+        self.name_masks: Dict[str, int] = {}
+        self.generation = 0
+
+    def clear(self):
+        self.slots.clear()
+        self.names.clear()
+        self.name_masks.clear()
+        self.generation += 1
+
+    def intern(self, scene_name, item_id, source_name) -> int:
+        """Slot of a scene item - an item whose source changed gets a new one so the change shows in the bitset"""
+        key = (scene_name, item_id)
+        slot = self.slots.get(key)
+        if slot is not None and self.names[slot] == source_name:
+            return slot
+        if slot is not None:
+            self._unmask(slot)
+        slot = self.slots[key] = len(self.names)
+        self.names.append(source_name)
+        self.name_masks[source_name] = self.name_masks.get(source_name, 0) | (1 << slot)
+        return slot
+
+    def release(self, scene_name, item_id):
+        """Forget a removed scene item, its name stays readable for diffs against older bitsets"""
+        slot = self.slots.pop((scene_name, item_id), None)
+        if slot is not None:
+            self._unmask(slot)
+
+    def _unmask(self, slot):
+        name = self.names[slot]
+        mask = self.name_masks.get(name, 0) & ~(1 << slot)
+        if mask:
+            self.name_masks[name] = mask
+        else:
+            self.name_masks.pop(name, None)
+
+    def rename_source(self, slot, source_name):
+        """Follow a renamed source without changing its slot"""
+        self._unmask(slot)
+        self.names[slot] = source_name
+        self.name_masks[source_name] = self.name_masks.get(source_name, 0) | (1 << slot)
+
+    def rename_scene(self, old_name, new_name):
+        """Follow a renamed scene, its items keep their slots"""
+        for key in [key for key in self.slots if key[0] == old_name]:
+            self.slots[(new_name, key[1])] = self.slots.pop(key)
+
+    def changed_names(self, changed: int) -> List[str]:
+        """Source names of the slots set in a XOR of two bitsets"""
+        names = []
+        while changed:
+            lowest = changed & -changed
+            name = self.names[lowest.bit_length() - 1]
+            if name not in names:
+                names.append(name)
+            changed ^= lowest
+        return names
+
+class SceneGraph:
+    """Cached index of the scene tree - scenes, nested scenes and groups - with effective visibility.
+
+    Each scene or group is stored once with its items keyed by scene item ID. A reverse index maps every
+    nested scene or group to the items that reference it, so the visibility of a single item is resolved
+    by walking up towards the program scene in O(depth). Changes only invalidate the scene they touch,
+    unchanged scenes are never fetched again while events keep them current. Every item carries its
+    slot in `slots`, and visible_mask() renders the visibility of the whole tree into a bitset. Items
+    whose source is left out by `profiles` get no slot, only their nesting is still followed.
+
+    Scenes outside the program tree stay cached too, so a program or preview switch to a known scene
+    is a lookup. `scenes` is kept in least recently used order and trim() evicts from the front once
+    more than `max_scenes` are cached, never a scene of the program or preview tree.
+    """
+
+    def __init__(self, profiles=None, max_scenes=500):
+        self.root = None
+        self.preview = None  # Studio mode preview scene, None outside studio mode
+        self.profiles = profiles
+        self.max_scenes = max_scenes
+        self.scenes: Dict[str, Dict[int, dict]] = OrderedDict()
+        self.groups: Set[str] = set()
+        self.parents: Dict[str, Set[Tuple[str, int]]] = {}
+        self.stale: Set[str] = set()
+        self.slots = SourceSlots()
+
+        # Reused by visible_mask() so a walk over an unchanged tree allocates nothing but the result
+        self._bits = bytearray()
+        self._zeros = b''
+        self._seen: Set[str] = set()
+        self._stack: List[str] = []
+
+    def clear(self):
+        """Forget everything, used when the scene collection changes"""
+        self.root = None
+        self.preview = None
+        self.scenes.clear()
+        self.groups.clear()
+        self.parents.clear()
+        self.stale.clear()
+        self.slots.clear()
+
+    @staticmethod
+    def child_of(item) -> Optional[Tuple[str, bool]]:
+        """Return (name, is_group) if the item is a nested scene or a group, otherwise None"""
+        if item.get('isGroup'):
+            return item['sourceName'], True
+        if item.get('sourceType') == 'OBS_SOURCE_TYPE_SCENE':
+            return item['sourceName'], False
+        return None
+
+    def set_items(self, scene_name, items, is_group=False):
+        """Store a freshly fetched item list for a scene or group"""
+        self._unlink(scene_name)
+        previous = self.scenes.pop(scene_name, None)
+        self.scenes[scene_name] = {item['sceneItemId']: item for item in items}
+        self.stale.discard(scene_name)
+
+        for item_id, item in self.scenes[scene_name].items():
+            item['slot'] = self._slot(scene_name, item_id, item['sourceName'])
+        if previous:
+            for item_id in previous.keys() - self.scenes[scene_name].keys():
+                self.slots.release(scene_name, item_id)
+        if is_group:
+            self.groups.add(scene_name)
+        else:
+            self.groups.discard(scene_name)
+
+        for item_id, item in self.scenes[scene_name].items():
+            child = self.child_of(item)
+            item['child'] = child[0] if child else None
+            if child:
+                self.parents.setdefault(child[0], set()).add((scene_name, item_id))
+
+    def watched(self, source_name) -> bool:
+        """Whether the source rules let changes of a source through"""
+        return self.profiles is None or self.profiles.get(source_name) is not None
+
+    def _slot(self, scene_name, item_id, source_name) -> Optional[int]:
+        """Slot of a watched scene item, None for one the source rules leave out"""
+        if self.watched(source_name):
+            return self.slots.intern(scene_name, item_id, source_name)
+        self.slots.release(scene_name, item_id)
+        return None
+
+    def set_profiles(self, profiles):
+        """Switch to recompiled source rules, every cached item gets a fresh slot"""
+        self.profiles = profiles
+        self.renumber()
+
+    def renumber(self):
+        """Give every cached item a fresh slot, dropping the ones released since the last clear"""
+        self.slots.clear()
+        for scene_name, items in self.scenes.items():
+            for item_id, item in items.items():
+                item['slot'] = self._slot(scene_name, item_id, item['sourceName'])
+
+    def ignored(self, scene_name, item_id) -> bool:
+        """True for a cached item whose changes matter to nothing - left out and not a nested scene or group"""
+        item = self.scenes.get(scene_name, {}).get(item_id)
+        return item is not None and item['slot'] is None and item['child'] is None
+
+    def _unlink(self, scene_name):
+        """Remove the reverse index entries owned by a scene"""
+        for item_id, item in self.scenes.get(scene_name, {}).items():
+            child = self.child_of(item)
+            if child:
+                refs = self.parents.get(child[0])
+                if refs:
+                    refs.discard((scene_name, item_id))
+                    if not refs:
+                        del self.parents[child[0]]
+
+    def evict(self, scene_name):
+        """Forget one cached scene or group, it is fetched again when it is needed"""
+        items = self.scenes.get(scene_name)
+        if items is None:
+            return
+        self._unlink(scene_name)
+        for item_id in items:
+            self.slots.release(scene_name, item_id)
+        del self.scenes[scene_name]
+        self.groups.discard(scene_name)
+        self.stale.discard(scene_name)
+
+    def trim(self):
+        """Mark the program and preview trees as most recently used and evict the least recently used scenes over max_scenes"""
+        in_use = self.in_use()
+        for name, _ in in_use:
+            if name in self.scenes:
+                self.scenes.move_to_end(name)
+        excess = len(self.scenes) - max(self.max_scenes, len(in_use))
+        if excess > 0:
+            for name in list(itertools.islice(self.scenes, excess)):
+                self.evict(name)
+
+        # Evicted items leave unused slots behind, renumber before they make every bitset much wider
+        if len(self.slots.names) > 2 * len(self.slots.slots) + 64:
+            self.renumber()
+
+    def uncached(self, scene_names) -> List[Tuple[str, bool]]:
+        """(name, is_group) of the listed scenes, and the nested scenes and groups of cached ones, that
+        are not cached or are stale - new ones only while there is room under max_scenes"""
+        candidates = [(name, False) for name in scene_names]
+        candidates += [(name, name in self.groups) for name in self.stale]
+        for child, refs in self.parents.items():
+            parent_name, item_id = next(iter(refs))
+            candidates.append((child, bool(self.scenes[parent_name][item_id].get('isGroup'))))
+
+        found = []
+        seen = set()
+        room = self.max_scenes - len(self.scenes)
+        for name, is_group in candidates:
+            if name in seen:
+                continue
+            seen.add(name)
+            if name in self.stale:
+                found.append((name, is_group))
+            elif name not in self.scenes and room > 0:
+                found.append((name, is_group))
+                room -= 1
+        return found
+
+    def invalidate(self, scene_name):
+        """Mark a scene so that it is fetched again the next time it is needed"""
+        if scene_name in self.scenes:
+            self.stale.add(scene_name)
+
+    def invalidate_all(self):
+        """Mark every cached scene as stale"""
+        self.stale.update(self.scenes)
+
+    def set_enabled(self, scene_name, item_id, enabled) -> bool:
+        """Update one item's enabled state in place, returns False if the item is unknown"""
+        item = self.scenes.get(scene_name, {}).get(item_id)
+        if item is None:
+            return False
+        item['sceneItemEnabled'] = enabled
+        return True
+
+    def remove_item(self, scene_name, item_id):
+        """Drop an item that was removed from a scene"""
+        item = self.scenes.get(scene_name, {}).pop(item_id, None)
+        if item is None:
+            return
+        self.slots.release(scene_name, item_id)
+        child = self.child_of(item)
+        if child:
+            refs = self.parents.get(child[0])
+            if refs:
+                refs.discard((scene_name, item_id))
+                if not refs:
+                    del self.parents[child[0]]
+
+    def rename(self, old_name, new_name):
+        """Follow a scene rename without fetching anything"""
+        if old_name in self.scenes:
+            self.scenes[new_name] = self.scenes.pop(old_name)
+        if old_name in self.groups:
+            self.groups.discard(old_name)
+            self.groups.add(new_name)
+        if old_name in self.stale:
+            self.stale.discard(old_name)
+            self.stale.add(new_name)
+        self.slots.rename_scene(old_name, new_name)
+
+        # Links owned by the renamed scene
+        for refs in self.parents.values():
+            owned = {ref for ref in refs if ref[0] == old_name}
+            if owned:
+                refs -= owned
+                refs.update((new_name, item_id) for _, item_id in owned)
+
+        # Items that reference the renamed scene
+        refs = self.parents.pop(old_name, None)
+        if refs:
+            self.parents[new_name] = refs
+            for parent_name, item_id in refs:
+                item = self.scenes[parent_name][item_id]
+                item['sourceName'] = new_name
+                item['child'] = new_name
+                if item['slot'] is not None and self.watched(new_name):
+                    self.slots.rename_source(item['slot'], new_name)
+                else:
+                    item['slot'] = self._slot(parent_name, item_id, new_name)
+
+        if self.root == old_name:
+            self.root = new_name
+        if self.preview == old_name:
+            self.preview = new_name
+
+    def renamed_children(self, scene_name, items) -> List[Tuple[str, str]]:
+        """(old, new) names of nested scenes and groups that a refetch of a cached scene shows under another
+        name on the same scene item - renames whose SceneNameChanged event has not been handled yet"""
+        cached = self.scenes.get(scene_name)
+        if not cached:
+            return []
+        renamed = []
+        for item in items:
+            previous = cached.get(item['sceneItemId'])
+            child = self.child_of(item)
+            if previous and previous['child'] and child and child[0] != previous['child'] and child[0] not in self.scenes:
+                renamed.append((previous['child'], child[0]))
+        return renamed
+
+    def export(self) -> dict:
+        """Compact copy of the program scene tree, each scene as [scene item ID, source name, enabled, kind] rows"""
+        scenes = {}
+        groups = []
+        for name, is_group in self.reachable():
+            if name not in self.scenes:
+                continue
+            rows = scenes[name] = []
+            for item_id, item in self.scenes[name].items():
+                child = self.child_of(item)
+                kind = 0 if child is None else (2 if child[1] else 1)  # source, nested scene, group
+                rows.append([item_id, item['sourceName'], int(bool(item['sceneItemEnabled'])), kind])
+            if is_group:
+                groups.append(name)
+        return {'root': self.root, 'groups': groups, 'scenes': scenes}
+
+    @classmethod
+    def restore(cls, data, profiles=None) -> 'SceneGraph':
+        """Rebuild a graph from export()"""
+        graph = cls(profiles)
+        graph.root = data.get('root')
+        groups = set(data.get('groups', ()))
+        for name, rows in data.get('scenes', {}).items():
+            graph.set_items(name, [
+                {
+                    'sceneItemId': item_id,
+                    'sourceName': source_name,
+                    'sceneItemEnabled': bool(enabled),
+                    'isGroup': kind == 2,
+                    'sourceType': 'OBS_SOURCE_TYPE_SCENE' if kind == 1 else 'OBS_SOURCE_TYPE_INPUT',
+                }
+                for item_id, source_name, enabled, kind in rows
+            ], name in groups)
+        return graph
+
+    def reachable(self, root=None) -> List[Tuple[str, bool]]:
+        """List (name, is_group) for the program scene, or another root, and every nested scene or group below it"""
+        root = root or self.root
+        if root is None:
+            return []
+        found = [(root, False)]
+        seen = {root}
+        stack = [root]
+        while stack:
+            for item in self.scenes.get(stack.pop(), {}).values():
+                child = self.child_of(item)
+                if child and child[0] not in seen:
+                    seen.add(child[0])
+                    found.append(child)
+                    stack.append(child[0])
+        return found
+
+    def in_use(self) -> List[Tuple[str, bool]]:
+        """Scenes reachable from the program scene, followed by those only reachable from the preview scene"""
+        found = self.reachable()
+        if self.preview is not None and self.preview != self.root:
+            program = {name for name, _ in found}
+            found += [scene for scene in self.reachable(self.preview) if scene[0] not in program]
+        return found
+
+    def missing(self) -> List[Tuple[str, bool]]:
+        """Scenes of the program and preview trees that are not cached or were invalidated"""
+        return [
+            (name, is_group) for name, is_group in self.in_use()
+            if name not in self.scenes or name in self.stale
+        ]
+
+    def scene_visible(self, scene_name, _seen=None) -> bool:
+        """Check whether a scene or group is effectively visible in the program scene"""
+        if scene_name == self.root:
+            return True
+        if _seen is None:
+            _seen = set()
+        _seen.add(scene_name)
+        for parent_name, item_id in self.parents.get(scene_name, ()):
+            if parent_name in _seen:
+                continue
+            if self.scenes[parent_name][item_id]['sceneItemEnabled'] and self.scene_visible(parent_name, _seen):
+                return True
+        return False
+
+    def is_visible(self, scene_name, item_id) -> bool:
+        """An item is visible only if it is enabled and every ancestor up to the program scene is visible"""
+        item = self.scenes.get(scene_name, {}).get(item_id)
+        return bool(item and item['sceneItemEnabled'] and self.scene_visible(scene_name))
+
+    def source_scenes(self) -> Dict[str, str]:
+        """Map every source in the program scene tree to the scene or group it first appears in"""
+        scenes = {}
+        for name, _ in self.reachable():
+            for item in self.scenes.get(name, {}).values():
+                scenes.setdefault(item['sourceName'], name)
+        return scenes
+
+    def visible_mask(self) -> int:
+        """Bitset of the slots of every effectively visible item in the program scene tree"""
+        if self.root is None:
+            return 0
+        size = (len(self.slots.names) + 7) >> 3
+        if len(self._bits) != size:
+            self._bits = bytearray(size)
+            self._zeros = bytes(size)
+        else:
+            self._bits[:] = self._zeros
+        bits = self._bits
+        seen = self._seen
+        stack = self._stack
+        seen.clear()
+        seen.add(self.root)
+        stack.append(self.root)
+        while stack:
+            items = self.scenes.get(stack.pop())
+            if items is None:
+                continue
+            for item in items.values():
+                if not item['sceneItemEnabled']:
+                    continue
+                slot = item['slot']
+                if slot is not None:
+                    bits[slot >> 3] |= 1 << (slot & 7)
+                child = item['child']
+                if child is not None and child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+        return int.from_bytes(bits, 'little')
+
+    def visible_sources(self, root=None) -> Set[str]:
+        """Names of every effectively visible source in the program scene tree, or the tree of another root"""
+        root = root or self.root
+        visible = set()
+        if root is None:
+            return visible
+        seen = {root}
+        stack = [root]
+        while stack:
+            for item in self.scenes.get(stack.pop(), {}).values():
+                if not item['sceneItemEnabled']:
+                    continue
+                if item['slot'] is not None:
+                    visible.add(item['sourceName'])
+                child = self.child_of(item)
+                if child and child[0] not in seen:
+                    seen.add(child[0])
+                    stack.append(child[0])
+        return visible
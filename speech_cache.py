@@ -0,0 +1,296 @@
+"""Pre-rendered speech for source announcements, played from memory instead of through the screen reader.
+
+Source names are a small set that is known after the first snapshot, so "<name> shown" and
+"<name> hidden" are synthesized ahead of time by an offline TTS engine on a background thread. The
+16-bit mono PCM is kept in memory, ready to play, and on disk for the next run, in a least recently
+used cache keyed by the text and the voice settings:
+
+    speech_cache/<sha1 of engine, voice, rate, sample rate and text>.pcm
+
+A phrase that is not rendered yet, such as the name of a source that was just added, is spoken
+live as before and rendered for next time.
+
+Engines: 'pyttsx3' (the system voices, SAPI5 on Windows), 'espeak' (eSpeak NG in a subprocess) and
+'stub', which renders a short tone per word, for benchmarks and testing without a TTS engine.
+"""
+import hashlib
+import io
+import logging
+import math
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import wave
+from array import array
+from collections import OrderedDict, deque
+
+def pcm_from_wav(data, sample_rate) -> bytes:
+    """16-bit mono PCM at sample_rate from the bytes of a WAV file"""
+    with wave.open(io.BytesIO(data), 'rb') as wav:
+        channels, width, rate = wav.getnchannels(), wav.getsampwidth(), wav.getframerate()
+        frames = wav.readframes(wav.getnframes())
+    if width != 2:
+        raise ValueError(f"Unsupported sample width {width * 8} bits")
+
+    samples = array('h', frames)
+    if channels > 1:
+        samples = array('h', (sum(samples[i:i + channels]) // channels for i in range(0, len(samples), channels)))
+    if rate != sample_rate and samples:
+        # Linear interpolation is plenty for speech that is rendered once
+        step = rate / sample_rate
+        count = int(len(samples) / step)
+        last = len(samples) - 1
+        resampled = array('h', bytes(2 * count))
+        for i in range(count):
+            position = i * step
+            index = int(position)
+            fraction = position - index
+            following = samples[min(index + 1, last)]
+            resampled[i] = int(samples[index] + (following - samples[index]) * fraction)
+        samples = resampled
+    return samples.tobytes()
+
+class SpeechEngine:
+    """Offline text to speech, called from the render thread only - voice and rate empty or 0 keep the engine's defaults"""
+    name = ''
+
+    def __init__(self, voice='', rate=0, sample_rate=44100):
+        self.voice = voice
+        self.rate = rate
+        self.sample_rate = sample_rate
+
+    def key(self) -> str:
+        """Everything besides the text that changes the rendered audio"""
+        return f"{self.name}/{self.voice}/{self.rate}/{self.sample_rate}"
+
+    def synthesize(self, text) -> bytes:
+        """16-bit mono PCM at sample_rate"""
+        raise NotImplementedError
+
+class StubEngine(SpeechEngine):
+    """Renders a short tone per word instead of speech - for benchmarks and testing without a TTS engine"""
+    name = 'stub'
+
+    def __init__(self, voice='', rate=0, sample_rate=44100, delay=0.0):
+        super().__init__(voice, rate, sample_rate)
+        self.delay = delay  # Seconds per phrase, standing in for the time a real engine takes
+
+    def synthesize(self, text) -> bytes:
+        if self.delay:
+            time.sleep(self.delay)
+        samples = array('h')
+        word_samples = int(self.sample_rate * 0.08)
+        for word in text.split():
+            step = 2 * math.pi * (300 + sum(word.encode()) % 500) / self.sample_rate
+            samples.extend(int(6000 * math.sin(step * i)) for i in range(word_samples))
+            samples.extend(bytes(int(self.sample_rate * 0.02)))
+        return samples.tobytes()
+
+class EspeakEngine(SpeechEngine):
+    """eSpeak NG in a subprocess, writing WAV to its standard output"""
+    name = 'espeak'
+
+    def __init__(self, voice='', rate=0, sample_rate=44100):
+        super().__init__(voice, rate, sample_rate)
+        self.command = shutil.which('espeak-ng') or shutil.which('espeak')
+        if not self.command:
+            raise RuntimeError("espeak-ng was not found")
+
+    def synthesize(self, text) -> bytes:
+        command = [self.command, '--stdout']
+        if self.voice:
+            command += ['-v', self.voice]
+        if self.rate:
+            command += ['-s', str(self.rate)]
+        result = subprocess.run(command + ['--', text], capture_output=True, timeout=30, check=True)
+        return pcm_from_wav(result.stdout, self.sample_rate)
+
+class Pyttsx3Engine(SpeechEngine):
+    """The system voices through pyttsx3 - SAPI5 on Windows, NSSpeechSynthesizer on macOS, eSpeak on Linux"""
+    name = 'pyttsx3'
+
+    def __init__(self, voice='', rate=0, sample_rate=44100):
+        super().__init__(voice, rate, sample_rate)
+        import pyttsx3  # Optional, only needed for this engine
+        self.pyttsx3 = pyttsx3
+        self.engine = None
+
+    def synthesize(self, text) -> bytes:
+        if self.engine is None:
+            # Created on the render thread, SAPI5 only works on the thread that set it up
+            self.engine = self.pyttsx3.init()
+            if self.voice:
+                self.engine.setProperty('voice', self.voice)
+            if self.rate:
+                self.engine.setProperty('rate', self.rate)
+        handle, path = tempfile.mkstemp(suffix='.wav')
+        os.close(handle)
+        try:
+            self.engine.save_to_file(text, path)
+            self.engine.runAndWait()
+            with open(path, 'rb') as f:
+                return pcm_from_wav(f.read(), self.sample_rate)
+        finally:
+            os.remove(path)
+
+ENGINES = {engine.name: engine for engine in (Pyttsx3Engine, EspeakEngine, StubEngine)}
+
+def create_engine(name, voice='', rate=0, sample_rate=44100):
+    """Create a TTS engine by name, raises if it is unknown or not installed"""
+    if name not in ENGINES:
+        raise ValueError(f"Unknown speech engine '{name}', expected one of {', '.join(ENGINES)}")
+    return ENGINES[name](voice, rate, sample_rate)
+
+class SpeechCache:
+    """Rendered phrases in memory and on disk, both least recently used first, filled by one render thread"""
+
+    def __init__(self, directory, engine, max_bytes=64 * 1024 * 1024, memory_bytes=32 * 1024 * 1024):
+        self.directory = directory
+        self.engine = engine
+        self.engine_key = engine.key()
+        self.max_bytes = max_bytes
+        self.memory_bytes = memory_bytes
+        self.logger = logging.getLogger('OBSMonitor')
+
+        self.lock = threading.Condition()
+        self.memory = OrderedDict()  # text -> PCM
+        self.memory_size = 0
+        self.files = OrderedDict()  # file name -> size, filled by the render thread
+        self.disk_size = 0
+        self.pending = deque()
+        self.queued = set()
+        self.closed = False
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.rendered = 0
+
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def file_name(self, text) -> str:
+        return hashlib.sha1(f"{self.engine_key}\n{text}".encode()).hexdigest() + '.pcm'
+
+    def get(self, text):
+        """Rendered PCM of a phrase, or None after queueing it to be rendered"""
+        with self.lock:
+            pcm = self.memory.get(text)
+            if pcm is not None:
+                self.memory.move_to_end(text)
+                self.hits += 1
+                return pcm
+            self.misses += 1
+            self._queue(text)
+            return None
+
+    def peek(self, text):
+        """Rendered PCM of a phrase, or None - never queues it, for text that is not worth keeping"""
+        with self.lock:
+            pcm = self.memory.get(text)
+            if pcm is not None:
+                self.memory.move_to_end(text)
+                self.hits += 1
+            return pcm
+
+    def prerender(self, texts):
+        """Queue phrases that are not in memory yet, those on disk are only loaded"""
+        with self.lock:
+            for text in texts:
+                self._queue(text)
+
+    def _queue(self, text):
+        if text in self.memory or text in self.queued or self.closed:
+            return
+        self.queued.add(text)
+        self.pending.append(text)
+        self.lock.notify()
+
+    def close(self):
+        """Stop the render thread, dropping what it has not rendered yet"""
+        with self.lock:
+            self.closed = True
+            self.pending.clear()
+            self.lock.notify()
+        self.thread.join(timeout=2.0)
+
+    def _run(self):
+        """Render thread - index the disk cache, then load or synthesize queued phrases"""
+        try:
+            self._scan()
+        except Exception as e:
+            self.logger.error(f"Error reading the speech cache: {e}")
+        while True:
+            with self.lock:
+                while not self.closed and not self.pending:
+                    self.lock.wait()
+                if self.closed:
+                    return
+                text = self.pending.popleft()
+            try:
+                pcm = self._load(text)
+                if pcm is None:
+                    pcm = self.engine.synthesize(text)
+                    self._store(text, pcm)
+                    self.rendered += 1
+            except Exception as e:
+                self.logger.error(f"Error rendering speech for '{text}': {e}")
+                pcm = None
+            with self.lock:
+                self.queued.discard(text)
+                if pcm:
+                    self._remember(text, pcm)
+
+    def _scan(self):
+        os.makedirs(self.directory, exist_ok=True)
+        entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith('.pcm')]
+        for entry in sorted(entries, key=lambda entry: entry.stat().st_mtime):
+            size = entry.stat().st_size
+            self.files[entry.name] = size
+            self.disk_size += size
+        self._evict_files()
+
+    def _load(self, text):
+        name = self.file_name(text)
+        if name not in self.files:
+            return None
+        path = os.path.join(self.directory, name)
+        try:
+            with open(path, 'rb') as f:
+                pcm = f.read()
+            os.utime(path)  # Keeps its place in the LRU order across runs
+        except FileNotFoundError:
+            self.disk_size -= self.files.pop(name)
+            return None
+        self.files.move_to_end(name)
+        return pcm
+
+    def _store(self, text, pcm):
+        name = self.file_name(text)
+        path = os.path.join(self.directory, name)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(pcm)
+        os.replace(temp_path, path)
+        self.disk_size += len(pcm) - self.files.pop(name, 0)
+        self.files[name] = len(pcm)
+        self._evict_files()
+
+    def _evict_files(self):
+        while self.disk_size > self.max_bytes and len(self.files) > 1:
+            name, size = self.files.popitem(last=False)
+            self.disk_size -= size
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError as e:
+                self.logger.error(f"Error removing cached speech {name}: {e}")
+
+    def _remember(self, text, pcm):
+        self.memory[text] = pcm
+        self.memory_size += len(pcm)
+        while self.memory_size > self.memory_bytes and len(self.memory) > 1:
+            _, dropped = self.memory.popitem(last=False)
+            self.memory_size -= len(dropped)
@@ -0,0 +1,139 @@
+"""Local socket server that shares the scene state of every instance with other tools"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import stat
+from typing import Dict
+
+class StateServer:
+    """Local fan-out of the monitor's scene state, so other tools need no OBS connection of their own.
+
+    Clients connect over localhost TCP, or a Unix domain socket when `unix_socket` is set, and send
+    one JSON object per line:
+
+        {"op": "get"}            answered with the current state of every instance
+        {"op": "subscribe"}      the current state, then every change as it is announced
+        {"op": "unsubscribe"}
+
+    Everything the server sends is one JSON object per line too. A change is encoded once however
+    many clients get it, and written without waiting for any of them. A client whose unsent data
+    grows past `client_buffer` bytes is disconnected, so a stuck tool can neither hold up the
+    monitor nor make it buffer without limit. It can reconnect and ask for the state again.
+    """
+
+    def __init__(self, snapshot, host='127.0.0.1', port=4466, unix_socket='', client_buffer=65536, max_clients=32):
+        self.snapshot = snapshot  # Returns the current state of every instance, called on the event loop
+        self.host = host
+        self.port = port
+        self.unix_socket = unix_socket
+        self.client_buffer = client_buffer
+        self.max_clients = max_clients
+        self.logger = logging.getLogger('OBSMonitor')
+
+        self.server = None
+        self.clients: Dict[asyncio.StreamWriter, bool] = {}  # writer -> subscribed
+        self.subscribers = 0
+        self.dropped = 0
+
+    async def start(self):
+        if self.unix_socket:
+            if os.path.lexists(self.unix_socket):
+                if not self.is_socket(self.unix_socket):
+                    raise FileExistsError(f"{self.unix_socket} exists and is not a socket, leaving it alone")
+                os.unlink(self.unix_socket)  # Left behind by a previous run
+            self.server = await asyncio.start_unix_server(self.handle_client, self.unix_socket)
+        else:
+            self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+
+    async def stop(self):
+        if self.server:
+            self.server.close()
+        for writer in list(self.clients):
+            writer.transport.abort()
+        self.clients.clear()
+        self.subscribers = 0
+        if self.server:
+            await self.server.wait_closed()
+            self.server = None
+        if self.unix_socket and self.is_socket(self.unix_socket):
+            os.unlink(self.unix_socket)
+
+    @staticmethod
+    def is_socket(path) -> bool:
+        """Only a socket is ever unlinked, so a mistyped unix_socket cannot delete a file"""
+        try:
+            return stat.S_ISSOCK(os.lstat(path).st_mode)
+        except OSError:
+            return False
+
+    @staticmethod
+    def encode(message) -> bytes:
+        return (json.dumps(message, separators=(',', ':')) + '\n').encode('utf-8')
+
+    def publish(self, message):
+        """Send a change to every subscribed client"""
+        if not self.subscribers:
+            return
+        data = self.encode(message)
+        for writer, subscribed in list(self.clients.items()):
+            if subscribed:
+                self.send(writer, data)
+
+    def send(self, writer, data):
+        """Queue data for one client, dropping the client if it has fallen too far behind"""
+        if writer not in self.clients:
+            return
+        writer.write(data)
+        if writer.transport.get_write_buffer_size() > self.client_buffer:
+            self.dropped += 1
+            self.logger.error(f"State server client {writer.get_extra_info('peername') or 'on socket'} was too slow, disconnected")
+            self.remove(writer)
+            writer.transport.abort()
+
+    def remove(self, writer):
+        if self.clients.pop(writer, False):
+            self.subscribers -= 1
+
+    def set_subscribed(self, writer, subscribed):
+        if writer in self.clients and self.clients[writer] != subscribed:
+            self.clients[writer] = subscribed
+            self.subscribers += 1 if subscribed else -1
+
+    async def handle_client(self, reader, writer):
+        if len(self.clients) >= self.max_clients:
+            writer.transport.abort()
+            return
+        self.clients[writer] = False
+        try:
+            # Keep the kernel from buffering far more than client_buffer for a client that stopped reading
+            writer.get_extra_info('socket').setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.client_buffer)
+        except (OSError, AttributeError):
+            pass
+        try:
+            while writer in self.clients:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    op = request.get('op')
+                except (ValueError, AttributeError):
+                    op = None
+
+                if op == 'get':
+                    self.send(writer, self.encode({'op': 'state', 'instances': self.snapshot()}))
+                elif op == 'subscribe':
+                    self.set_subscribed(writer, True)
+                    self.send(writer, self.encode({'op': 'state', 'instances': self.snapshot()}))
+                elif op == 'unsubscribe':
+                    self.set_subscribed(writer, False)
+                else:
+                    self.send(writer, self.encode({'op': 'error', 'error': 'expected {"op": "get", "subscribe" or "unsubscribe"}'}))
+        except (ConnectionError, ValueError):
+            # Reset by the client, or a line over the stream reader's limit
+            pass
+        finally:
+            self.remove(writer)
+            writer.close()
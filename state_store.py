@@ -0,0 +1,63 @@
+"""Last known scene state of every instance, kept on disk between runs"""
+import json
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+class StateStore:
+    """Last known scene state of every instance, persisted so changes made while the program was
+    disconnected or not running can be announced when it comes back.
+
+    The file is read once, on first use. Writes serialise everything to compact JSON, are skipped
+    when nothing changed since the last write and replace the file atomically.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.states: Optional[Dict[str, dict]] = None
+        self.written = None
+        self.logger = logging.getLogger('OBSMonitor')
+
+    def _load(self):
+        if self.states is not None:
+            return
+        self.states = {}
+        try:
+            with open(self.path, 'r') as f:
+                self.written = f.read()
+            self.states = json.loads(self.written)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.error(f"Error loading saved state: {e}")
+
+    def get(self, key) -> Optional[dict]:
+        """Saved state of one instance, or None"""
+        with self.lock:
+            self._load()
+            return self.states.get(key)
+
+    def update(self, key, state):
+        """Replace the state of one instance in memory"""
+        with self.lock:
+            self._load()
+            self.states[key] = state
+
+    def flush(self):
+        """Write the states if they changed since the last write"""
+        with self.lock:
+            if self.states is None:
+                return
+            data = json.dumps(self.states, separators=(',', ':'))
+            if data == self.written:
+                return
+            try:
+                temp_path = f"{self.path}.tmp"
+                with open(temp_path, 'w') as f:
+                    f.write(data)
+                os.replace(temp_path, self.path)
+                self.written = data
+            except Exception as e:
+                self.logger.error(f"Error saving state: {e}")
@@ -0,0 +1,81 @@
+"""Shared fixtures - a fake OBS server on an event loop thread of its own, and headless monitors pointed at it"""
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import monitor  # noqa: E402
+from fake_obs import FakeOBS  # noqa: E402
+
+class FakeServer:
+    """FakeOBS running on its own loop thread, so a monitor's loop thread can talk to it"""
+
+    def __init__(self, **kwargs):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.obs = FakeOBS(**kwargs)
+        self.port = self.run(self.obs.start('localhost', 0))
+
+    def run(self, coroutine):
+        """Run a coroutine on the server's loop and return its result"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout=10)
+
+    def close(self):
+        self.run(self.obs.stop())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=5)
+
+class RecordingMonitor(monitor.OBSSourceMonitor):
+    """OBSSourceMonitor that keeps every source announcement as (sound type, source name)"""
+
+    def __init__(self, config):
+        self.announced = []
+        super().__init__(config)
+
+    def play_source_sound(self, sound_type: str, source_names=None, instance_label=None):
+        self.announced.extend((sound_type, name) for name in source_names or ())
+        super().play_source_sound(sound_type, source_names, instance_label)
+
+def wait_until(condition, timeout=5.0):
+    """Poll until condition() is true, fails the test after timeout seconds"""
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            pytest.fail("Timed out waiting for the monitor")
+        time.sleep(0.01)
+
+@pytest.fixture
+def fake_obs():
+    server = FakeServer(scenes=2, items=5, seed=1)
+    yield server
+    server.close()
+
+@pytest.fixture
+def make_monitor():
+    """Build headless monitors - no audio, speech, state file or journal - and stop them after the test"""
+    monitors = []
+
+    def make(port, **config):
+        settings = {
+            'port': port,
+            'use_speech': False,
+            'audio_backend': 'null',
+            'state_file': '',
+            'journal': {'enabled': False},
+            'debounce_ms': 0,
+            'flap_threshold': 0,
+        }
+        settings.update(config)
+        obs_monitor = RecordingMonitor(settings)
+        monitors.append(obs_monitor)
+        return obs_monitor
+
+    yield make
+    for obs_monitor in monitors:
+        obs_monitor.stop_monitoring()
@@ -0,0 +1,78 @@
+"""Config checks at startup and instance changes on reload"""
+import asyncio
+
+from conftest import FakeServer
+import monitor
+
+def test_defaults_have_no_problems(make_monitor):
+    obs_monitor = make_monitor(4455)
+    assert obs_monitor.config_problems == []
+    assert monitor.validate_config(obs_monitor.config, obs_monitor.default_config()) == []
+
+def test_bad_settings_at_startup_fall_back_to_their_defaults(make_monitor):
+    obs_monitor = make_monitor(4455, poll_interval='fast', monitor_mode='evnts', journal={'max_bytes': 'big'}, volume=0.5)
+    defaults = obs_monitor.default_config()
+    assert obs_monitor.config['poll_interval'] == defaults['poll_interval']
+    assert obs_monitor.monitor_mode == defaults['monitor_mode']
+    assert obs_monitor.config['journal'] == defaults['journal']
+    assert obs_monitor.config['volume'] == 0.5
+    assert len(obs_monitor.config_problems) == 3
+    assert any('monitor_mode' in problem for problem in obs_monitor.config_problems)
+
+def test_poll_limits_out_of_order_at_startup(make_monitor):
+    obs_monitor = make_monitor(4455, poll_interval=2.0, poll_max_interval=1.0)
+    defaults = obs_monitor.default_config()
+    assert obs_monitor.config['poll_interval'] == defaults['poll_interval']
+    assert obs_monitor.config['poll_max_interval'] == defaults['poll_max_interval']
+    assert len(obs_monitor.config_problems) == 1
+
+def relabel(obs_monitor, instances):
+    """Apply a reloaded instances list on the monitor's loop"""
+    old_config = obs_monitor.config
+    obs_monitor.config = dict(old_config, instances=instances)
+    asyncio.run_coroutine_threadsafe(
+        obs_monitor.apply_instances_config(old_config, {'instances'}), obs_monitor.loop
+    ).result(timeout=10)
+
+def gauge_labels(obs_monitor, name):
+    return {dict(labels).get('instance'): callback for (gauge, labels), callback in obs_monitor.metrics.gauges.items() if gauge == name}
+
+def test_label_change_moves_the_metric_labels_and_gauges(fake_obs, make_monitor):
+    obs_monitor = make_monitor(
+        fake_obs.port, monitor_mode='polling', metrics={'enabled': True, 'file': ''},
+        instances=[{'label': 'Main', 'port': fake_obs.port}],
+    )
+    assert obs_monitor.start_monitoring()
+    instance = obs_monitor.instances[0]
+    assert set(gauge_labels(obs_monitor, 'visible_sources')) == {'Main'}
+
+    relabel(obs_monitor, [{'label': 'Stage', 'port': fake_obs.port}])
+    assert obs_monitor.instances == [instance]
+    assert instance.metric_labels == {'instance': 'Stage'}
+    assert instance.conn.metric_labels == {'instance': 'Stage'}
+    for name in monitor.OBSInstance.GAUGES:
+        assert set(gauge_labels(obs_monitor, name)) == {'Stage'}
+    assert gauge_labels(obs_monitor, 'poll_period_seconds')['Stage'].__self__ is instance.poll_scheduler
+
+def test_swapped_labels_keep_a_gauge_per_instance(make_monitor):
+    servers = [FakeServer(scenes=1, items=2), FakeServer(scenes=1, items=2)]
+    try:
+        obs_monitor = make_monitor(
+            servers[0].port, monitor_mode='polling', metrics={'enabled': True, 'file': ''},
+            instances=[{'label': 'A', 'port': servers[0].port}, {'label': 'B', 'port': servers[1].port}],
+        )
+        assert obs_monitor.start_monitoring()
+        first, second = sorted(obs_monitor.instances, key=lambda instance: instance.label)
+
+        relabel(obs_monitor, [{'label': 'B', 'port': servers[0].port}, {'label': 'A', 'port': servers[1].port}])
+        periods = gauge_labels(obs_monitor, 'poll_period_seconds')
+        assert set(periods) == {'A', 'B'}
+        assert periods['B'].__self__ is first.poll_scheduler
+        assert periods['A'].__self__ is second.poll_scheduler
+
+        # A dropped host takes its gauges with it
+        relabel(obs_monitor, [{'label': 'A', 'port': servers[1].port}])
+        assert set(gauge_labels(obs_monitor, 'visible_sources')) == {'A'}
+    finally:
+        for server in servers:
+            server.close()
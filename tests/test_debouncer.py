@@ -0,0 +1,88 @@
+"""TransitionDebouncer - debounce and flap detection, driven with explicit timestamps"""
+from debouncer import TransitionDebouncer
+
+def test_changes_pass_straight_through_without_debounce():
+    debouncer = TransitionDebouncer()
+    debouncer.reset({'A'})
+    assert debouncer.update(['B'], ['A'], 0.0) == (['B'], ['A'], [])
+    assert debouncer.reported == {'B'}
+    assert debouncer.next_deadline() is not None  # History is kept for the flap window
+    assert debouncer.flush(2.0) == ([], [], [])
+    assert debouncer.next_deadline() is None
+
+def test_change_is_held_back_for_the_debounce_time():
+    debouncer = TransitionDebouncer(debounce=0.5)
+    debouncer.reset(set())
+    assert debouncer.update(['A'], [], 10.0) == ([], [], [])
+    assert debouncer.next_deadline() == 10.5
+    assert debouncer.flush(10.4) == ([], [], [])
+    assert debouncer.flush(10.5) == (['A'], [], [])
+    assert debouncer.reported == {'A'}
+    assert debouncer.suppressed == 0
+
+def test_blip_shorter_than_the_debounce_is_never_announced():
+    debouncer = TransitionDebouncer(debounce=0.5)
+    debouncer.reset(set())
+    debouncer.update(['A'], [], 0.0)
+    debouncer.update([], ['A'], 0.2)
+    assert debouncer.flush(0.6) == ([], [], [])
+    assert debouncer.flush(0.8) == ([], [], [])
+    assert debouncer.reported == set()
+    assert debouncer.suppressed == 2
+
+def test_every_change_is_announced_with_flap_detection_off():
+    debouncer = TransitionDebouncer(flap_threshold=0)
+    debouncer.reset(set())
+    for index in range(10):
+        now = index * 0.05
+        if index % 2:
+            assert debouncer.update([], ['A'], now) == ([], ['A'], [])
+        else:
+            assert debouncer.update(['A'], [], now) == (['A'], [], [])
+    assert debouncer.suppressed == 0
+
+def test_flapping_source_is_announced_once_then_its_final_state():
+    debouncer = TransitionDebouncer(flap_window=2.0, flap_threshold=4)
+    debouncer.reset(set())
+    assert debouncer.update(['A'], [], 0.0) == (['A'], [], [])
+    assert debouncer.update([], ['A'], 0.1) == ([], ['A'], [])
+    assert debouncer.update(['A'], [], 0.2) == (['A'], [], [])
+    assert debouncer.update([], ['A'], 0.3) == ([], [], ['A'])
+
+    # Quiet while it keeps flapping, the window restarts with every change
+    assert debouncer.update(['A'], [], 0.5) == ([], [], [])
+    assert debouncer.update([], ['A'], 0.6) == ([], [], [])
+    assert debouncer.next_deadline() == 2.6
+    assert debouncer.flush(2.5) == ([], [], [])
+
+    # Stable for a full window - the final state differs from the last one announced
+    assert debouncer.flush(2.6) == ([], ['A'], [])
+    assert debouncer.reported == set()
+    assert debouncer.suppressed == 2
+
+def test_flapping_source_back_in_its_announced_state_stays_quiet():
+    debouncer = TransitionDebouncer(flap_window=1.0, flap_threshold=3)
+    debouncer.reset({'A'})
+    debouncer.update([], ['A'], 0.0)
+    debouncer.update(['A'], [], 0.1)
+    assert debouncer.update([], ['A'], 0.2) == ([], [], ['A'])
+    debouncer.update(['A'], [], 0.3)
+    assert debouncer.flush(1.3) == ([], [], [])
+    assert debouncer.reported == {'A'}
+    assert debouncer.suppressed == 2
+
+def test_changes_spread_over_more_than_a_window_are_not_flapping():
+    debouncer = TransitionDebouncer(flap_window=1.0, flap_threshold=3)
+    debouncer.reset(set())
+    for index in range(6):
+        shown, hidden, flapping = debouncer.update(*((['A'], []) if index % 2 == 0 else ([], ['A'])), index * 0.6)
+        assert flapping == []
+        assert shown or hidden
+
+def test_rename_follows_the_source_and_its_history():
+    debouncer = TransitionDebouncer(debounce=0.5)
+    debouncer.reset({'A'})
+    debouncer.update([], ['A'], 0.0)
+    debouncer.rename('A', 'B')
+    assert debouncer.flush(0.5) == ([], ['B'], [])
+    assert debouncer.reported == set()
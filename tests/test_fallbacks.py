@@ -0,0 +1,109 @@
+"""Fallbacks for OBS servers that lack a feature - scene events and request batches"""
+import asyncio
+import time
+
+from conftest import FakeServer, wait_until
+from monitor import SnapshotEngine
+from obs_connection import OBSConnection
+
+def test_refused_event_subscription_falls_back_to_polling(fake_obs, make_monitor):
+    fake_obs.obs.rejected_subscriptions = OBSConnection.SUB_SCENE_ITEMS
+    obs_monitor = make_monitor(fake_obs.port, monitor_mode='events')
+    assert obs_monitor.start_monitoring()
+
+    instance = obs_monitor.instances[0]
+    assert instance.events_failed
+    assert not instance.use_events
+    assert 'Source 1-2' not in instance.currently_visible_sources
+
+    fake_obs.run(fake_obs.obs.set_enabled('Scene 1', 2, True))
+    wait_until(lambda: 'Source 1-2' in instance.currently_visible_sources)
+
+def test_events_are_used_when_accepted(fake_obs, make_monitor):
+    obs_monitor = make_monitor(fake_obs.port, monitor_mode='events')
+    assert obs_monitor.start_monitoring()
+
+    instance = obs_monitor.instances[0]
+    assert instance.use_events
+    fake_obs.run(fake_obs.obs.set_enabled('Scene 1', 2, True))
+    wait_until(lambda: 'Source 1-2' in instance.currently_visible_sources)
+
+def test_wrong_password_is_not_mistaken_for_refused_events(make_monitor):
+    server = FakeServer(scenes=1, items=2, password='secret')
+    try:
+        obs_monitor = make_monitor(server.port, monitor_mode='events', password='wrong')
+        instance = obs_monitor.instances[0]
+        assert not asyncio.run(instance.connect_to_obs())
+        assert not instance.events_failed
+    finally:
+        server.close()
+
+def test_unanswered_request_batches_drop_to_list_mode(fake_obs, make_monitor):
+    fake_obs.obs.batches = False
+    obs_monitor = make_monitor(fake_obs.port, monitor_mode='polling', snapshot_mode='batch', request_timeout=0.2)
+    assert obs_monitor.start_monitoring()
+
+    instance = obs_monitor.instances[0]
+    assert 'Source 1-1' in instance.currently_visible_sources  # The timed out batch was answered with plain requests
+    wait_until(lambda: instance.snapshot_engine.mode == 'list')
+    assert instance.snapshot_engine.batch_timeouts == SnapshotEngine.BATCH_TIMEOUTS
+    assert 'Source 1-2' not in instance.currently_visible_sources
+
+    fake_obs.run(fake_obs.obs.set_enabled('Scene 1', 2, True))
+    wait_until(lambda: 'Source 1-2' in instance.currently_visible_sources)
+
+class BatchConnection:
+    """Stand-in connection whose request batches fail with the queued errors, then succeed"""
+
+    connected = True
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+
+    async def request_batch(self, requests):
+        if self.errors:
+            raise self.errors.pop(0)
+        return [{'requestStatus': {'result': True, 'code': 100}, 'responseData': {'batch': True}} for _ in requests]
+
+    async def request(self, request_type, request_data=None):
+        return {'batch': False}
+
+def batch_answers(engine, conn):
+    results = asyncio.run(engine.request_batch(conn, [('GetCurrentProgramScene', None)]))
+    return [result['responseData']['batch'] for result in results]
+
+def test_a_slow_batch_is_answered_with_plain_requests_and_batches_stay_on():
+    engine = SnapshotEngine('batch')
+    conn = BatchConnection(asyncio.TimeoutError(), asyncio.TimeoutError())
+    assert batch_answers(engine, conn) == [False]
+    assert batch_answers(engine, conn) == [False]
+    assert batch_answers(engine, conn) == [True]
+    assert (engine.mode, engine.batch_timeouts) == ('batch', 0)
+
+def test_a_malformed_batch_reply_drops_to_list_mode_right_away():
+    engine = SnapshotEngine('batch')
+    assert batch_answers(engine, BatchConnection(KeyError('results'))) == [False]
+    assert engine.mode == 'list'
+
+def test_dropped_identify_keeps_events_for_the_next_attempt(fake_obs, make_monitor):
+    fake_obs.obs.drop_identify = 1
+    obs_monitor = make_monitor(fake_obs.port, monitor_mode='events')
+    instance = obs_monitor.instances[0]
+    assert not asyncio.run(instance.connect_to_obs())
+    assert not instance.events_failed
+
+    assert obs_monitor.start_monitoring()
+    assert instance.use_events
+
+def test_unhandled_watcher_events_do_not_wake_the_poll_loop(fake_obs, make_monitor):
+    obs_monitor = make_monitor(fake_obs.port, monitor_mode='polling', watchers={'input_mute': {'enabled': True, 'inputs': []}})
+    assert obs_monitor.start_monitoring()
+    time.sleep(1.5)  # Let the poll period grow to its quiet maximum
+    requests = fake_obs.obs.requests
+
+    async def drag_fader():
+        for step in range(50):
+            await fake_obs.obs.emit('InputVolumeChanged', {'inputName': 'Mic/Aux', 'inputVolumeMul': step / 50})
+            await asyncio.sleep(0.01)
+    fake_obs.run(drag_fader())
+    assert fake_obs.obs.requests - requests < 10
@@ -0,0 +1,135 @@
+"""Journal writing, rotation, the sparse index and time range queries"""
+import os
+from array import array
+from datetime import date, datetime
+
+import pytest
+
+import journal
+
+BASE = 1_790_000_000.0
+
+def write_journal(directory, count=2000, per_batch=100, max_bytes=20000):
+    """Record `count` transitions 250 ms apart, one write per batch, returns them as query() yields them"""
+    writer = journal.Journal(directory, max_bytes=max_bytes, flush_interval=60.0)
+    records = []
+    for batch in range(0, count, per_batch):
+        for index in range(batch, batch + per_batch):
+            timestamp = BASE + index * 0.25
+            record = (int(timestamp * 1000), 'Main', f"Scene {index % 3}", index % 2 == 0, f"Source {index}")
+            writer.record(record[1], record[2], record[3], [record[4]], timestamp=timestamp)
+            records.append(record)
+        writer._flush()  # The writer thread waits out flush_interval, this makes one write per batch
+    writer.close()
+    return records
+
+def read_index(path):
+    index = array('Q')
+    with open(path[:-len(journal.FILE_SUFFIX)] + journal.INDEX_SUFFIX, 'rb') as f:
+        index.frombytes(f.read())
+    return list(zip(index[0::2], index[1::2]))
+
+@pytest.fixture
+def recorded(tmp_path):
+    return str(tmp_path), write_journal(str(tmp_path))
+
+def test_files_rotate_by_size(recorded):
+    directory, records = recorded
+    files = journal.journal_files(directory)
+    assert len(files) > 2
+    assert [started for started, _ in files] == sorted(started for started, _ in files)
+    assert files[0][0] == records[0][0]
+    for _, path in files:
+        # Rotation happens between writes, so a file passes max_bytes by one batch at most
+        assert os.path.getsize(path) < 20000 + 100 * 64
+
+def test_sparse_index_points_at_record_starts(recorded):
+    directory, _ = recorded
+    for _, path in journal.journal_files(directory):
+        index = read_index(path)
+        assert index[0][1] == 0
+        with open(path, 'rb') as f:
+            data = f.read()
+        for (ms, offset), (next_ms, next_offset) in zip(index, index[1:]):
+            assert next_offset - offset >= journal.INDEX_EVERY
+            assert next_ms >= ms
+        for ms, offset in index:
+            assert offset == 0 or data[offset - 1:offset] == b'\n'
+            assert int(data[offset:data.index(b'\t', offset)]) == ms
+
+def test_start_offset_skips_to_the_index_entry_before_the_start(recorded):
+    directory, _ = recorded
+    _, path = journal.journal_files(directory)[0]
+    index = read_index(path)
+    assert len(index) > 2
+
+    ms, offset = index[2]
+    assert journal.start_offset(path, ms) == index[1][1]
+    assert journal.start_offset(path, ms + 1) == offset
+    assert journal.start_offset(path, index[0][0]) == 0
+    assert journal.start_offset(path, 0) == 0
+
+@pytest.mark.parametrize('start, end', [
+    (0, 2000),  # Everything
+    (100, 200),  # Inside one file
+    (0, 0),  # First record only
+    (1999, 1999),  # Last record only
+    (-50, 10),  # Starting before the journal
+    (1990, 2500),  # Ending after it
+])
+def test_query_returns_exactly_the_records_in_range(recorded, start, end):
+    directory, records = recorded
+    start_ms = int((BASE + start * 0.25) * 1000)
+    end_ms = int((BASE + end * 0.25) * 1000)
+    expected = [record for record in records if start_ms <= record[0] <= end_ms]
+    assert list(journal.query(directory, start_ms, end_ms)) == expected
+
+def test_query_across_file_boundaries(recorded):
+    directory, records = recorded
+    files = journal.journal_files(directory)
+    # From just before the second file starts until just after the third one starts
+    start_ms, end_ms = files[1][0] - 1000, files[2][0] + 1000
+    expected = [record for record in records if start_ms <= record[0] <= end_ms]
+    assert expected[0][0] < files[1][0] < files[2][0] < expected[-1][0]
+    assert list(journal.query(directory, start_ms, end_ms)) == expected
+
+def test_query_outside_the_journal_is_empty(recorded):
+    directory, records = recorded
+    assert list(journal.query(directory, 0, records[0][0] - 1)) == []
+    assert list(journal.query(directory, records[-1][0] + 1, records[-1][0] + 10 ** 6)) == []
+    assert list(journal.query(os.path.join(directory, 'missing'), 0, 10 ** 15)) == []
+
+def test_query_without_an_index_scans_from_the_start(recorded):
+    directory, records = recorded
+    for name in os.listdir(directory):
+        if name.endswith(journal.INDEX_SUFFIX):
+            os.remove(os.path.join(directory, name))
+    start_ms, end_ms = records[500][0], records[700][0]
+    assert list(journal.query(directory, start_ms, end_ms)) == records[500:701]
+
+def test_tabs_and_line_breaks_in_names_keep_the_format(tmp_path):
+    writer = journal.Journal(str(tmp_path), flush_interval=60.0)
+    writer.record('Main\tHost', 'Scene\n1', False, ['Cam\r\nA'], timestamp=BASE)
+    writer.close()
+    assert list(journal.query(str(tmp_path), 0, 10 ** 15)) == [
+        (int(BASE * 1000), 'Main Host', 'Scene 1', False, 'Cam  A')
+    ]
+
+def test_parse_time():
+    day = date(2026, 10, 1)
+    assert journal.parse_time('20:14', day) == datetime(2026, 10, 1, 20, 14)
+    assert journal.parse_time('20:14:30', day) == datetime(2026, 10, 1, 20, 14, 30)
+    assert journal.parse_time('2026-09-30 23:59', day) == datetime(2026, 9, 30, 23, 59)
+    with pytest.raises(ValueError):
+        journal.parse_time('8pm', day)
+
+def test_write_errors_reach_the_monitor_log(make_monitor, tmp_path):
+    obs_monitor = make_monitor(4455)
+    written = []
+    obs_monitor.log_handler.enqueue = written.append
+    blocked = tmp_path / 'journal'
+    blocked.write_text('')  # A file where the journal folder should be
+    writer = journal.Journal(str(blocked), flush_interval=0.0)
+    writer.record('obs', 'Scene', True, ['Cam'])
+    writer.close()
+    assert written and all(record.getMessage().startswith("Error writing journal") for record in written)
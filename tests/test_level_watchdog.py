@@ -0,0 +1,60 @@
+"""LevelWatchdog - silence by magnitude, clipping by peak"""
+import pytest
+
+pytest.importorskip('numpy')
+
+from watchers import LevelWatchdog  # noqa: E402
+
+SETTINGS = {'silence_seconds': 0.5, 'clip_seconds': 0.25, 'clip_frames': 3, 'check_every': 1}
+
+def frame(**levels):
+    """One InputVolumeMeters event, levels are (magnitude, peak) per input"""
+    return {'inputs': [
+        {'inputName': name, 'inputLevelsMul': [[magnitude, peak, peak], [magnitude / 2, peak / 2, peak / 2]]}
+        for name, (magnitude, peak) in levels.items()
+    ]}
+
+def feed(watchdog, count, **levels):
+    changes = []
+    for _ in range(count):
+        changes += watchdog.handle('InputVolumeMeters', frame(**levels))
+    return changes
+
+def test_quiet_magnitude_is_silent_even_with_loud_peaks():
+    watchdog = LevelWatchdog(SETTINGS)
+    # A dead input that picks up clicks - peaks around -20 dB, magnitude around -60 dB
+    changes = feed(watchdog, 10, Mic=(0.001, 0.1))
+    assert changes == [('silent', 'Mic', 'level_alert')]
+
+def test_speech_level_magnitude_is_not_silent():
+    watchdog = LevelWatchdog(SETTINGS)
+    assert feed(watchdog, 30, Mic=(0.05, 0.3)) == []
+
+def test_silence_needs_the_whole_window():
+    watchdog = LevelWatchdog(SETTINGS)
+    assert feed(watchdog, 9, Mic=(0.0, 0.0)) == []
+    assert feed(watchdog, 1, Mic=(0.0, 0.0)) == [('silent', 'Mic', 'level_alert')]
+
+def test_back_from_silence_needs_magnitude_above_the_hysteresis():
+    watchdog = LevelWatchdog(SETTINGS)
+    feed(watchdog, 10, Mic=(0.0, 0.0))
+    # Just above silence_db but below silence_db + hysteresis_db, and loud peaks
+    assert feed(watchdog, 5, Mic=(0.004, 0.5)) == []
+    assert feed(watchdog, 1, Mic=(0.05, 0.3)) == [('audio back', 'Mic', 'level_ok')]
+
+def test_clipping_goes_by_peak():
+    watchdog = LevelWatchdog(SETTINGS)
+    feed(watchdog, 10, Mic=(0.05, 0.3))
+    assert feed(watchdog, 2, Mic=(0.2, 1.0)) == []
+    assert feed(watchdog, 1, Mic=(0.2, 1.0)) == [('clipping', 'Mic', 'level_alert')]
+    assert feed(watchdog, 4, Mic=(0.05, 0.3)) == []
+    assert feed(watchdog, 1, Mic=(0.05, 0.3)) == [('clipping stopped', 'Mic', 'level_ok')]
+
+def test_loud_magnitude_without_clipped_peaks_is_not_clipping():
+    watchdog = LevelWatchdog(SETTINGS)
+    assert feed(watchdog, 20, Mic=(0.8, 0.9)) == []
+
+def test_inputs_are_tracked_separately_and_the_ring_grows():
+    watchdog = LevelWatchdog(dict(SETTINGS, capacity=1))
+    changes = feed(watchdog, 10, Mic=(0.0, 0.0), Desktop=(0.05, 0.3), Music=(0.0, 0.2))
+    assert sorted(changes) == [('silent', 'Mic', 'level_alert'), ('silent', 'Music', 'level_alert')]
@@ -0,0 +1,109 @@
+"""ThrottledQueueHandler - the burst, the suppression window and the repeat summaries"""
+import logging
+import queue
+
+import pytest
+
+from log_handler import ThrottledQueueHandler
+from state_store import StateStore
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def logged():
+    """A logger behind a ThrottledQueueHandler with a fake clock, and a function that drains what was queued"""
+    handler = ThrottledQueueHandler(queue.SimpleQueue(), burst=2, repeat_interval=10.0)
+    handler.clock = Clock()
+    logger = logging.getLogger('test-throttled')
+    logger.setLevel(logging.ERROR)
+    logger.propagate = False
+    logger.addHandler(handler)
+
+    def log(message, at):
+        handler.clock.now = 1000.0 + at
+        logger.error(message)
+
+    def drain():
+        lines = []
+        while True:
+            try:
+                lines.append(handler.queue.get_nowait().getMessage())
+            except queue.Empty:
+                return lines
+
+    yield handler, log, drain
+    logger.removeHandler(handler)
+
+def test_burst_is_written_and_the_rest_counted(logged):
+    handler, log, drain = logged
+    for _ in range(5):
+        log("Error A", 0)
+    assert drain() == ["Error A", "Error A"]
+    handler.flush_repeats()
+    assert drain() == ["Error A (repeated 3 times in the 0.0 s after it was last logged)"]
+
+def test_one_repeat_is_counted_from_the_last_written_copy(logged):
+    handler, log, drain = logged
+    log("Error A", 0)
+    log("Error A", 0)
+    log("Error A", 3)
+    assert drain() == ["Error A", "Error A"]
+    handler.flush_repeats()
+    assert drain() == ["Error A (repeated 1 time in the 3.0 s after it was last logged)"]
+
+def test_message_is_let_through_again_once_a_token_refills(logged):
+    handler, log, drain = logged
+    log("Error A", 0)
+    log("Error A", 1)
+    for at in range(2, 9):
+        log("Error A", at)
+    assert drain() == ["Error A", "Error A"]
+    # 0.1 token per second since the bucket ran empty at 1 s
+    log("Error A", 11)
+    assert drain() == ["Error A (repeated 7 times in the 7.0 s after it was last logged)", "Error A"]
+    log("Error A", 12)
+    assert drain() == []
+    handler.flush_repeats()
+    assert drain() == ["Error A (repeated 1 time in the 1.0 s after it was last logged)"]
+
+def test_other_message_writes_the_summary_once_repeats_stopped_for_the_interval(logged):
+    handler, log, drain = logged
+    for _ in range(4):
+        log("Error A", 0)
+    log("Error A", 2)
+    log("Error B", 5)
+    assert drain() == ["Error A", "Error A", "Error B"]
+    log("Error B", 12)
+    assert drain() == ["Error A (repeated 3 times in the 2.0 s after it was last logged)", "Error B"]
+
+def test_messages_and_levels_are_throttled_separately(logged):
+    handler, log, drain = logged
+    logger = logging.getLogger('test-throttled')
+    for _ in range(3):
+        log("Error A", 0)
+        log("Error B", 0)
+        logger.critical("Error A")
+    assert drain() == ["Error A", "Error B", "Error A"] * 2
+    handler.flush_repeats()
+    assert sorted(drain()) == sorted(f"Error {name} (repeated 1 time in the 0.0 s after it was last logged)" for name in "ABA")
+
+def test_zero_interval_never_suppresses(logged):
+    handler, log, drain = logged
+    handler.repeat_interval = 0
+    for at in range(5):
+        log("Error A", at * 0.001)
+    assert drain() == ["Error A"] * 5
+
+def test_errors_of_the_other_modules_reach_the_monitor_log(make_monitor, tmp_path):
+    obs_monitor = make_monitor(4455)
+    written = []
+    obs_monitor.log_handler.enqueue = written.append
+    store = StateStore(str(tmp_path))  # A directory, so saving fails
+    store.update('obs', {})
+    store.flush()
+    assert [record.getMessage().split(':')[0] for record in written] == ["Error loading saved state", "Error saving state"]
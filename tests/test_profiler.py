@@ -0,0 +1,11 @@
+"""ResourceProfiler - write errors end up in the monitor's log"""
+import profiler
+
+def test_write_errors_reach_the_monitor_log(make_monitor, tmp_path):
+    obs_monitor = make_monitor(4455)
+    written = []
+    obs_monitor.log_handler.enqueue = written.append
+    sampler = profiler.ResourceProfiler(str(tmp_path / 'missing' / 'profile.jsonl'), interval=60.0)
+    sampler.start()
+    sampler.stop()
+    assert written and all(record.getMessage().startswith("Error writing profile sample") for record in written)
@@ -0,0 +1,96 @@
+"""Nested scenes, groups and scene edits end to end, against fake_obs.py in events and polling mode"""
+import pytest
+
+from conftest import FakeServer, wait_until
+
+@pytest.fixture
+def nested_obs():
+    # Scene 1 > Scene 2 > Scene 3, each with sources 1-4, Group <scene>-1 (item 5) and the next scene (item 6)
+    server = FakeServer(scenes=3, items=4, groups=1, group_items=2, nested=True, seed=1)
+    yield server
+    server.close()
+
+@pytest.fixture(params=['events', 'polling'])
+def watched(request, nested_obs, make_monitor):
+    obs_monitor = make_monitor(nested_obs.port, monitor_mode=request.param)
+    assert obs_monitor.start_monitoring()
+    instance = obs_monitor.instances[0]
+    in_sync = lambda: instance.currently_visible_sources == nested_obs.obs.visible_sources()
+    wait_until(in_sync)
+    return nested_obs, obs_monitor, in_sync
+
+def step(server, obs_monitor, in_sync, coroutine):
+    """Make one change on the server and wait for the monitor to catch up, returns what was announced"""
+    obs_monitor.announced.clear()
+    server.run(coroutine)
+    wait_until(in_sync)
+    return sorted(obs_monitor.announced)
+
+def test_initial_state_includes_nested_scenes_and_groups(watched):
+    server, obs_monitor, in_sync = watched
+    visible = server.obs.visible_sources()
+    assert {'Scene 2', 'Scene 3', 'Group 1-1', 'Group 3-1 Source 1', 'Source 3-3'} <= visible
+    assert 'Group 3-1 Source 2' not in visible
+
+def test_hiding_a_group_hides_what_it_holds(watched):
+    server, obs_monitor, in_sync = watched
+    assert step(server, obs_monitor, in_sync, server.obs.set_enabled('Scene 2', 5, False)) == [
+        ('hidden', 'Group 2-1'), ('hidden', 'Group 2-1 Source 1'),
+    ]
+
+def test_hiding_a_nested_scene_hides_its_whole_tree(watched):
+    server, obs_monitor, in_sync = watched
+    announced = step(server, obs_monitor, in_sync, server.obs.set_enabled('Scene 2', 6, False))
+    assert ('hidden', 'Scene 3') in announced
+    assert ('hidden', 'Group 3-1 Source 1') in announced
+    assert all(state == 'hidden' for state, _ in announced)
+    assert step(server, obs_monitor, in_sync, server.obs.set_enabled('Scene 2', 6, True)) == sorted(
+        ('shown', name) for _, name in announced
+    )
+
+def test_created_and_removed_items(watched):
+    server, obs_monitor, in_sync = watched
+    item_id = server.run(server.obs.create_item('Scene 3', 'Added source', True))
+    wait_until(in_sync)
+    assert obs_monitor.announced[-1:] == [('shown', 'Added source')]
+    assert step(server, obs_monitor, in_sync, server.obs.remove_item('Scene 3', item_id)) == [('hidden', 'Added source')]
+    assert step(server, obs_monitor, in_sync, server.obs.create_item('Group 2-1', 'Hidden one', False)) == []
+
+def test_reindex_is_not_announced(watched):
+    server, obs_monitor, in_sync = watched
+    assert step(server, obs_monitor, in_sync, server.obs.reindex('Scene 2')) == []
+    assert step(server, obs_monitor, in_sync, server.obs.set_enabled('Scene 2', 6, False))[0] == ('hidden', 'Group 3-1')
+
+def test_renames_are_followed_with_events(nested_obs, make_monitor):
+    # Polling mode has no SceneNameChanged, a renamed nested scene reads as one source hidden and another shown
+    obs_monitor = make_monitor(nested_obs.port, monitor_mode='events')
+    assert obs_monitor.start_monitoring()
+    instance = obs_monitor.instances[0]
+    in_sync = lambda: instance.currently_visible_sources == nested_obs.obs.visible_sources()
+    wait_until(in_sync)
+
+    # The refetch of the reindexed scene is still in flight when Scene 3 is renamed, its answer has the new name
+    nested_obs.obs.latency = 0.05
+    assert step(nested_obs, obs_monitor, in_sync, nested_obs.obs.reindex('Scene 2')) == []
+    assert step(nested_obs, obs_monitor, in_sync, nested_obs.obs.rename_scene('Scene 3', 'Scene 3 renamed')) == []
+    nested_obs.obs.latency = 0
+    assert step(nested_obs, obs_monitor, in_sync, nested_obs.obs.rename_scene('Group 2-1', 'Group renamed')) == []
+    assert step(nested_obs, obs_monitor, in_sync, nested_obs.obs.set_enabled('Group renamed', 2, True)) == [
+        ('shown', 'Group 2-1 Source 2'),
+    ]
+    assert step(nested_obs, obs_monitor, in_sync, nested_obs.obs.set_enabled('Scene 1', 6, False))[0] == (
+        'hidden', 'Group 2-1 Source 1',
+    )
+
+def test_polling_keeps_the_scene_cache_bounded(make_monitor):
+    server = FakeServer(scenes=5, items=2, seed=1)
+    try:
+        obs_monitor = make_monitor(server.port, monitor_mode='polling', scene_cache_size=2)
+        assert obs_monitor.start_monitoring()
+        graph = obs_monitor.instances[0].scene_graph
+        for number in range(2, 6):
+            server.run(server.obs.set_program_scene(f"Scene {number}"))
+            wait_until(lambda: graph.root == f"Scene {number}")
+            assert len(graph.scenes) <= 2
+    finally:
+        server.close()
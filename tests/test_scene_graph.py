@@ -0,0 +1,142 @@
+"""SceneGraph - effective visibility through nested scenes and groups, renames and reindexing"""
+from scene_graph import SceneGraph
+
+def source(item_id, name, enabled=True):
+    return {'sceneItemId': item_id, 'sourceName': name, 'sceneItemEnabled': enabled, 'sourceType': 'OBS_SOURCE_TYPE_INPUT'}
+
+def scene(item_id, name, enabled=True):
+    return {'sceneItemId': item_id, 'sourceName': name, 'sceneItemEnabled': enabled, 'sourceType': 'OBS_SOURCE_TYPE_SCENE'}
+
+def group(item_id, name, enabled=True):
+    return dict(scene(item_id, name, enabled), isGroup=True)
+
+def build():
+    """Main > Camera (nested scene) > Overlay (group), and a Hidden scene that Main holds disabled"""
+    graph = SceneGraph()
+    graph.root = 'Main'
+    graph.set_items('Main', [source(1, 'Mic'), scene(2, 'Camera'), scene(3, 'Hidden', False)])
+    graph.set_items('Camera', [source(1, 'Webcam'), group(2, 'Overlay'), source(3, 'Off', False)])
+    graph.set_items('Overlay', [source(1, 'Logo'), source(2, 'Clock')], is_group=True)
+    graph.set_items('Hidden', [source(1, 'Secret')])
+    return graph
+
+def mask_names(graph):
+    return set(graph.slots.changed_names(graph.visible_mask()))
+
+def test_effective_visibility_follows_every_ancestor():
+    graph = build()
+    assert graph.is_visible('Overlay', 1)
+    assert not graph.is_visible('Camera', 3)
+    assert not graph.is_visible('Hidden', 1)
+    assert not graph.scene_visible('Hidden')
+    assert graph.visible_sources() == {'Mic', 'Camera', 'Webcam', 'Overlay', 'Logo', 'Clock'}
+    assert mask_names(graph) == graph.visible_sources()
+
+    graph.set_enabled('Camera', 2, False)
+    assert not graph.scene_visible('Overlay')
+    assert not graph.is_visible('Overlay', 1)
+    assert graph.visible_sources() == {'Mic', 'Camera', 'Webcam'}
+
+    graph.set_enabled('Main', 2, False)
+    assert not graph.is_visible('Camera', 1)
+    assert mask_names(graph) == graph.visible_sources() == {'Mic'}
+
+def test_a_scene_shown_anywhere_is_visible():
+    graph = build()
+    graph.set_items('Main', [source(1, 'Mic'), scene(2, 'Camera', False), scene(3, 'Hidden', False), scene(4, 'Camera')])
+    assert graph.is_visible('Camera', 1)
+    graph.set_enabled('Main', 4, False)
+    assert not graph.is_visible('Camera', 1)
+
+def test_nesting_loops_do_not_hang():
+    graph = build()
+    graph.set_items('Overlay', [source(1, 'Logo'), scene(2, 'Camera')], is_group=True)
+    assert graph.visible_sources() == {'Mic', 'Camera', 'Webcam', 'Overlay', 'Logo'}
+    assert not graph.scene_visible('Hidden')
+
+def test_rename_follows_the_scene_and_the_items_showing_it():
+    graph = build()
+    mask = graph.visible_mask()
+    graph.rename('Camera', 'Camera 2')
+    assert 'Camera' not in graph.scenes and 'Camera 2' in graph.scenes
+    assert graph.scenes['Main'][2]['sourceName'] == 'Camera 2'
+    assert graph.is_visible('Camera 2', 1)
+    assert graph.is_visible('Overlay', 2)
+    assert graph.visible_sources() == {'Mic', 'Camera 2', 'Webcam', 'Overlay', 'Logo', 'Clock'}
+    assert graph.visible_mask() == mask  # Same slots, so nothing reads as hidden and shown
+
+    graph.rename('Overlay', 'Badges')
+    assert graph.groups == {'Badges'}
+    assert graph.is_visible('Badges', 2)
+    assert graph.visible_mask() == mask
+
+def test_rename_of_the_program_scene_and_a_stale_scene():
+    graph = build()
+    graph.invalidate('Hidden')
+    graph.rename('Main', 'Live')
+    graph.rename('Hidden', 'Spare')
+    assert graph.root == 'Live'
+    assert graph.is_visible('Overlay', 1)
+    assert graph.stale == {'Spare'}
+    assert graph.scenes['Live'][3]['sourceName'] == 'Spare'
+    assert graph.missing() == [('Spare', False)]
+
+def test_refetch_showing_a_renamed_child_before_its_event():
+    graph = build()
+    items = [source(1, 'Mic'), scene(2, 'Camera 2'), scene(3, 'Hidden', False)]
+    assert graph.renamed_children('Main', items) == [('Camera', 'Camera 2')]
+    assert graph.renamed_children('Main', [source(1, 'Camera 2')]) == []  # A plain source now, not a rename
+    assert graph.renamed_children('Main', [scene(2, 'Hidden')]) == []  # Points at another cached scene
+    assert graph.renamed_children('Unknown', items) == []
+
+    mask = graph.visible_mask()
+    graph.rename('Camera', 'Camera 2')
+    graph.set_items('Main', items)
+    graph.rename('Camera', 'Camera 2')  # The late event finds nothing left to rename
+    assert graph.visible_mask() == mask
+    assert graph.is_visible('Overlay', 1)
+
+def test_reindex_keeps_slots_and_visibility():
+    graph = build()
+    mask = graph.visible_mask()
+    graph.invalidate('Camera')
+    assert graph.missing() == [('Camera', False)]
+    graph.set_items('Camera', [source(3, 'Off', False), group(2, 'Overlay'), source(1, 'Webcam')])
+    assert graph.missing() == []
+    assert list(graph.scenes['Camera']) == [3, 2, 1]
+    assert graph.is_visible('Overlay', 1)
+    assert graph.visible_mask() == mask
+
+def test_refetch_with_a_different_source_changes_the_mask():
+    graph = build()
+    mask = graph.visible_mask()
+    graph.set_items('Camera', [source(1, 'Phone'), group(2, 'Overlay'), source(3, 'Off', False)])
+    changed = graph.slots.changed_names(mask ^ graph.visible_mask())
+    assert sorted(changed) == ['Phone', 'Webcam']
+
+def test_removed_items_and_their_subtrees():
+    graph = build()
+    graph.remove_item('Camera', 2)
+    assert 'Overlay' not in graph.parents
+    assert not graph.scene_visible('Overlay')
+    assert graph.visible_sources() == {'Mic', 'Camera', 'Webcam'}
+    assert mask_names(graph) == {'Mic', 'Camera', 'Webcam'}
+    graph.remove_item('Camera', 2)  # Unknown by now, ignored
+
+def test_only_invalidated_and_new_scenes_are_fetched_again():
+    graph = build()
+    assert graph.uncached(['Main']) == []
+    graph.invalidate('Overlay')
+    graph.set_items('Camera', [source(1, 'Webcam'), group(2, 'Overlay'), scene(4, 'Extra')])
+    assert sorted(graph.uncached(['Main'])) == [('Extra', False), ('Overlay', True)]
+
+def test_rename_of_the_preview_scene_keeps_its_tree_in_use():
+    graph = build()
+    graph.set_items('Preview', [source(1, 'Slides'), scene(2, 'Hidden')])
+    graph.preview = 'Preview'
+    graph.max_scenes = 1
+    graph.rename('Preview', 'Preview 2')
+    assert graph.preview == 'Preview 2'
+    assert graph.missing() == []
+    graph.trim()
+    assert set(graph.scenes) == {'Main', 'Camera', 'Overlay', 'Hidden', 'Preview 2'}
@@ -0,0 +1,48 @@
+"""SpeechCache - rendering, lookups and errors, with the stub engine"""
+from conftest import wait_until
+import speech_cache
+
+class FailingEngine(speech_cache.StubEngine):
+    def synthesize(self, text):
+        raise RuntimeError("no voice")
+
+def test_render_errors_reach_the_monitor_log(make_monitor, tmp_path):
+    obs_monitor = make_monitor(4455)
+    written = []
+    obs_monitor.log_handler.enqueue = written.append
+    cache = speech_cache.SpeechCache(str(tmp_path), FailingEngine())
+    try:
+        cache.prerender(["Cam shown"])
+        wait_until(lambda: written)
+    finally:
+        cache.close()
+    assert [record.getMessage() for record in written] == ["Error rendering speech for 'Cam shown': no voice"]
+
+def test_peek_never_queues(tmp_path):
+    cache = speech_cache.SpeechCache(str(tmp_path), speech_cache.StubEngine())
+    try:
+        assert cache.peek("Cam shown") is None
+        assert cache.get("Cam shown") is None
+        wait_until(lambda: "Cam shown" in cache.memory)
+        assert cache.peek("Cam shown") == cache.memory["Cam shown"]
+        assert (cache.hits, cache.misses, cache.rendered) == (1, 1, 1)
+    finally:
+        cache.close()
+
+class Reader:
+    def __init__(self):
+        self.spoken = []
+
+    def speak(self, text):
+        self.spoken.append(text)
+
+def test_only_single_source_phrases_are_rendered(make_monitor, tmp_path):
+    obs_monitor = make_monitor(4455, use_speech=True, speech_cache={'enabled': True, 'engine': 'stub', 'directory': str(tmp_path)})
+    obs_monitor.speech = reader = Reader()
+    obs_monitor.say("Config reloaded", wait=True)
+    obs_monitor.speech_queue.announce_sources('shown', ['Cam 1', 'Cam 2'])
+    wait_until(lambda: len(reader.spoken) == 2)
+    obs_monitor.speech_queue.announce_sources('hidden', ['Cam 1'])
+    wait_until(lambda: "Cam 1 hidden" in obs_monitor.speech_cache.memory)
+    assert reader.spoken == ["Config reloaded", "2 shown: Cam 1, Cam 2", "Cam 1 hidden"]
+    assert list(obs_monitor.speech_cache.memory) == ["Cam 1 hidden"]
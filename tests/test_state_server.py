@@ -0,0 +1,36 @@
+"""StateServer - the Unix domain socket is only replaced when it is a socket"""
+import asyncio
+import socket
+
+import pytest
+
+from state_server import StateServer
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="needs Unix domain sockets")
+
+def test_leftover_socket_is_replaced_and_removed_on_stop(tmp_path):
+    path = str(tmp_path / 'state.sock')
+    leftover = socket.socket(socket.AF_UNIX)
+    leftover.bind(path)
+    leftover.close()
+
+    async def run():
+        server = StateServer(lambda: [], unix_socket=path)
+        await server.start()
+        assert StateServer.is_socket(path)
+        await server.stop()
+    asyncio.run(run())
+    assert not (tmp_path / 'state.sock').exists()
+
+def test_a_file_at_the_socket_path_is_left_alone(tmp_path, make_monitor):
+    path = tmp_path / 'notes.txt'
+    path.write_text('keep me')
+    obs_monitor = make_monitor(4455, state_server={'enabled': True, 'unix_socket': str(path)})
+    written = []
+    obs_monitor.log_handler.enqueue = written.append
+    asyncio.run(obs_monitor.start_state_server())
+    assert obs_monitor.state_server is None
+    assert path.read_text() == 'keep me'
+    assert [record.getMessage() for record in written] == [
+        f"Failed to start the state server: {path} exists and is not a socket, leaving it alone"
+    ]
@@ -0,0 +1,215 @@
+"""Watchers for OBS state besides source visibility - outputs, input mutes and audio levels"""
+from typing import Dict, List
+
+from obs_connection import OBSConnection
+
+class Watcher:
+    """Watches one kind of OBS state besides scene item visibility, purely from events.
+
+    A watcher names the eventSubscriptions categories it needs and the events it handles, so
+    enabling one adds only those events to the socket and nothing to the poll loop. handle()
+    turns an event into a list of (state, subject, earcon) to announce, empty to stay quiet.
+    Every OBS instance has its own watcher objects, so they can keep state per host.
+    """
+
+    name = ''
+    subscriptions = 0
+    events = ()
+
+    def __init__(self, settings):
+        self.settings = settings
+
+    def handle(self, event_type, data):
+        raise NotImplementedError
+
+class OutputWatcher(Watcher):
+    """Start and stop of an output, announced under `subject`"""
+
+    subscriptions = OBSConnection.SUB_OUTPUTS
+    subject = ''
+
+    # Transitional states (starting, stopping) are left out, OBS always follows them with the final one
+    STATES = {
+        'OBS_WEBSOCKET_OUTPUT_STARTED': ('started', 'output_started'),
+        'OBS_WEBSOCKET_OUTPUT_STOPPED': ('stopped', 'output_stopped'),
+        'OBS_WEBSOCKET_OUTPUT_PAUSED': ('paused', 'output_stopped'),
+        'OBS_WEBSOCKET_OUTPUT_RESUMED': ('resumed', 'output_started'),
+        'OBS_WEBSOCKET_OUTPUT_RECONNECTING': ('reconnecting', 'output_stopped'),
+        'OBS_WEBSOCKET_OUTPUT_RECONNECTED': ('reconnected', 'output_started'),
+    }
+
+    def handle(self, event_type, data):
+        state = self.STATES.get(data.get('outputState'))
+        if state is None:
+            return []
+        return [(state[0], self.subject, state[1])]
+
+class StreamWatcher(OutputWatcher):
+    name = 'stream'
+    events = ('StreamStateChanged',)
+    subject = 'Stream'
+
+class RecordWatcher(OutputWatcher):
+    name = 'record'
+    events = ('RecordStateChanged',)
+    subject = 'Recording'
+
+class InputMuteWatcher(Watcher):
+    """Mute and unmute of audio inputs, all of them or only those listed in the inputs setting"""
+
+    name = 'input_mute'
+    subscriptions = OBSConnection.SUB_INPUTS
+    events = ('InputMuteStateChanged',)
+
+    def __init__(self, settings):
+        super().__init__(settings)
+        self.inputs = set(settings.get('inputs') or ())
+
+    def handle(self, event_type, data):
+        input_name = data.get('inputName')
+        if self.inputs and input_name not in self.inputs:
+            return []
+        if data.get('inputMuted'):
+            return [('muted', input_name, 'input_muted')]
+        return [('unmuted', input_name, 'input_unmuted')]
+
+class LevelWatchdog(Watcher):
+    """Silence and clipping alerts from InputVolumeMeters, which OBS sends for every input every 50 ms.
+
+    Each frame is reduced with NumPy to one magnitude (RMS) and one peak per input, of its loudest
+    channel, and written into a column of two preallocated ring buffers, a frame with no level for
+    an input stores -1. Every `check_every` frames the rings are evaluated at once for all inputs:
+
+        silent      no magnitude above silence_db for silence_seconds - only counted once the input
+                    has been present for the whole window, so a new or removed input is not flagged
+        clipping    at least clip_frames peaks at or above clip_db within clip_seconds
+
+    Silence goes by magnitude so a few clicks or hum spikes on a dead input do not count as sound,
+    clipping goes by peak since a single clipped sample is already audible. Alerts have hysteresis
+    so a level hovering at a threshold does not chatter: a silent input only counts as back once
+    its magnitude reaches silence_db + hysteresis_db, and clipping only ends after a full
+    clip_seconds without a clipped peak. Needs NumPy.
+    """
+
+    name = 'audio_levels'
+    subscriptions = OBSConnection.SUB_INPUT_VOLUME_METERS
+    events = ('InputVolumeMeters',)
+    FRAME_INTERVAL = 0.05  # obs-websocket sends InputVolumeMeters every 50 ms
+
+    def __init__(self, settings):
+        super().__init__(settings)
+        import numpy as np  # Only needed with the watchdog on, so NumPy stays an optional dependency
+        self.np = np
+        self.inputs = set(settings.get('inputs') or ())
+        self.check_every = max(1, int(settings.get('check_every', 5)))
+
+        db = lambda value: 10 ** (value / 20)
+        self.silence_level = db(settings.get('silence_db', -50.0))
+        self.silence_clear_level = db(settings.get('silence_db', -50.0) + settings.get('hysteresis_db', 6.0))
+        self.clip_level = db(settings.get('clip_db', -0.5))
+        self.clip_frames = max(1, int(settings.get('clip_frames', 3)))
+        self.silence_window = max(1, round(settings.get('silence_seconds', 10.0) / self.FRAME_INTERVAL))
+        self.clip_window = max(1, min(self.silence_window, round(settings.get('clip_seconds', 2.0) / self.FRAME_INTERVAL)))
+
+        self.slots: Dict[str, int] = {}
+        self.names: List[str] = []
+        self.allocate(settings.get('capacity', 32))
+        self.position = 0  # Ring column the next frame goes into
+        self.frames = 0
+
+    def allocate(self, capacity):
+        """(Re)allocate the ring and per-input state for `capacity` inputs, keeping what is there"""
+        np = self.np
+        magnitudes = np.full((capacity, self.silence_window), -1.0, dtype=np.float32)
+        peaks = np.full((capacity, self.silence_window), -1.0, dtype=np.float32)
+        seen = np.zeros(capacity, dtype=np.int64)
+        silent = np.zeros(capacity, dtype=bool)
+        clipping = np.zeros(capacity, dtype=bool)
+        if self.names:
+            used = len(self.names)
+            magnitudes[:used] = self.magnitudes[:used]
+            peaks[:used] = self.peaks[:used]
+            seen[:used] = self.seen[:used]
+            silent[:used] = self.silent[:used]
+            clipping[:used] = self.clipping[:used]
+        self.magnitudes, self.peaks, self.seen, self.silent, self.clipping = magnitudes, peaks, seen, silent, clipping
+
+    def slot(self, input_name):
+        slot = self.slots.get(input_name)
+        if slot is None:
+            slot = len(self.names)
+            if slot >= len(self.peaks):
+                self.allocate(len(self.peaks) * 2)
+            self.slots[input_name] = slot
+            self.names.append(input_name)
+        return slot
+
+    def handle(self, event_type, data):
+        """Store one meter frame, and every check_every frames evaluate all inputs"""
+        np = self.np
+        rows = []
+        counts = []
+        levels = []
+        for entry in data.get('inputs') or ():
+            input_name = entry.get('inputName')
+            channels = entry.get('inputLevelsMul')
+            if not channels or (self.inputs and input_name not in self.inputs):
+                continue
+            rows.append(self.slot(input_name))
+            counts.append(len(channels))
+            levels.extend(channels)
+
+        magnitude_column = self.magnitudes[:, self.position]
+        peak_column = self.peaks[:, self.position]
+        magnitude_column.fill(-1.0)
+        peak_column.fill(-1.0)
+        if rows:
+            # [magnitude, peak, input peak] per channel, reduced to the loudest channel of every input
+            channel_levels = np.asarray(levels, dtype=np.float32)
+            starts = np.zeros(len(counts), dtype=np.intp)
+            np.cumsum(counts[:-1], out=starts[1:])
+            rows = np.asarray(rows, dtype=np.intp)
+            magnitude_column[rows] = np.maximum.reduceat(channel_levels[:, 0], starts)
+            peak_column[rows] = np.maximum.reduceat(channel_levels[:, 1], starts)
+            self.seen[rows] += 1
+        self.position = (self.position + 1) % self.silence_window
+        self.frames += 1
+
+        if self.frames % self.check_every:
+            return []
+        return self.evaluate()
+
+    def evaluate(self):
+        """Update silence and clipping state of every input from the ring, returns the changes to announce"""
+        np = self.np
+        used = len(self.names)
+        if not used:
+            return []
+        magnitudes = self.magnitudes[:used]
+
+        # The order of frames does not matter for silence, the whole ring is the window
+        loudest = magnitudes.max(axis=1)
+        complete = (magnitudes.min(axis=1) >= 0) & (self.seen[:used] >= self.silence_window)
+        recent_columns = (self.position - 1 - np.arange(self.clip_window)) % self.silence_window
+        clipped = (self.peaks[:used, recent_columns] >= self.clip_level).sum(axis=1)
+
+        silent = self.silent[:used]
+        clipping = self.clipping[:used]
+        went_silent = ~silent & complete & (loudest < self.silence_level)
+        came_back = silent & (magnitudes[:, recent_columns].max(axis=1) >= self.silence_clear_level)
+        started_clipping = ~clipping & (clipped >= self.clip_frames)
+        stopped_clipping = clipping & (clipped == 0)
+
+        changes = []
+        for mask, state, earcon in ((went_silent, 'silent', 'level_alert'), (came_back, 'audio back', 'level_ok'),
+                                    (started_clipping, 'clipping', 'level_alert'),
+                                    (stopped_clipping, 'clipping stopped', 'level_ok')):
+            for slot in np.flatnonzero(mask):
+                changes.append((state, self.names[slot], earcon))
+        silent |= went_silent
+        silent &= ~came_back
+        clipping |= started_clipping
+        clipping &= ~stopped_clipping
+        return changes
+
+WATCHERS = {watcher.name: watcher for watcher in (StreamWatcher, RecordWatcher, InputMuteWatcher, LevelWatchdog)}